@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Packed Bitstream for Shadow Entropy Test Harnesses
+
+Bit-packed sequence type shared by the NIST SP 800-22 suite (C003) and the
+shadow generators. One bit costs one bit of memory instead of one Python int
+(~64x smaller), and slicing returns a zero-copy view over the same buffer.
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+LAYOUT: Bits are stored MSB-first within each byte, so bit 0 of the sequence
+is the most significant bit of byte 0. `to_int()` therefore returns an
+integer whose binary expansion reads left-to-right in sequence order, which
+makes rolling m-bit windows plain shifts and masks.
+"""
+
+import sys
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator, Sequence, Union
+
+
+# Byte -> 8-byte string of 0/1 values (MSB first)
+_UNPACK_TABLE = [bytes((byte >> (7 - i)) & 1 for i in range(8)) for byte in range(256)]
+
+# Byte -> bit-reversed byte
+_REVERSE_TABLE = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+# Field width -> unsigned array typecode of exactly that many bits
+_WORD_TYPECODES = {array(code).itemsize * 8: code for code in "QLIHB"}
+
+# Bytes handled per step when unpacking or iterating
+_CHUNK_BYTES = 1 << 16
+
+
+def _join_fields(values: Sequence[int], width: int) -> int:
+    """
+    Concatenate fixed-width fields into one integer, first field lowest.
+
+    Pairwise merging keeps every shift proportional to the operands, so the
+    whole join costs O(n log n) word operations instead of O(n²).
+    """
+    level = list(values)
+    if not level:
+        return 0
+    w = width
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(0)
+        level = [lo | (hi << w) for lo, hi in zip(level[::2], level[1::2])]
+        w *= 2
+    return level[0]
+
+
+class BitSequence:
+    """
+    Immutable, bit-packed sequence of 0/1 values.
+
+    Supports len(), indexing, iteration and slicing like a List[int]; slices
+    with step 1 are views that share the underlying buffer.
+    """
+
+    __slots__ = ("_buf", "_start", "_len")
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview] = b"",
+                 start: int = 0, length: int = None):
+        if isinstance(data, memoryview):
+            # Wrap external buffers (e.g. shared memory) without copying
+            buf = data.cast("B").toreadonly()
+        else:
+            buf = data if isinstance(data, bytes) else bytes(data)
+        if length is None:
+            length = len(buf) * 8 - start
+        if start < 0 or length < 0 or start + length > len(buf) * 8:
+            raise ValueError("bit range outside buffer")
+        self._buf = buf
+        self._start = start
+        self._len = length
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_bits(cls, bits: Iterable[int]) -> "BitSequence":
+        """Pack an iterable of 0/1 integers."""
+        unpacked = bytes(bits)
+        n = len(unpacked)
+        out = bytearray()
+        for off in range(0, n, _CHUNK_BYTES * 8):
+            chunk = unpacked[off:off + _CHUNK_BYTES * 8]
+            pad = (-len(chunk)) % 64
+            chunk += b"\x00" * pad
+            n_groups = len(chunk) // 8
+            # Little-endian: unpacked byte i sits at bit 8i. Fold each run of
+            # eight stride-8 bits into one byte with three mask/shift steps.
+            x = int.from_bytes(chunk, "little")
+            x = (x | (x >> 7)) & int.from_bytes(b"\x03\x00" * (n_groups * 4), "little")
+            x = (x | (x >> 14)) & int.from_bytes(b"\x0f\x00\x00\x00" * (n_groups * 2), "little")
+            x = (x | (x >> 28)) & int.from_bytes((b"\xff" + b"\x00" * 7) * n_groups, "little")
+            packed = x.to_bytes(len(chunk), "little")[::8]
+            out += packed.translate(_REVERSE_TABLE)
+        return cls(bytes(out[:(n + 7) // 8]), 0, n)
+
+    @classmethod
+    def from_int(cls, value: int, length: int) -> "BitSequence":
+        """Bits of value (MSB first) as a sequence of the given length."""
+        pad = (-length) % 8
+        return cls((value << pad).to_bytes((length + pad) // 8, "big"), 0, length)
+
+    @classmethod
+    def from_fields(cls, values: Sequence[int], width: int,
+                    lsb_first: bool = False) -> "BitSequence":
+        """
+        Concatenate fixed-width integer fields.
+
+        By default each field is emitted MSB first. With lsb_first each field
+        is emitted least significant bit first, which matches the historical
+        `(shadow >> b) & 1` extraction order of the shadow generators.
+        """
+        n = len(values) * width
+        if lsb_first:
+            x = _join_fields(values, width)
+            data = x.to_bytes((n + 7) // 8, "little").translate(_REVERSE_TABLE)
+            return cls(data, 0, n)
+        return cls.from_int(_join_fields(values[::-1], width), n)
+
+    @classmethod
+    def coerce(cls, bits: Union["BitSequence", Iterable[int]]) -> "BitSequence":
+        """Return bits unchanged if already packed, otherwise pack them."""
+        if isinstance(bits, cls):
+            return bits
+        return cls.from_bits(bits)
+
+    # -------------------------------------------------------------------------
+    # Sequence protocol
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return list(self)[key]
+            length = max(0, stop - start)
+            return BitSequence(self._buf, self._start + start, length)
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("bit index out of range")
+        pos = self._start + key
+        return (self._buf[pos >> 3] >> (7 - (pos & 7))) & 1
+
+    def __iter__(self) -> Iterator[int]:
+        for chunk in self._unpacked_chunks():
+            yield from chunk
+
+    def _unpacked_chunks(self) -> Iterator[bytes]:
+        """The sequence as consecutive 0/1-byte chunks."""
+        first = self._start >> 3
+        last = (self._start + self._len + 7) >> 3
+        skip = self._start & 7
+        remaining = self._len
+        view = memoryview(self._buf)
+        for off in range(first, last, _CHUNK_BYTES):
+            chunk = b"".join(map(_UNPACK_TABLE.__getitem__, view[off:min(off + _CHUNK_BYTES, last)]))
+            if skip:
+                chunk = chunk[skip:]
+                skip = 0
+            if len(chunk) > remaining:
+                chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+
+    def __repr__(self) -> str:
+        return f"BitSequence(n_bits={self._len})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BitSequence):
+            return self._len == other._len and self.to_int() == other.to_int()
+        if isinstance(other, (list, tuple)):
+            return self._len == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other) -> "BitSequence":
+        """Concatenation (copies both operands into a new buffer)."""
+        other = BitSequence.coerce(other)
+        return BitSequence.from_int((self.to_int() << other._len) | other.to_int(),
+                                    self._len + other._len)
+
+    # -------------------------------------------------------------------------
+    # Bulk operations
+    # -------------------------------------------------------------------------
+
+    def to_int(self) -> int:
+        """Integer whose binary expansion (MSB first) is this sequence."""
+        if self._len == 0:
+            return 0
+        first = self._start >> 3
+        end_bit = self._start + self._len
+        last = (end_bit + 7) >> 3
+        x = int.from_bytes(memoryview(self._buf)[first:last], "big")
+        x >>= (last << 3) - end_bit
+        return x & ((1 << self._len) - 1)
+
+    def count(self, value: int = 1) -> int:
+        """Number of bits equal to value (popcount for value=1)."""
+        ones = self.to_int().bit_count()
+        return ones if value == 1 else self._len - ones
+
+    def unpack(self) -> bytes:
+        """One byte (0 or 1) per bit; a temporary buffer for byte-level scans."""
+        return b"".join(self._unpacked_chunks())
+
+    def tobytes(self) -> bytes:
+        """Packed bytes of this sequence, zero-padded to a byte boundary."""
+        if self._start & 7 == 0:
+            data = bytes(self._buf[self._start >> 3:(self._start + self._len + 7) >> 3])
+            tail = self._len & 7
+            if tail:
+                data = data[:-1] + bytes([data[-1] & (0xFF << (8 - tail)) & 0xFF])
+            return data
+        pad = (-self._len) % 8
+        return (self.to_int() << pad).to_bytes((self._len + pad) // 8, "big")
+
+    def blocks(self, size: int) -> Iterator["BitSequence"]:
+        """Zero-copy views of consecutive full blocks of the given size."""
+        for i in range(self._len // size):
+            yield BitSequence(self._buf, self._start + i * size, size)
+
+    def block(self, index: int, size: int) -> "BitSequence":
+        """Zero-copy view of block `index` of the given size."""
+        return BitSequence(self._buf, self._start + index * size, size)
+
+    def fields(self, width: int) -> Iterator[int]:
+        """Consecutive non-overlapping width-bit integers (MSB first)."""
+        n_fields = self._len // width
+        typecode = _WORD_TYPECODES.get(width)
+        if typecode and self._start & 7 == 0:
+            # Byte-aligned machine words: reinterpret the buffer directly
+            first = self._start >> 3
+            for off in range(0, n_fields, _CHUNK_BYTES):
+                count = min(_CHUNK_BYTES, n_fields - off)
+                start = first + off * (width >> 3)
+                words = array(typecode)
+                words.frombytes(self._buf[start:start + count * (width >> 3)])
+                if sys.byteorder == "little" and width > 8:
+                    words.byteswap()
+                yield from words
+            return
+        per_chunk = max(1, (_CHUNK_BYTES * 8) // width)
+        for first in range(0, n_fields, per_chunk):
+            count = min(per_chunk, n_fields - first)
+            chunk = self[first * width:(first + count) * width].to_int()
+            text = format(chunk, f"0{count * width}b")
+            yield from (int(text[i:i + width], 2) for i in range(0, count * width, width))
+
+    def cyclic(self, extra: int) -> Iterator[int]:
+        """Iterate the sequence followed by its first `extra` bits."""
+        return chain(self, self[:extra])
+
+
+def as_bit_sequence(bits: Union[BitSequence, Iterable[int]]) -> BitSequence:
+    """Accept either a packed BitSequence or a List[int] of bits."""
+    return BitSequence.coerce(bits)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Multi-Channel Coprime Shadow Harvester (L006/L007)
+
+Harvests shadows from k channels with pairwise-coprime shadow moduli and
+XOR-combines them into one output stream. By L007 the combined stream has
+at least the min-entropy of its best channel when the channels are
+independent; L006 bounds their cross-correlation for coprime moduli.
+
+Nodes L006, L007 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
+             Standard library only
+
+SCHEDULING: The output is cut into CHUNK_BITS chunks. Every (channel,
+chunk) pair is one task on a process pool, and at most MAX_PENDING_CHUNKS
+chunks are in flight at once, so memory stays bounded by
+MAX_PENDING_CHUNKS × k × CHUNK_BITS bits however long the stream is. Chunks
+are XOR-combined and emitted in order as soon as all k channels deliver.
+
+SEEDS: With a seed, chunk c of channel j is the stream of the DRBG
+substream "channel{j}/chunk{c}", so any chunk of any channel can be
+regenerated on its own. Without one, channels draw on OS randomness.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from shadow_bitstream import BitSequence
+from shadow_nist_tests import generate_shadow_bits, run_suite
+from shadow_rns import is_prime
+from shadow_source import ShadowDRBG
+
+# Output bits per chunk (a whole number of bytes)
+CHUNK_BITS = 1 << 20
+
+# Chunks generated ahead of the consumer
+MAX_PENDING_CHUNKS = 4
+
+
+# =============================================================================
+# Channel Moduli
+# =============================================================================
+
+def coprime_moduli(k: int, bits: int = 16) -> List[int]:
+    """The k largest primes below 2^bits (pairwise coprime), descending."""
+    moduli = []
+    candidate = (1 << bits) - 1
+    while len(moduli) < k:
+        if candidate < 2:
+            raise ValueError(f"fewer than {k} primes below 2^{bits}")
+        if is_prime(candidate):
+            moduli.append(candidate)
+        candidate -= 1
+    return moduli
+
+
+def check_pairwise_coprime(moduli: Sequence[int]) -> None:
+    """Raise ValueError unless every pair of channel moduli is coprime (L006)."""
+    for i, a in enumerate(moduli):
+        for b in moduli[i + 1:]:
+            if gcd(a, b) != 1:
+                raise ValueError(f"channel moduli {a} and {b} are not coprime")
+
+
+def chunk_seed(seed: Optional[int], channel: int, chunk: int) -> Optional[int]:
+    """DRBG seed of one (channel, chunk) pair, or None for OS randomness."""
+    if seed is None:
+        return None
+    derived = ShadowDRBG(seed).substream(f"channel{channel}/chunk{chunk}")
+    return int.from_bytes(derived.seed, "big")
+
+
+# =============================================================================
+# Worker Side
+# =============================================================================
+
+def _channel_chunk(m: int, n_bits: int, seed: Optional[int]) -> Tuple[bytes, float]:
+    """One channel's chunk as packed bytes, with its generation time."""
+    start = time.perf_counter()
+    data = generate_shadow_bits(m, n_bits, seed).tobytes()
+    return data, time.perf_counter() - start
+
+
+# =============================================================================
+# Parent Side
+# =============================================================================
+
+def xor_stream(moduli: Sequence[int], n_bits: int, seed: Optional[int] = None,
+               workers: Optional[int] = None,
+               stats: Optional[Dict] = None) -> Iterator[BitSequence]:
+    """
+    XOR-combined chunks of the k channel streams, in order.
+
+    If stats is given, it receives per-channel bit counts and worker
+    seconds as chunks complete.
+    """
+    check_pairwise_coprime(moduli)
+    workers = workers or os.cpu_count() or 1
+    n_chunks = -(-n_bits // CHUNK_BITS)
+    if stats is not None:
+        stats.setdefault("channels", [{"modulus": m, "bits": 0, "seconds": 0.0} for m in moduli])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit(chunk: int) -> Tuple[int, List]:
+            size = min(CHUNK_BITS, n_bits - chunk * CHUNK_BITS)
+            return size, [pool.submit(_channel_chunk, m, size, chunk_seed(seed, j, chunk))
+                          for j, m in enumerate(moduli)]
+
+        window = deque(submit(c) for c in range(min(n_chunks, MAX_PENDING_CHUNKS)))
+        next_chunk = len(window)
+        while window:
+            size, futures = window.popleft()
+            combined = 0
+            for j, future in enumerate(futures):
+                data, seconds = future.result()
+                combined ^= int.from_bytes(data, "big")
+                if stats is not None:
+                    stats["channels"][j]["bits"] += size
+                    stats["channels"][j]["seconds"] += seconds
+            if next_chunk < n_chunks:
+                window.append(submit(next_chunk))
+                next_chunk += 1
+            yield BitSequence(combined.to_bytes(len(data), "big"), 0, size)
+
+
+def harvest_xor_bits(moduli: Sequence[int], n_bits: int, seed: Optional[int] = None,
+                     workers: Optional[int] = None) -> Tuple[BitSequence, Dict]:
+    """
+    n_bits of the XOR-combined stream, with throughput statistics.
+
+    Channel rates are bits per worker-second of that channel alone; the
+    combined rate is output bits per wall-clock second.
+    """
+    stats: Dict = {}
+    start = time.perf_counter()
+    data = b"".join(chunk.tobytes() for chunk in xor_stream(moduli, n_bits, seed, workers, stats))
+    wall = time.perf_counter() - start
+
+    for channel in stats["channels"]:
+        channel["bits_per_second"] = channel["bits"] / channel["seconds"] if channel["seconds"] else 0.0
+    stats["combined"] = {
+        "n_channels": len(moduli),
+        "bits": n_bits,
+        "seconds": wall,
+        "bits_per_second": n_bits / wall
+    }
+    return BitSequence(data, 0, n_bits), stats
+
+
+def main():
+    """Main entry point."""
+    n_bits = 1000000
+    all_results = []
+    for k in (1, 2, 4):
+        moduli = coprime_moduli(k)
+        print("=" * 70)
+        print(f"Multi-Channel XOR Harvester (L006/L007): {k} channels")
+        print(f"Moduli: {', '.join(map(str, moduli))}")
+        print("=" * 70)
+
+        bits, stats = harvest_xor_bits(moduli, n_bits)
+        for channel in stats["channels"]:
+            print(f"  channel m={channel['modulus']}: {channel['bits_per_second'] / 1e6:.2f} Mbit/s")
+        print(f"  combined: {stats['combined']['bits_per_second'] / 1e6:.2f} Mbit/s")
+
+        results = {
+            "node_id": "L007",
+            "title": "NIST SP 800-22 on XOR-Combined Channels",
+            "n_bits": n_bits,
+            "moduli": moduli,
+            "throughput": stats,
+            "tests": [],
+            "overall_pass": True
+        }
+        all_results.append(run_suite(bits, results))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - Multi-Channel XOR Harvester")
+    print("=" * 70)
+    for r in all_results:
+        passed_tests = sum(1 for t in r["tests"] if t.get("pass", False))
+        print(f"  {len(r['moduli'])} channels: {passed_tests:2d}/{len(r['tests'])} tests passed, "
+              f"{r['throughput']['combined']['bits_per_second'] / 1e6:.2f} Mbit/s combined")
+
+    final_results = {
+        "node_id": "L007",
+        "title": "Multi-Channel XOR Harvester Validation",
+        "configurations": all_results,
+        "overall_pass": all(
+            all(t.get("pass", False) for t in r["tests"][:13]) for r in all_results
+        )
+    }
+
+    output_path = Path(__file__).with_name("L007_channels_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Toeplitz Conditioner for Shadow Entropy (L008)
+
+Streaming randomness extractor for raw shadow output. Each n_in-bit input
+block x is hashed to n_out bits by a random Toeplitz matrix T (a universal
+hash family), and by the Leftover Hash Lemma (L008) the output is within
+statistical distance 2^(-(k - n_out)/2) of uniform when the block carries
+k bits of min-entropy. n_out is derived from measured min-entropy:
+
+    n_out = floor(n_in × h) - 2 × SECURITY_BITS   (distance <= 2^-SECURITY_BITS)
+
+Node L008 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate) in the hash itself
+             Standard library only
+
+CARRYLESS MULTIPLICATION: T has entries T[k][i] = s[k - i + n_in - 1] for
+a key s of n_in + n_out - 1 bits, so T x is the slice of the carryless
+(GF(2)[z]) product x(z) × s(z) at degrees n_in - 1 .. n_in + n_out - 2.
+The product is computed on packed words, one byte of x at a time: all
+256 carryless multiples of the fixed key are tabulated once, and each
+block then costs n_in / 8 shift-XOR steps over machine-word integers.
+
+MIN-ENTROPY: Measured with the most-common-value estimate of SP 800-90B
+Section 6.3.1 over byte symbols (99% upper confidence bound on the modal
+probability), a conservative per-bit figure for the raw stream.
+"""
+
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from shadow_bitstream import BitSequence, as_bit_sequence
+from shadow_nist_tests import Bits, generate_shadow_bits, run_suite
+from shadow_source import ShadowDRBG, uniform_below
+
+# Input bits per Toeplitz block
+BLOCK_BITS = 4096
+
+# Output distance from uniform is at most 2^-SECURITY_BITS
+SECURITY_BITS = 64
+
+# Symbol width of the min-entropy estimate
+SYMBOL_BITS = 8
+
+# Raw bits used to measure min-entropy, and the shadow offset of that
+# calibration slice in a seeded stream (disjoint from the conditioned bits)
+CALIBRATION_BITS = 1 << 20
+CALIBRATION_OFFSET = 1 << 48
+
+# z-value of the 99% upper confidence bound (SP 800-90B)
+_Z_99 = 2.576
+
+
+# =============================================================================
+# Carryless Multiplication
+# =============================================================================
+
+def clmul_table(key: int) -> List[int]:
+    """Carryless products v ⊗ key for every byte value v."""
+    table = [0] * 256
+    for v in range(1, 256):
+        table[v] = (table[v >> 1] << 1) ^ (key if v & 1 else 0)
+    return table
+
+
+def clmul(a: int, table: List[int], a_bytes: int) -> int:
+    """
+    Carryless product a ⊗ key from key's clmul_table.
+
+    a is read as a_bytes big-endian bytes (Horner over byte digits).
+    """
+    product = 0
+    for byte in a.to_bytes(a_bytes, "big"):
+        product = (product << 8) ^ table[byte]
+    return product
+
+
+# =============================================================================
+# Min-Entropy and Output Length
+# =============================================================================
+
+def min_entropy_per_bit(bits: Bits, symbol_bits: int = SYMBOL_BITS) -> float:
+    """
+    Most-common-value min-entropy estimate, in bits per input bit.
+
+    p_u = p̂ + 2.576 sqrt(p̂(1 - p̂)/(N - 1)) over symbol_bits-bit symbols,
+    H = -log2(p_u) / symbol_bits.
+    """
+    symbols = list(as_bit_sequence(bits).fields(symbol_bits))
+    n = len(symbols)
+    if n < 2:
+        raise ValueError("too few symbols for a min-entropy estimate")
+    p_hat = max(Counter(symbols).values()) / n
+    p_upper = min(1.0, p_hat + _Z_99 * math.sqrt(p_hat * (1 - p_hat) / (n - 1)))
+    return -math.log2(p_upper) / symbol_bits
+
+
+def output_bits(n_in: int, min_entropy: float, security_bits: int = SECURITY_BITS) -> int:
+    """Leftover Hash Lemma output length for an n_in-bit block of given min-entropy per bit."""
+    n_out = int(n_in * min_entropy) - 2 * security_bits
+    if n_out <= 0:
+        raise ValueError(f"block of {n_in} bits at {min_entropy:.4f} bits/bit "
+                         f"has no extractable output at {security_bits}-bit security")
+    return n_out
+
+
+# =============================================================================
+# Streaming Conditioner
+# =============================================================================
+
+class ToeplitzConditioner:
+    """
+    Streaming Toeplitz hash from n_in-bit blocks to n_out-bit blocks.
+
+    update() takes raw bits in any chunk sizes, carries the incomplete
+    tail block to the next call, and returns the conditioned bits of every
+    completed block. The key comes from the DRBG when a seed is given
+    (reproducible runs), otherwise from OS randomness; it must not depend
+    on the raw source.
+    """
+
+    def __init__(self, n_in: int = BLOCK_BITS, n_out: Optional[int] = None,
+                 seed: Optional[int] = None):
+        if n_in % 8:
+            raise ValueError("n_in must be a whole number of bytes")
+        if n_out is None:
+            n_out = output_bits(n_in, 1.0)
+        self.n_in = n_in
+        self.n_out = n_out
+        key_bits = n_in + n_out - 1
+        n_bytes = (key_bits + 7) // 8
+        if seed is not None:
+            key_bytes = ShadowDRBG(seed).substream("toeplitz").uniform_below(256, n_bytes)
+        else:
+            key_bytes = uniform_below(256, n_bytes)
+        self.key = int.from_bytes(bytes(key_bytes), "big") >> (8 * n_bytes - key_bits)
+        self._table = clmul_table(self.key)
+        self._mask = (1 << n_out) - 1
+        self._pending = BitSequence()
+        self.blocks = 0
+
+    def hash_block(self, x: int) -> int:
+        """T x for one n_in-bit block given as an integer."""
+        return (clmul(x, self._table, self.n_in // 8) >> (self.n_in - 1)) & self._mask
+
+    def update(self, bits: Bits) -> BitSequence:
+        """Condition every block completed by bits; keep the remainder."""
+        bits = as_bit_sequence(bits)
+        if len(self._pending):
+            bits = self._pending + bits
+        n_blocks = len(bits) // self.n_in
+        outputs = [self.hash_block(block.to_int()) for block in bits.blocks(self.n_in)]
+        self._pending = bits[n_blocks * self.n_in:]
+        self.blocks += n_blocks
+        return BitSequence.from_fields(outputs, self.n_out)
+
+
+def condition_bits(raw: Bits, n_in: int = BLOCK_BITS, min_entropy: Optional[float] = None,
+                   seed: Optional[int] = None) -> Tuple[BitSequence, Dict]:
+    """
+    Condition a raw stream in one call; min-entropy is measured if not given.
+
+    Returns the conditioned bits and the conditioner parameters.
+    """
+    raw = as_bit_sequence(raw)
+    if min_entropy is None:
+        min_entropy = min_entropy_per_bit(raw)
+    n_out = output_bits(n_in, min_entropy)
+    conditioner = ToeplitzConditioner(n_in, n_out, seed)
+    out = conditioner.update(raw)
+    k = int(n_in * min_entropy)
+    return out, {
+        "n_in": n_in,
+        "n_out": n_out,
+        "ratio": n_out / n_in,
+        "min_entropy_per_bit": min_entropy,
+        "log2_distance": -(k - n_out) / 2,
+        "blocks": conditioner.blocks
+    }
+
+
+def generate_conditioned_bits(m: int, n_bits: int, seed: Optional[int] = None,
+                              packing: str = "truncate", n_in: int = BLOCK_BITS) -> Tuple[BitSequence, Dict]:
+    """
+    n_bits of conditioned output from the raw harvest of modulus m.
+
+    Min-entropy is measured on a separate calibration slice of the raw
+    source (far ahead in a seeded stream), the raw length is sized from the
+    resulting ratio, and the whole raw stream is conditioned.
+    """
+    calibration = generate_shadow_bits(m, CALIBRATION_BITS, seed, CALIBRATION_OFFSET, packing)
+    min_entropy = min_entropy_per_bit(calibration)
+    n_out = output_bits(n_in, min_entropy)
+    n_blocks = -(-n_bits // n_out)
+
+    raw = generate_shadow_bits(m, n_blocks * n_in, seed, packing=packing)
+    bits, info = condition_bits(raw, n_in, min_entropy, seed)
+    info.update({"modulus": m, "packing": packing, "raw_bits": len(raw)})
+    return bits[:n_bits], info
+
+
+def main():
+    """Main entry point."""
+    configs = [
+        {"n_bits": 1000000, "modulus": 256},
+        {"n_bits": 1000000, "modulus": 65536},
+    ]
+
+    all_results = []
+    for cfg in configs:
+        print("=" * 70)
+        print("Shadow Entropy Toeplitz Conditioner (L008) + NIST SP 800-22 (C003)")
+        print(f"Conditioning truncated harvest of modulus {cfg['modulus']} "
+              f"to {cfg['n_bits']:,} bits")
+        print("=" * 70)
+
+        bits, info = generate_conditioned_bits(cfg["modulus"], cfg["n_bits"])
+        print(f"Min-entropy: {info['min_entropy_per_bit']:.4f} bits/bit, "
+              f"ratio {info['n_out']}/{info['n_in']}, "
+              f"distance <= 2^{info['log2_distance']:.1f}")
+        results = {
+            "node_id": "C003",
+            "title": "NIST SP 800-22 on Toeplitz-Conditioned Shadows",
+            "n_bits": cfg["n_bits"],
+            "modulus": cfg["modulus"],
+            "conditioner": info,
+            "tests": [],
+            "overall_pass": True
+        }
+        all_results.append(run_suite(bits, results))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - Toeplitz Conditioner")
+    print("=" * 70)
+    for r in all_results:
+        passed_tests = sum(1 for t in r["tests"] if t.get("pass", False))
+        print(f"  m={r['modulus']:5d}: {passed_tests:2d}/{len(r['tests'])} tests passed "
+              f"(ratio {r['conditioner']['ratio']:.4f})")
+
+    final_results = {
+        "node_id": "L008",
+        "title": "Leftover Hash Lemma Conditioner Validation",
+        "configurations": all_results,
+        "overall_pass": all(
+            all(t.get("pass", False) for t in r["tests"][:13]) for r in all_results
+        )
+    }
+
+    output_path = Path(__file__).with_name("L008_conditioner_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Cross-Channel Correlation Matrix Test (L006)
+
+Empirically checks the L006 bound on shadow channels with pairwise-coprime
+moduli. Long aligned shadow sequences are drawn from k channels, the full
+k × k correlation matrix is accumulated exactly, and every off-diagonal
+entry is compared with
+
+    |Cor(shadow_i, shadow_j)| < 2^(-min(log₂ m_i, log₂ m_j)) = 1 / min(m_i, m_j)
+
+Node L006 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
+             Standard library only
+
+SAMPLING TOLERANCE: An empirical correlation of independent channels is of
+order 1/√n, far above 1/min(m_i, m_j) for 16-bit moduli at any practical
+n. Each entry is therefore checked against the bound plus z/√n, with z the
+two-sided normal quantile at family-wise level FAMILY_ALPHA (Bonferroni
+over all k(k-1)/2 pairs). "bound_resolved" reports whether the tolerance is
+below the bound itself, i.e. whether the run could tell a violation of
+L006 apart from sampling noise.
+
+ONE PASS: All channels advance together in CHUNK_SAMPLES steps and feed a
+GramAccumulator, which adds the chunk's whole Gram matrix in one packed
+multiply-accumulate pass per channel. With workers > 1 the sample range is
+split into contiguous shards whose accumulators are summed; with a seed,
+sample t of channel j is the same whatever the worker count.
+
+COST: The Gram matrix takes O(k²) work per sample. At k = 64 16-bit
+channels a sample costs about 90 µs of CPU time, roughly half generation
+and half accumulation, so 10^6 samples per channel (the default) take
+~1.5 CPU-minutes and 10^7 about 15, i.e. ~2 minutes on 8 workers. Since
+the sampling tolerance at either size is far above the 16-bit bound, the
+default keeps the smaller run.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+from shadow_channels import check_pairwise_coprime, coprime_moduli
+from shadow_independence_test import generate_shadow_sequence
+from shadow_result_store import ResultStore, cached_call, fresh_seed
+from shadow_source import ShadowDRBG
+from shadow_stats import GramAccumulator
+
+# Samples per channel generated and accumulated per step
+CHUNK_SAMPLES = 1 << 16
+
+# Family-wise false alarm rate over all channel pairs
+FAMILY_ALPHA = 0.01
+
+# Correlations are reported × SCALE (the bound for 16-bit moduli is ~1.5e-5)
+SCALE = 1000000000
+
+
+# =============================================================================
+# Channel Sequences
+# =============================================================================
+
+def channel_seed(seed: Optional[int], channel: int) -> Optional[int]:
+    """DRBG seed of one channel's shadow sequence, or None for OS randomness."""
+    if seed is None:
+        return None
+    derived = ShadowDRBG(seed).substream(f"channel{channel}")
+    return int.from_bytes(derived.seed, "big")
+
+
+def accumulate_channels(moduli: Sequence[int], n_samples: int, seed: Optional[int] = None,
+                        offset: int = 0) -> GramAccumulator:
+    """Exact moments of samples offset..offset+n_samples-1 of every channel."""
+    seeds = [channel_seed(seed, j) for j in range(len(moduli))]
+    acc = GramAccumulator(len(moduli))
+    for start in range(offset, offset + n_samples, CHUNK_SAMPLES):
+        count = min(CHUNK_SAMPLES, offset + n_samples - start)
+        acc.update([generate_shadow_sequence(m, count, s, start) for m, s in zip(moduli, seeds)])
+    return acc
+
+
+def correlation_accumulator(moduli: Sequence[int], n_samples: int, seed: Optional[int] = None,
+                            workers: int = 1) -> GramAccumulator:
+    """Exact moments of n_samples aligned samples of every channel, sharded over workers."""
+    if workers <= 1:
+        return accumulate_channels(moduli, n_samples, seed)
+
+    bounds = [n_samples * w // workers for w in range(workers + 1)]
+    shards = [b - a for a, b in zip(bounds, bounds[1:])]
+    acc = GramAccumulator(len(moduli))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard in pool.map(accumulate_channels, repeat(list(moduli)), shards,
+                              repeat(seed), bounds[:-1]):
+            acc.merge(shard)
+    return acc
+
+
+# =============================================================================
+# L006 Test
+# =============================================================================
+
+def pair_bound_scaled(m_i: int, m_j: int, scale: int = SCALE) -> int:
+    """2^(-min(log₂ m_i, log₂ m_j)) × scale (floor)."""
+    return scale // min(m_i, m_j)
+
+
+def test_cross_correlation(moduli: List[int], n_samples: int, seed: Optional[int] = None,
+                           workers: Optional[int] = None) -> Dict:
+    """
+    Test the L006 bound on every pair of k coprime channels.
+
+    Args:
+        moduli: Pairwise-coprime shadow moduli, one per channel
+        n_samples: Aligned samples per channel
+        seed: DRBG seed for a reproducible run (None: OS randomness)
+        workers: Process pool size (None: one per CPU)
+
+    Returns:
+        Test results
+    """
+    check_pairwise_coprime(moduli)
+    k = len(moduli)
+    if k < 2:
+        raise ValueError("need at least two channels")
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    acc = correlation_accumulator(moduli, n_samples, seed, workers)
+    seconds = time.perf_counter() - start
+    correlations = acc.correlations_scaled(SCALE)
+
+    n_pairs = k * (k - 1) // 2
+    z = NormalDist().inv_cdf(1 - FAMILY_ALPHA / (2 * n_pairs))
+    tolerance_scaled = int(z * SCALE / n_samples ** 0.5)
+
+    violations = []
+    max_abs = 0
+    max_pair = None
+    for i in range(k):
+        for j in range(i + 1, k):
+            corr = correlations[i][j]
+            bound = pair_bound_scaled(moduli[i], moduli[j])
+            if abs(corr) >= max_abs:
+                max_abs = abs(corr)
+                max_pair = [moduli[i], moduli[j]]
+            if abs(corr) > bound + tolerance_scaled:
+                violations.append({
+                    "moduli": [moduli[i], moduli[j]],
+                    "correlation_scaled": corr,
+                    "correlation": corr / SCALE,
+                    "bound": bound / SCALE
+                })
+
+    tightest_bound = pair_bound_scaled(min(moduli), min(moduli))
+    return {
+        "moduli": list(moduli),
+        "channels": k,
+        "samples": n_samples,
+        "pairs": n_pairs,
+        "scale": SCALE,
+        "bound_formula": "2^(-min(log2 m_i, log2 m_j))",
+        "tightest_bound": tightest_bound / SCALE,
+        "family_alpha": FAMILY_ALPHA,
+        "z": z,
+        "tolerance": tolerance_scaled / SCALE,
+        "bound_resolved": tolerance_scaled < tightest_bound,
+        "max_abs_correlation": max_abs / SCALE,
+        "max_pair": max_pair,
+        "violations": violations,
+        "num_violations": len(violations),
+        "pass": len(violations) == 0,
+        "seconds": seconds,
+        "samples_per_second": k * n_samples / seconds,
+        "correlation_scaled": correlations
+    }
+
+
+def run_all_tests(store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """Run the cross-channel correlation tests, replaying results already in the store."""
+    results = {
+        "node_id": "L006",
+        "title": "Cross-Channel Correlation Matrix Test",
+        "tests": [],
+        "seed": seed,
+        "overall_pass": True
+    }
+
+    # Test configurations (bits: channel moduli are the k largest primes below 2^bits)
+    configs = [
+        {"k": 16, "bits": 8, "n_samples": 1000000},
+        {"k": 64, "bits": 16, "n_samples": 1000000},
+    ]
+
+    print("=" * 60)
+    print("Shadow Entropy Cross-Channel Correlation Test (L006)")
+    print("|Cor(shadow_i, shadow_j)| < 2^(-min(log2 m_i, log2 m_j))")
+    print("=" * 60)
+
+    for cfg in configs:
+        moduli = coprime_moduli(cfg["k"], cfg["bits"])
+        print(f"\nTesting {cfg['k']} channels (moduli {moduli[-1]}..{moduli[0]}), "
+              f"n={cfg['n_samples']:,}...")
+
+        result = cached_call(store, test_cross_correlation, {
+            "moduli": moduli,
+            "n_samples": cfg["n_samples"],
+            "seed": seed
+        })
+        results["tests"].append(result)
+
+        if not result["pass"]:
+            results["overall_pass"] = False
+
+        print(f"  Max |correlation|: {result['max_abs_correlation']:.6f} (moduli {result['max_pair']})")
+        print(f"  Tightest bound: {result['tightest_bound']:.2e}, "
+              f"sampling tolerance: {result['tolerance']:.2e}"
+              f"{'' if result['bound_resolved'] else ' (bound below sampling resolution)'}")
+        print(f"  Violations: {result['num_violations']}/{result['pairs']} pairs")
+        print(f"  Result: {'PASS' if result['pass'] else 'FAIL'}")
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    store = ResultStore()
+    results = run_all_tests(store=store, seed=fresh_seed())
+
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+
+    for test in results["tests"]:
+        status = "PASS" if test["pass"] else "FAIL"
+        print(f"  k={test['channels']:3d}, n={test['samples']:,}: {status} "
+              f"(max |corr|={test['max_abs_correlation']:.6f})")
+
+    print()
+    print(f"OVERALL: {'PASS' if results['overall_pass'] else 'FAIL'}")
+
+    print(f"Seed: {results['seed']}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("L006_correlation_results.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Shadow-Driven Discrete Gaussian Sampler for FHE Noise (T003)
+
+Turns shadow bits into RLWE noise: samples of the discrete Gaussian chi_sigma
+over [-B, B], Pr[x] ∝ exp(-x² / 2σ²), as used for secrets and errors in
+qmnf_rlwe. T003 claims shadow-derived noise is (1) bounded, (2) close to a
+discrete Gaussian and (3) independent; this module provides the sampler and
+measures (1) and (2).
+
+Node T003 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate) in sampling; the
+             table is built once with 100-digit decimal exponentials
+             Standard library only
+
+PARAMETERS: As in RingDefinitions.lean: sigma is given × 1000
+(standard_gaussian: 3200, i.e. σ = 3.2), the tail cut is
+B = tail_sigmas × sigma / 1000 + 1 (tailBound, 6σ), and noise polynomials
+have N = 4096 coefficients modulo q = 2^54 - 33 (qmnf_production_ring).
+
+CUMULATIVE TABLE: The 2B + 1 probabilities are scaled to 64-bit integers
+T[i] = round(2^64 × Pr[X <= i - B]), so one uniform 64-bit word u maps to
+x = #{i : T[i] <= u} - B, which is exact up to 2^-64 per table entry. A
+batch of words is searched in one C-level map of bisect over the table,
+with no Python loop per sample.
+
+GUIDE TABLE: Shadow bits are the expensive input, so samples do not spend
+a whole word each. The top GUIDE_BITS bits of u fix x outright unless a
+threshold T[i] falls inside their 2^48-wide interval, which happens for at
+most 2B of the 2^16 prefixes (probability < 2B × 2^-16). Each sample draws
+one 16-bit prefix, all prefixes map through the guide table in one pass,
+and only the rare undecided samples draw 8 more bytes for the low bits and
+are searched in the full table. The output distribution is the 64-bit
+table's exactly, at ~16 bits per sample instead of 64. Bits come from
+packed shadow bits (generate_shadow_bits) or any bulk byte source.
+"""
+
+import io
+import json
+import math
+import os
+import secrets
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from decimal import Decimal, localcontext
+from itertools import compress, count, repeat
+from operator import eq, mod, sub
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from shadow_nist_tests import generate_shadow_bits
+from shadow_source import ShadowDRBG
+
+# standard_gaussian: σ × 1000, and the tail cut in σ (RingDefinitions.lean)
+SIGMA_MILLI = 3200
+TAIL_SIGMAS = 6
+
+# qmnf_production_ring
+RING_DEGREE = 4096
+RING_MODULUS = (1 << 54) - 33
+
+# Uniform bits per table lookup (one machine word), and the guide prefix
+PRECISION_BITS = 64
+GUIDE_BITS = 16
+
+# Shadow modulus of the default bit source
+SHADOW_MODULUS = 1 << 16
+
+# Decimal digits used to build the table
+_TABLE_DIGITS = 100
+
+RandBytes = Callable[[int], bytes]
+
+
+# =============================================================================
+# Cumulative Distribution Table
+# =============================================================================
+
+def tail_bound(sigma_milli: int = SIGMA_MILLI, tail_sigmas: int = TAIL_SIGMAS) -> int:
+    """B = tail_sigmas × sigma / 1000 + 1 (DiscreteGaussianConfig.tailBound)."""
+    return tail_sigmas * sigma_milli // 1000 + 1
+
+
+def cdt_table(sigma_milli: int = SIGMA_MILLI, tail_sigmas: int = TAIL_SIGMAS) -> List[int]:
+    """
+    Cumulative thresholds T[0..2B] of chi_sigma cut to [-B, B], scaled to 2^64.
+
+    T[2B] = 2^64, and T[i] - T[i-1] is the integer weight of x = i - B.
+    """
+    bound = tail_bound(sigma_milli, tail_sigmas)
+    with localcontext() as ctx:
+        ctx.prec = _TABLE_DIGITS
+        two_var = 2 * (Decimal(sigma_milli) / 1000) ** 2
+        weights = [(-Decimal(x * x) / two_var).exp() for x in range(-bound, bound + 1)]
+        total = sum(weights)
+        scale = Decimal(1 << PRECISION_BITS)
+        running = Decimal(0)
+        table = []
+        for w in weights:
+            running += w
+            table.append(int((running * scale / total).to_integral_value()))
+    table[-1] = 1 << PRECISION_BITS
+    return table
+
+
+# =============================================================================
+# Sampler
+# =============================================================================
+
+class DiscreteGaussianSampler:
+    """
+    Batch CDT sampler of chi_sigma over [-B, B].
+
+    sample() draws from a byte source through the guide table;
+    sample_words() maps full uniform 64-bit words (one table search each)
+    and gives the same distribution.
+    """
+
+    def __init__(self, sigma_milli: int = SIGMA_MILLI, tail_sigmas: int = TAIL_SIGMAS):
+        self.sigma_milli = sigma_milli
+        self.tail_sigmas = tail_sigmas
+        self.bound = tail_bound(sigma_milli, tail_sigmas)
+        self.table = cdt_table(sigma_milli, tail_sigmas)
+        # bisect_right over all but the last threshold (2^64 exceeds every word)
+        self._search = self.table[:-1]
+        # Undecided guide entries hold bound + 1, outside [-B, B]
+        self._undecided = self.bound + 1
+        self._typecode = "b" if self._undecided < 1 << 7 else "h" if self._undecided < 1 << 15 else "l"
+        self._low_bits = PRECISION_BITS - GUIDE_BITS
+        self._guide = array(self._typecode, map(self._guide_entry, range(1 << GUIDE_BITS)))
+
+    def _guide_entry(self, prefix: int) -> int:
+        """x for every word with this prefix, or the undecided marker."""
+        first = bisect_right(self._search, prefix << self._low_bits)
+        last = bisect_right(self._search, ((prefix + 1) << self._low_bits) - 1)
+        return first - self.bound if first == last else self._undecided
+
+    def weights(self) -> List[int]:
+        """Integer weight (out of 2^64) of each value -B..B."""
+        return list(map(sub, self.table, [0] + self.table[:-1]))
+
+    def sample_words(self, words: Sequence[int]) -> array:
+        """One sample per uniform 64-bit word."""
+        bound = self.bound
+        return array(self._typecode,
+                     map(sub, map(bisect_right, repeat(self._search), words), repeat(bound)))
+
+    def sample(self, randbytes: RandBytes, n: int) -> array:
+        """
+        n samples from a byte source: 2 bytes each, plus 8 more for the
+        rare samples the guide table leaves undecided.
+        """
+        prefixes = array("H")
+        prefixes.frombytes(randbytes(n * GUIDE_BITS // 8))
+        out = array(self._typecode, map(self._guide.__getitem__, prefixes))
+        pending = list(compress(count(), map(eq, out, repeat(self._undecided))))
+        if pending:
+            low = array("Q")
+            low.frombytes(randbytes(8 * len(pending)))
+            mask = (1 << self._low_bits) - 1
+            for i, word in zip(pending, low):
+                out[i] = bisect_right(self._search, (prefixes[i] << self._low_bits) | (word & mask)) - self.bound
+        return out
+
+
+def shadow_randbytes(m: int = SHADOW_MODULUS, seed: Optional[int] = None) -> RandBytes:
+    """
+    Byte source over shadow bits of modulus m (generate_shadow_bits).
+
+    With a seed, call j reads the stream of the DRBG substream
+    "gaussian/call{j}", so a seeded run is reproducible call by call.
+    """
+    calls = count()
+
+    def randbytes(n: int) -> bytes:
+        call_seed = None
+        if seed is not None:
+            derived = ShadowDRBG(seed).substream(f"gaussian/call{next(calls)}")
+            call_seed = int.from_bytes(derived.seed, "big")
+        return generate_shadow_bits(m, 8 * n, call_seed).tobytes()
+
+    return randbytes
+
+
+def shadow_gaussian(sampler: DiscreteGaussianSampler, n: int, m: int = SHADOW_MODULUS,
+                    seed: Optional[int] = None) -> array:
+    """n samples driven by shadow bits of modulus m."""
+    return sampler.sample(shadow_randbytes(m, seed), n)
+
+
+def bulk_gaussian(sampler: DiscreteGaussianSampler, n: int,
+                  randbytes: RandBytes = os.urandom) -> array:
+    """n samples driven by a bulk random byte source."""
+    return sampler.sample(randbytes, n)
+
+
+def secrets_gaussian(sampler: DiscreteGaussianSampler, n: int) -> List[int]:
+    """Baseline: one secrets.randbits word and one table search per sample."""
+    table, bound = sampler._search, sampler.bound
+    return [bisect_right(table, secrets.randbits(PRECISION_BITS)) - bound for _ in range(n)]
+
+
+def noise_polynomial(samples: Sequence[int], q: int = RING_MODULUS) -> array:
+    """Coefficients of a noise polynomial in R_q (negative samples wrap to q - |x|)."""
+    return array("Q", map(mod, samples, repeat(q)))
+
+
+# =============================================================================
+# Quality and Throughput
+# =============================================================================
+
+def gaussian_fit(sampler: DiscreteGaussianSampler, samples: Sequence[int]) -> Dict:
+    """
+    Boundedness and closeness of samples to the sampler's distribution.
+
+    Chi-squared runs over values with expected count >= 5 (the tails are
+    pooled into the outermost such bins); the TV distance compares the
+    empirical and table probabilities over all of [-B, B].
+    """
+    n = len(samples)
+    bound = sampler.bound
+    counts = Counter(samples)
+    weights = sampler.weights()
+    scale = 1 << PRECISION_BITS
+    max_abs = max(abs(min(counts)), abs(max(counts)))
+
+    # Exact TV distance to the table distribution: Σ|c × 2^64 - n × w| / (2 n 2^64)
+    values = range(-bound, bound + 1)
+    tv_sum = sum(abs(counts.get(x, 0) * scale - n * w) for x, w in zip(values, weights))
+
+    # Pool tails until every bin expects >= 5 samples
+    expected = [n * w / scale for w in weights]
+    observed = [counts.get(x, 0) for x in values]
+    lo, hi = 0, len(expected) - 1
+    while lo < hi and expected[lo] < 5:
+        expected[lo + 1] += expected[lo]
+        observed[lo + 1] += observed[lo]
+        lo += 1
+    while hi > lo and expected[hi] < 5:
+        expected[hi - 1] += expected[hi]
+        observed[hi - 1] += observed[hi]
+        hi -= 1
+    chi_sq = sum((o - e) ** 2 / e for o, e in zip(observed[lo:hi + 1], expected[lo:hi + 1]))
+    df = hi - lo
+    critical = df + 2.326 * math.sqrt(2 * df)  # 1% level, as in C001
+
+    mean_milli = sum(samples) * 1000 // n
+    var_milli = (sum(x * x for x in samples) * 1000000 // n - mean_milli * mean_milli) // 1000
+    return {
+        "samples": n,
+        "tail_bound": bound,
+        "max_abs": max_abs,
+        "bounded": max_abs <= bound,
+        "mean_milli": mean_milli,
+        "variance_milli": var_milli,
+        "table_variance_milli": sum(x * x * w for x, w in zip(values, weights)) * 1000 // scale,
+        "tv_distance": tv_sum / (2 * n * scale),
+        "chi_squared": chi_sq,
+        "degrees_of_freedom": df,
+        "critical_value": critical,
+        "chi_squared_pass": chi_sq < critical,
+        "pass": max_abs <= bound and chi_sq < critical
+    }
+
+
+def _rate(fn: Callable[[], Sequence[int]], n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def benchmark_sampler(sampler: DiscreteGaussianSampler, n: int = RING_DEGREE * 64,
+                      m: int = SHADOW_MODULUS) -> Dict:
+    """
+    Samples per second of each source, at the sampler's parameters.
+
+    "table_search" times the sampler alone on pre-drawn bytes; the other
+    rates include drawing the random bits.
+    """
+    buffer = os.urandom(n * (GUIDE_BITS // 8 + 1))
+    rates = {
+        "table_search": _rate(lambda: sampler.sample(io.BytesIO(buffer).read, n), n),
+        "shadow": _rate(lambda: shadow_gaussian(sampler, n, m), n),
+        "bulk_urandom": _rate(lambda: bulk_gaussian(sampler, n), n),
+        "secrets_baseline": _rate(lambda: secrets_gaussian(sampler, n), n),
+    }
+    return {
+        "sigma_milli": sampler.sigma_milli,
+        "tail_sigmas": sampler.tail_sigmas,
+        "tail_bound": sampler.bound,
+        "shadow_modulus": m,
+        "samples": n,
+        "samples_per_second": rates,
+        "shadow_speedup_vs_secrets": rates["shadow"] / rates["secrets_baseline"],
+        "polynomials_per_second": {name: rate / RING_DEGREE for name, rate in rates.items()}
+    }
+
+
+def test_shadow_gaussian(n_samples: int, sigma_milli: int = SIGMA_MILLI,
+                         tail_sigmas: int = TAIL_SIGMAS, m: int = SHADOW_MODULUS,
+                         seed: Optional[int] = None) -> Dict:
+    """
+    Sample n_samples shadow-driven noise values and check T003 (1) and (2).
+
+    Args:
+        n_samples: Number of samples
+        sigma_milli: σ × 1000
+        tail_sigmas: Tail cut in σ
+        m: Shadow modulus of the bit source
+        seed: DRBG seed for a reproducible run (None: OS randomness)
+
+    Returns:
+        Test results
+    """
+    sampler = DiscreteGaussianSampler(sigma_milli, tail_sigmas)
+    samples = shadow_gaussian(sampler, n_samples, m, seed)
+    result = gaussian_fit(sampler, samples)
+    result.update({"test_type": "shadow_gaussian", "sigma_milli": sigma_milli,
+                   "tail_sigmas": tail_sigmas, "shadow_modulus": m})
+    return result
+
+
+def main():
+    """Main entry point."""
+    print("=" * 70)
+    print("Shadow-Driven Discrete Gaussian Sampler (T003)")
+    print(f"σ = {SIGMA_MILLI / 1000}, tail {TAIL_SIGMAS}σ (B = {tail_bound()}), "
+          f"N = {RING_DEGREE}, q = 2^54 - 33")
+    print("=" * 70)
+
+    sampler = DiscreteGaussianSampler()
+    bench = benchmark_sampler(sampler)
+    for name, rate in bench["samples_per_second"].items():
+        print(f"  {name:18s}: {rate / 1e6:8.3f} M samples/s "
+              f"({bench['polynomials_per_second'][name]:8.1f} polynomials/s)")
+    print(f"  Shadow vs secrets baseline: {bench['shadow_speedup_vs_secrets']:.1f}x")
+
+    fit = test_shadow_gaussian(1000000)
+    print(f"\nQuality over {fit['samples']:,} shadow-driven samples:")
+    print(f"  max |x| = {fit['max_abs']} (bound {fit['tail_bound']}): "
+          f"{'PASS' if fit['bounded'] else 'FAIL'}")
+    print(f"  variance = {fit['variance_milli'] / 1000:.3f} "
+          f"(table {fit['table_variance_milli'] / 1000:.3f})")
+    print(f"  chi-squared = {fit['chi_squared']:.1f} (df {fit['degrees_of_freedom']}, "
+          f"critical {fit['critical_value']:.1f}), TV = {fit['tv_distance']:.6f}")
+    print(f"  Result: {'PASS' if fit['pass'] else 'FAIL'}")
+
+    # One noise polynomial of qmnf_rlwe, as a smoke test of the ring mapping
+    poly = noise_polynomial(shadow_gaussian(sampler, RING_DEGREE))
+    print(f"  Noise polynomial: {len(poly)} coefficients in [0, q)")
+
+    results = {
+        "node_id": "T003",
+        "title": "Shadow-Driven Discrete Gaussian Sampler",
+        "benchmark": bench,
+        "fit": fit,
+        "overall_pass": fit["pass"]
+    }
+
+    output_path = Path(__file__).with_name("T003_gaussian_results.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -12,29 +12,33 @@ REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
 """
 
 import json
-import secrets
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from shadow_result_store import ResultStore, cached_call, fresh_seed
+from shadow_source import ShadowDRBG, crt_shadow_batch
+from shadow_stats import MomentAccumulator
 
-def generate_shadow_sequence(m: int, n_samples: int) -> List[int]:
+# Shadows generated and accumulated per step
+CHUNK_SAMPLES = 1 << 20
+
+
+def generate_shadow_sequence(m: int, n_samples: int, seed: Optional[int] = None,
+                             offset: int = 0) -> Sequence[int]:
     """
     Generate a sequence of CRT shadows.
 
     Each shadow is V mod m where V is uniform over [0, M) for some M coprime to m.
+    With a seed the shadows are samples offset..offset+n_samples-1 of that
+    seed's stream, so consecutive chunks continue one sequence.
     """
-    # Use M = m + 1 (coprime for most m)
-    M = m * (m + 1)
-    shadows = []
-
-    for _ in range(n_samples):
-        V = secrets.randbelow(M)
-        shadow = V % m
-        shadows.append(shadow)
-
+    # Use M = m × (m + 1) (m and m + 1 are always coprime)
+    drbg = ShadowDRBG(seed) if seed is not None else None
+    shadows, _ = crt_shadow_batch(m + 1, m, n_samples, drbg=drbg, offset=offset)
     return shadows
 
 
-def compute_mean_integer(values: List[int], scale: int = 1000000) -> int:
+def compute_mean_integer(values: Sequence[int], scale: int = 1000000) -> int:
     """
     Compute mean using integer arithmetic (scaled by scale).
 
@@ -43,7 +47,7 @@ def compute_mean_integer(values: List[int], scale: int = 1000000) -> int:
     return (sum(values) * scale) // len(values)
 
 
-def compute_variance_integer(values: List[int], mean_scaled: int, scale: int = 1000000) -> int:
+def compute_variance_integer(values: Sequence[int], mean_scaled: int, scale: int = 1000000) -> int:
     """
     Compute variance using integer arithmetic.
 
@@ -62,7 +66,7 @@ def compute_variance_integer(values: List[int], mean_scaled: int, scale: int = 1
 
 
 def compute_autocorrelation_integer(
-    values: List[int],
+    values: Sequence[int],
     lag: int,
     mean_scaled: int,
     var_scaled: int,
@@ -99,11 +103,30 @@ def compute_autocorrelation_integer(
     return autocorr_scaled
 
 
+def compute_autocorrelations_integer(
+    values: Sequence[int],
+    max_lag: int,
+    mean_scaled: int,
+    var_scaled: int,
+    scale: int = 1000000
+) -> List[int]:
+    """
+    Autocorrelation * scale for every lag 0..max_lag in O(n log n).
+
+    Same integer result as compute_autocorrelation_integer at each lag. The
+    covariance sum is expanded over exact lagged cross-sums
+    C_k = Σ x_i x_{i+k} (one NTT product, see shadow_stats).
+    """
+    acc = MomentAccumulator.from_values(values, max_lag)
+    return acc.autocorrelations_scaled(mean_scaled, var_scaled, scale)
+
+
 def test_autocorrelation(
     m: int,
     n_samples: int,
     max_lag: int,
-    threshold_scaled: int
+    threshold_scaled: int,
+    seed: Optional[int] = None
 ) -> Dict:
     """
     Test independence via autocorrelation.
@@ -113,26 +136,31 @@ def test_autocorrelation(
         n_samples: Number of samples
         max_lag: Maximum lag to test
         threshold_scaled: Autocorrelation threshold * scale
+        seed: DRBG seed for a reproducible run (None: OS randomness)
 
     Returns:
         Test results
     """
     scale = 1000000  # 6 decimal places
 
-    shadows = generate_shadow_sequence(m, n_samples)
+    # One pass: exact power sums are accumulated while shadows are generated
+    moments = MomentAccumulator(max_lag)
+    for start in range(0, n_samples, CHUNK_SAMPLES):
+        moments.update(generate_shadow_sequence(m, min(CHUNK_SAMPLES, n_samples - start),
+                                                seed, start))
 
-    mean_scaled = compute_mean_integer(shadows, scale)
-    var_scaled = compute_variance_integer(shadows, mean_scaled, scale)
+    mean_scaled = moments.mean_scaled(scale)
+    var_scaled = moments.variance_scaled(mean_scaled, scale)
 
     # Test autocorrelation at each lag
     violations = []
     max_autocorr = 0
     autocorrs = {}
 
-    for lag in range(1, max_lag + 1):
-        autocorr = compute_autocorrelation_integer(
-            shadows, lag, mean_scaled, var_scaled, scale
-        )
+    all_autocorrs = moments.autocorrelations_scaled(mean_scaled, var_scaled, scale)
+
+    for lag in range(1, len(all_autocorrs)):
+        autocorr = all_autocorrs[lag]
         autocorrs[lag] = autocorr
 
         abs_autocorr = abs(autocorr)
@@ -169,12 +197,13 @@ def test_autocorrelation(
     }
 
 
-def run_all_tests() -> Dict:
-    """Run independence tests."""
+def run_all_tests(store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """Run independence tests, replaying results already in the store."""
     results = {
         "node_id": "C002",
         "title": "Independence Computational Test",
         "tests": [],
+        "seed": seed,
         "overall_pass": True
     }
 
@@ -193,12 +222,13 @@ def run_all_tests() -> Dict:
         print(f"\nTesting m={cfg['m']}, n={cfg['n_samples']}, max_lag={cfg['max_lag']}...")
 
         threshold_scaled = int(cfg['threshold'] * 1000000)
-        result = test_autocorrelation(
-            cfg['m'],
-            cfg['n_samples'],
-            cfg['max_lag'],
-            threshold_scaled
-        )
+        result = cached_call(store, test_autocorrelation, {
+            "m": cfg['m'],
+            "n_samples": cfg['n_samples'],
+            "max_lag": cfg['max_lag'],
+            "threshold_scaled": threshold_scaled,
+            "seed": seed
+        })
 
         results["tests"].append(result)
 
@@ -215,7 +245,8 @@ def run_all_tests() -> Dict:
 
 def main():
     """Main entry point."""
-    results = run_all_tests()
+    store = ResultStore()
+    results = run_all_tests(store=store, seed=fresh_seed())
 
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -228,7 +259,10 @@ def main():
     print()
     print(f"OVERALL: {'PASS' if results['overall_pass'] else 'FAIL'}")
 
-    output_path = "/home/acid/Projects/hackfate/proofs/tests/C002_results.json"
+    print(f"Seed: {results['seed']}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("C002_results.json")
     with open(output_path, "w") as f:
         json.dump(results, f, indent=2)
     print(f"\nResults written to: {output_path}")
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+SP 800-90B Min-Entropy Estimators for Shadows (D003/L004)
+
+Measures the min-entropy H_∞(X) = -log₂(max_x Pr[X = x]) of shadow
+sequences (D003) with the non-IID estimators of NIST SP 800-90B Section
+6.3, and compares the result with the L004 claim H_∞(shadow) ≥ log₂(m_s) - ε:
+
+- 6.3.1 most common value, 6.3.5 t-tuple, 6.3.6 longest repeated
+  substring: on the shadow symbols themselves
+- 6.3.2 collision, 6.3.3 Markov, 6.3.4 compression: binary-only in
+  SP 800-90B, so they run on the bitstring of the shadows (each shadow as
+  a fixed-width field) and are scaled back to bits per shadow
+
+Nodes D003, L004 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only counting; floating point only in the final
+             confidence bounds and root solving
+             Standard library only
+
+TUPLES: t-tuple and LRS share one set of tuple counts. Every length-W
+window is an exact integer (base-m digits of the window), counted in a hash
+table. Windows are built directly at W* = ceil(log_m L) by doubling, and
+the counts of every shorter length follow by merging tuples that share a
+prefix. Above W*, a (W + 1)-tuple can only repeat if its W-prefix repeats,
+so the positions whose window occurs once are dropped and the survivors
+are extended by one digit at C level. The work shrinks geometrically past
+W*, so 10^6 samples take seconds instead of the O(L²) of a direct
+substring search.
+
+COMPRESSION: The estimator's G(z) is a double sum over t = d+1..L and
+u = 1..t. Regrouped by u it becomes a single sum of log₂(u) z² (1-z)^(u-1)
+weighted by the number of t above u, and terms are cut off once (1-z)^u
+falls below 2^-TAIL_BITS, so each evaluation inside the root search is
+O(min(L, TAIL_BITS / z)) instead of O(L²). Match distances come from
+splitting the block string at each of the 2^6 symbol values.
+"""
+
+import json
+import math
+import time
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, compress, repeat
+from operator import add, mul, or_
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from shadow_bitstream import BitSequence
+from shadow_independence_test import generate_shadow_sequence
+from shadow_result_store import ResultStore, cached_call, fresh_seed
+
+# z-value of the 99% upper confidence bound (SP 800-90B)
+Z_99 = 2.576
+
+# t-tuple: tuples must occur at least this often (SP 800-90B 6.3.5)
+TUPLE_CUTOFF = 35
+
+# Compression estimator block size and dictionary length (SP 800-90B 6.3.4)
+COMPRESSION_BLOCK_BITS = 6
+COMPRESSION_DICT_BLOCKS = 1000
+COMPRESSION_SIGMA_FACTOR = 0.5907
+
+# Markov estimator sequence length (SP 800-90B 6.3.3)
+MARKOV_LENGTH = 128
+
+# Series terms below 2^-TAIL_BITS of the leading term are dropped
+TAIL_BITS = 100
+
+# Bisection steps of the root searches
+SEARCH_STEPS = 60
+
+# L004 passes when every estimate is at least this fraction of log₂(m).
+# The estimators are conservative by design (99% bounds, and the compression
+# estimate reads ~0.85-0.9 bits/bit even on ideal binary data), so the
+# threshold leaves room for that bias.
+MIN_ENTROPY_FRACTION = 0.8
+
+# Collision scan: (state, byte) -> (state, collisions of length 2, of length 3).
+# States: 0 empty, 1 "0", 2 "1", 3 "01", 4 "10" (pending bits of the
+# current collision window).
+_COLLISION_STEP = {(0, 0): (1, 0, 0), (0, 1): (2, 0, 0),
+                   (1, 0): (0, 1, 0), (1, 1): (3, 0, 0),
+                   (2, 0): (4, 0, 0), (2, 1): (0, 1, 0),
+                   (3, 0): (0, 0, 1), (3, 1): (0, 0, 1),
+                   (4, 0): (0, 0, 1), (4, 1): (0, 0, 1)}
+
+
+def _collision_byte_table() -> List[Tuple[int, int, int]]:
+    """Collision scan of every (state, byte) pair, indexed by state * 256 + byte."""
+    table = []
+    for state in range(5):
+        for byte in range(256):
+            s, twos, threes = state, 0, 0
+            for i in range(7, -1, -1):
+                s, c2, c3 = _COLLISION_STEP[(s, (byte >> i) & 1)]
+                twos += c2
+                threes += c3
+            table.append((s, twos, threes))
+    return table
+
+
+_COLLISION_TABLE = _collision_byte_table()
+
+# Byte translations that cut 3 bytes into 4 sextets (compression estimator)
+_SHR2 = bytes(v >> 2 for v in range(256))
+_SHR4 = bytes(v >> 4 for v in range(256))
+_SHR6 = bytes(v >> 6 for v in range(256))
+_LOW2_SHL4 = bytes((v & 3) << 4 for v in range(256))
+_LOW4_SHL2 = bytes((v & 15) << 2 for v in range(256))
+_LOW6 = bytes(v & 63 for v in range(256))
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def upper_bound(p_hat: float, n: int) -> float:
+    """99% upper confidence bound on a proportion observed over n trials."""
+    return min(1.0, p_hat + Z_99 * math.sqrt(p_hat * (1 - p_hat) / (n - 1)))
+
+
+def entropy_of(p: float) -> float:
+    """-log₂(p), with p = 0 read as no information."""
+    return -math.log2(p) if p > 0 else 0.0
+
+
+def shadow_bits(symbols: Sequence[int], m: int) -> BitSequence:
+    """Bitstring of a shadow sequence, one (m - 1).bit_length()-bit field per shadow."""
+    return BitSequence.from_fields(symbols, max(1, (m - 1).bit_length()))
+
+
+# =============================================================================
+# Symbol Estimators (6.3.1, 6.3.5, 6.3.6)
+# =============================================================================
+
+def mcv_estimate(symbols: Sequence[int]) -> Dict:
+    """Most common value estimate (6.3.1), in bits per symbol."""
+    n = len(symbols)
+    p_hat = max(Counter(symbols).values()) / n
+    p_u = upper_bound(p_hat, n)
+    return {"p_hat": p_hat, "p_u": p_u, "min_entropy": entropy_of(p_u)}
+
+
+def tuple_windows(symbols: Sequence[int], radix: int, width: int) -> List[int]:
+    """
+    Every length-width window of symbols as a base-radix integer.
+
+    Windows of length a and b combine into length a + b as
+    w[i] × radix^b + w'[i + a], so the lengths double and only
+    O(log width) passes over the sequence are needed.
+    """
+    n = len(symbols)
+    windows, length = None, 0
+    power, power_length = list(symbols), 1
+    while True:
+        if width & 1:
+            if windows is None:
+                windows, length = power, power_length
+            else:
+                count = n - length - power_length + 1
+                windows = list(map(add, map(mul, windows[:count], repeat(radix ** power_length)),
+                                   power[length:length + count]))
+                length += power_length
+        width >>= 1
+        if not width:
+            return windows
+        count = n - 2 * power_length + 1
+        power = list(map(add, map(mul, power[:count], repeat(radix ** power_length)),
+                         power[power_length:power_length + count]))
+        power_length *= 2
+
+
+def _tuple_summary(counts: Counter) -> Tuple[int, int]:
+    """(count of the most common tuple, Σ C(c, 2) over all tuple counts)."""
+    return max(counts.values()), sum(c * (c - 1) // 2 for c in counts.values() if c > 1)
+
+
+def tuple_statistics(symbols: Sequence[int], radix: int) -> Dict:
+    """
+    Tuple counts behind the t-tuple and LRS estimates.
+
+    Returns Q[W] (count of the most common W-tuple) while Q[W] >= 2, and
+    collisions[W] = Σ_i C(c_i, 2) over the counts c_i of all W-tuples,
+    for every W up to the longest repeated substring length.
+
+    Counting starts at the first length W* with radix^W* >= L. Shorter
+    lengths are derived from it by merging counts of tuples with a common
+    prefix (plus the one window too close to the end to be a prefix);
+    longer lengths extend only the windows that still repeat.
+    """
+    n = len(symbols)
+    start = 1
+    while radix ** start < n and start < n:
+        start += 1
+
+    windows = tuple_windows(symbols, radix, start)
+    counts = Counter(windows)
+    below = []
+    level = counts
+    for width in range(start - 1, 0, -1):
+        merged: Counter = Counter()
+        for key, count in level.items():
+            merged[key // radix] += count
+        last = 0
+        for digit in symbols[n - width:]:
+            last = last * radix + digit
+        merged[last] += 1
+        below.append(_tuple_summary(merged))
+        level = merged
+    below.reverse()
+    most_common = [top for top, _ in below]
+    collisions = [pairs for _, pairs in below]
+
+    positions = None  # None: every window still present (position i at index i)
+    width = start
+    while windows:
+        if width > start:
+            counts = Counter(windows)
+        top, pairs = _tuple_summary(counts)
+        if top < 2:
+            break
+        most_common.append(top)
+        collisions.append(pairs)
+
+        if positions is None and min(counts.values()) >= 2:
+            # Dense: every window repeats, extend all but the last by one digit
+            windows = list(map(add, map(mul, windows[:-1], repeat(radix)), symbols[width:]))
+        else:
+            # Keep repeated windows with room to grow, then append the next digit
+            if positions is None:
+                positions = range(len(windows))
+            keep = list(map((2).__le__, map(counts.__getitem__, windows)))
+            positions = list(compress(positions, keep))
+            windows = list(compress(windows, keep))
+            cut = bisect_left(positions, n - width)
+            positions, windows = positions[:cut], windows[:cut]
+            next_digits = map(symbols.__getitem__, map(add, positions, repeat(width)))
+            windows = list(map(add, map(mul, windows, repeat(radix)), next_digits))
+        width += 1
+
+    return {"length": n, "most_common": most_common, "collisions": collisions}
+
+
+def t_tuple_estimate(stats: Dict) -> Optional[Dict]:
+    """
+    t-tuple estimate (6.3.5), in bits per symbol.
+
+    None when no single symbol occurs TUPLE_CUTOFF times (alphabet too
+    large for the sample count).
+    """
+    n = stats["length"]
+    q = [c for c in stats["most_common"] if c >= TUPLE_CUTOFF]
+    if not q:
+        return None
+    p_hat = max((c / (n - w)) ** (1 / (w + 1)) for w, c in enumerate(q))
+    p_u = upper_bound(p_hat, n)
+    return {"t": len(q), "p_hat": p_hat, "p_u": p_u, "min_entropy": entropy_of(p_u)}
+
+
+def lrs_estimate(stats: Dict) -> Optional[Dict]:
+    """
+    Longest repeated substring estimate (6.3.6), in bits per symbol.
+
+    Uses tuple lengths u..v, with u the first length whose most common
+    tuple occurs fewer than TUPLE_CUTOFF times and v the LRS length.
+    """
+    n = stats["length"]
+    v = len(stats["most_common"])
+    u = 1 + sum(1 for c in stats["most_common"] if c >= TUPLE_CUTOFF)
+    if u > v:
+        return None
+    p_hat = max((stats["collisions"][w - 1] / ((n - w + 1) * (n - w) // 2)) ** (1 / w)
+                for w in range(u, v + 1))
+    p_u = upper_bound(p_hat, n)
+    return {"u": u, "v": v, "p_hat": p_hat, "p_u": p_u, "min_entropy": entropy_of(p_u)}
+
+
+# =============================================================================
+# Binary Estimators (6.3.2, 6.3.3, 6.3.4)
+# =============================================================================
+
+def collision_estimate(bits: BitSequence) -> Dict:
+    """
+    Collision estimate (6.3.2), in bits per bit.
+
+    For binary data the collision time t is 2 or 3 and E[t] = 2 + 2p(1-p),
+    which is the SP 800-90B expression in closed form; it is solved for the
+    most likely bit probability p >= 1/2.
+    """
+    state = twos = threes = 0
+    n_bytes = len(bits) // 8
+    table = _COLLISION_TABLE
+    for byte in bits[:n_bytes * 8].tobytes():
+        state, c2, c3 = table[state * 256 + byte]
+        twos += c2
+        threes += c3
+    for bit in bits[n_bytes * 8:]:
+        state, c2, c3 = _COLLISION_STEP[(state, bit)]
+        twos += c2
+        threes += c3
+
+    v = twos + threes
+    mean = (2 * twos + 3 * threes) / v
+    sigma = math.sqrt(max(0.0, (4 * twos + 9 * threes - v * mean * mean) / (v - 1)))
+    mean_lower = mean - Z_99 * sigma / math.sqrt(v)
+    spread = 1 - 2 * (mean_lower - 2)
+    p = 0.5 + math.sqrt(spread) / 2 if spread > 0 else 0.5
+    return {"collisions": v, "mean": mean, "mean_lower": mean_lower, "p": min(1.0, p),
+            "min_entropy": entropy_of(min(1.0, p))}
+
+
+def markov_estimate(bits: BitSequence) -> Dict:
+    """
+    Markov estimate (6.3.3), in bits per bit.
+
+    Transition counts come from popcounts of the packed sequence against
+    itself shifted by one bit.
+    """
+    n = len(bits)
+    x = bits.to_int()
+    prev, nxt = x >> 1, x & ((1 << (n - 1)) - 1)
+    ones = x.bit_count()
+    c11 = (prev & nxt).bit_count()
+    c10 = prev.bit_count() - c11
+    c01 = nxt.bit_count() - c11
+    c00 = n - 1 - c11 - c10 - c01
+
+    def log2_ratio(a: int, b: int) -> float:
+        return math.log2(a / b) if a else -math.inf
+
+    p0, p1 = log2_ratio(n - ones, n), log2_ratio(ones, n)
+    p00, p01 = log2_ratio(c00, c00 + c01), log2_ratio(c01, c00 + c01)
+    p10, p11 = log2_ratio(c10, c10 + c11), log2_ratio(c11, c10 + c11)
+    steps = MARKOV_LENGTH - 1
+    half = MARKOV_LENGTH // 2
+    log2_max = max(
+        p0 + steps * p00,
+        p0 + half * p01 + (half - 1) * p10,
+        p0 + p01 + (steps - 1) * p11,
+        p1 + p10 + (steps - 1) * p00,
+        p1 + half * p10 + (half - 1) * p01,
+        p1 + steps * p11,
+    )
+    return {"transitions": {"00": c00, "01": c01, "10": c10, "11": c11},
+            "log2_p_max": log2_max,
+            "min_entropy": min(1.0, -log2_max / MARKOV_LENGTH)}
+
+
+def _compression_g(z: float, n_blocks: int, d: int) -> float:
+    """
+    Σ_{t=d+1}^{L} Σ_{u=1}^{t} log₂(u) F(z, t, u), regrouped by u.
+
+    F(z, t, u) = z² (1-z)^(u-1) for u < t and z (1-z)^(t-1) for u = t.
+    """
+    if z <= 0 or z >= 1:
+        return 0.0
+    r = 1 - z
+    cutoff = min(n_blocks, max(d + 1, int(TAIL_BITS / -math.log2(r)) + 1))
+    powers = list(accumulate(repeat(r, cutoff - 1), mul, initial=1.0))  # r^(u-1), u = 1..cutoff
+    logs = [0.0] + list(map(math.log2, range(1, cutoff + 1)))
+    inner = sum(logs[u] * powers[u - 1] * (n_blocks - max(u, d)) for u in range(1, min(cutoff, n_blocks)))
+    diagonal = sum(logs[t] * powers[t - 1] for t in range(d + 1, cutoff + 1))
+    return z * z * inner + z * diagonal
+
+
+def sextets(bits: BitSequence) -> bytes:
+    """
+    Consecutive 6-bit blocks of bits, one byte each.
+
+    Every 3 bytes hold 4 blocks; each block is a shifted byte, or two
+    shifted bytes ORed, taken over whole byte columns at C level.
+    """
+    n_blocks = len(bits) // 6
+    data = bits[:n_blocks * 6].tobytes()
+    data += bytes(-len(data) % 3)
+    b0, b1, b2 = data[0::3], data[1::3], data[2::3]
+    out = bytearray(4 * len(b0))
+    out[0::4] = b0.translate(_SHR2)
+    out[1::4] = bytes(map(or_, b0.translate(_LOW2_SHL4), b1.translate(_SHR4)))
+    out[2::4] = bytes(map(or_, b1.translate(_LOW4_SHL2), b2.translate(_SHR6)))
+    out[3::4] = b2.translate(_LOW6)
+    return bytes(out[:n_blocks])
+
+
+def compression_estimate(bits: BitSequence) -> Dict:
+    """Compression estimate (6.3.4) over 6-bit blocks, in bits per bit."""
+    b, d = COMPRESSION_BLOCK_BITS, COMPRESSION_DICT_BLOCKS
+    blocks = sextets(bits)
+    n_blocks = len(blocks)
+    v = n_blocks - d
+    if v < 2:
+        raise ValueError("sequence too short for the compression estimate")
+
+    # Distances D_i = i - (last index of the same block), or i if unseen
+    distances: Counter = Counter()
+    dictionary, tested = blocks[:d], blocks[d:]
+    for symbol in set(tested):
+        key = bytes([symbol])
+        pieces = tested.split(key)
+        first = d + len(pieces[0])  # 0-based index of the first tested occurrence
+        last = dictionary.rfind(key)
+        distances[first - last if last >= 0 else first + 1] += 1
+        distances.update(map((1).__add__, map(len, pieces[1:-1])))
+
+    total = sum(c * math.log2(dist) for dist, c in distances.items())
+    total_sq = sum(c * math.log2(dist) ** 2 for dist, c in distances.items())
+    mean = total / v
+    sigma = COMPRESSION_SIGMA_FACTOR * math.sqrt(max(0.0, total_sq / (v - 1) - mean * mean))
+    mean_lower = mean - Z_99 * sigma / math.sqrt(v)
+
+    others = (1 << b) - 1
+
+    def expected(p: float) -> float:
+        q = (1 - p) / others
+        return (_compression_g(p, n_blocks, d)
+                + others * _compression_g(q, n_blocks, d)) / v
+
+    # expected() decreases from p = 2^-b (uniform) to p = 1
+    lo, hi = 1 / (1 << b), 1.0
+    if mean_lower >= expected(lo):
+        p = lo
+    else:
+        for _ in range(SEARCH_STEPS):
+            mid = (lo + hi) / 2
+            if expected(mid) > mean_lower:
+                lo = mid
+            else:
+                hi = mid
+        p = hi
+    return {"blocks": n_blocks, "mean": mean, "mean_lower": mean_lower, "p": p,
+            "min_entropy": entropy_of(p) / b}
+
+
+# =============================================================================
+# Suite
+# =============================================================================
+
+def estimate_min_entropy(symbols: Sequence[int], m: int) -> Dict:
+    """
+    All six estimates for a sequence over [0, m), in bits per symbol.
+
+    Binary estimates are per bit of the shadow bitstring and count
+    (m - 1).bit_length() bits per symbol, as SP 800-90B does for non-binary
+    sources; min_entropy is the minimum over all available estimates.
+    """
+    width = max(1, (m - 1).bit_length())
+    bits = shadow_bits(symbols, m)
+    start = time.perf_counter()
+    stats = tuple_statistics(symbols, m)
+    timings = {"tuple_counts": time.perf_counter() - start}
+
+    estimates = {}
+    for name, estimator, arg, scale in [
+        ("most_common_value", mcv_estimate, symbols, 1),
+        ("collision", collision_estimate, bits, width),
+        ("markov", markov_estimate, bits, width),
+        ("compression", compression_estimate, bits, width),
+        ("t_tuple", t_tuple_estimate, stats, 1),
+        ("lrs", lrs_estimate, stats, 1),
+    ]:
+        start = time.perf_counter()
+        result = estimator(arg)
+        timings[name] = time.perf_counter() - start
+        if result is not None:
+            result["min_entropy_per_symbol"] = result["min_entropy"] * scale
+        estimates[name] = result
+
+    available = [e["min_entropy_per_symbol"] for e in estimates.values() if e is not None]
+    return {"estimates": estimates, "seconds": timings,
+            "bits_per_symbol": width, "min_entropy": min(available)}
+
+
+def test_min_entropy(m: int, n_samples: int, seed: Optional[int] = None) -> Dict:
+    """
+    Estimate the min-entropy of n_samples CRT shadows modulo m.
+
+    Args:
+        m: Shadow modulus
+        n_samples: Number of samples
+        seed: DRBG seed for a reproducible run (None: OS randomness)
+
+    Returns:
+        Test results
+    """
+    symbols = list(generate_shadow_sequence(m, n_samples, seed))
+    start = time.perf_counter()
+    result = estimate_min_entropy(symbols, m)
+    seconds = time.perf_counter() - start
+
+    ideal = math.log2(m)
+    failing = [name for name, e in result["estimates"].items()
+               if e is not None and e["min_entropy_per_symbol"] < MIN_ENTROPY_FRACTION * ideal]
+    return {
+        "modulus": m,
+        "samples": n_samples,
+        "ideal_min_entropy": ideal,
+        "min_entropy": result["min_entropy"],
+        "min_entropy_ratio": result["min_entropy"] / ideal,
+        "threshold_fraction": MIN_ENTROPY_FRACTION,
+        "bits_per_symbol": result["bits_per_symbol"],
+        "estimates": result["estimates"],
+        "estimator_seconds": result["seconds"],
+        "seconds": seconds,
+        "below_threshold": failing,
+        "pass": not failing
+    }
+
+
+def run_all_tests(store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """Run the min-entropy estimator suite, replaying results already in the store."""
+    results = {
+        "node_id": "L004",
+        "title": "SP 800-90B Min-Entropy Estimates",
+        "tests": [],
+        "seed": seed,
+        "overall_pass": True
+    }
+
+    # Test configurations
+    configs = [
+        {"m": 2, "n_samples": 1000000},
+        {"m": 256, "n_samples": 1000000},
+        {"m": 65536, "n_samples": 1000000},
+    ]
+
+    print("=" * 60)
+    print("Shadow Entropy Min-Entropy Estimators (D003/L004)")
+    print("SP 800-90B: MCV, collision, Markov, compression, t-tuple, LRS")
+    print("=" * 60)
+
+    for cfg in configs:
+        print(f"\nTesting m={cfg['m']}, n={cfg['n_samples']:,}...")
+
+        result = cached_call(store, test_min_entropy, {
+            "m": cfg["m"],
+            "n_samples": cfg["n_samples"],
+            "seed": seed
+        })
+        results["tests"].append(result)
+
+        if not result["pass"]:
+            results["overall_pass"] = False
+
+        for name, estimate in result["estimates"].items():
+            if estimate is None:
+                print(f"  {name:18s}: n/a")
+            else:
+                print(f"  {name:18s}: {estimate['min_entropy_per_symbol']:8.4f} bits/shadow")
+        print(f"  Min-entropy: {result['min_entropy']:.4f} of {result['ideal_min_entropy']:.4f} "
+              f"bits ({result['seconds']:.1f} s)")
+        print(f"  Result: {'PASS' if result['pass'] else 'FAIL'}")
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    store = ResultStore()
+    results = run_all_tests(store=store, seed=fresh_seed())
+
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+
+    for test in results["tests"]:
+        status = "PASS" if test["pass"] else "FAIL"
+        print(f"  m={test['modulus']:5d}: {status} "
+              f"(H_min={test['min_entropy']:.4f} / {test['ideal_min_entropy']:.4f})")
+
+    print()
+    print(f"OVERALL: {'PASS' if results['overall_pass'] else 'FAIL'}")
+
+    print(f"Seed: {results['seed']}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("L004_min_entropy_results.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
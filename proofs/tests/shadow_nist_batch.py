@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Shadow Entropy NIST SP 800-22 Batch Mode (C003)
+
+Evaluates the 15 C003 tests on a batch of equal-length sequences and
+applies the SP 800-22 Section 4.2 second-level analysis to the P-values of
+every (sub)test:
+
+1. Proportion of passing sequences must lie in p̂ ± 3·sqrt(p̂(1-p̂)/s)
+   with p̂ = 1 - α.
+2. P-values must be uniform over [0, 1): chi-squared over 10 bins, with
+   P-value_T = igamc(9/2, χ²/2) >= 0.0001 (needs at least 55 sequences).
+
+Node C003 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+SCHEDULING: All sequences are packed into one shared memory segment.
+Each task runs one test over a contiguous range of sequences, so a worker
+loops one test function across its share of the batch; the two random
+excursion tests run as one task so each sequence is swept once for both.
+P-values are then reduced per subtest in the parent. One process pool
+serves the whole run.
+
+BATCH KERNELS: A test whose work has a part that depends only on the
+sequence length runs through a kernel over the whole range instead
+(BATCH_KERNELS). Without NumPy the DFT is ~90% of the per-sequence time at
+10^6 bits; its kernel builds the Bluestein chirp and transformed kernel
+once per range (SpectralPlan), which saves one FFT in three per sequence.
+The other tests already compute their statistics in C-level bulk passes
+with nothing shared between sequences, and a P-value costs a few
+microseconds (about 1 ms per sequence for the whole suite), so both keep
+the per-sequence loop and scalar erfc/igamc.
+"""
+
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from shadow_bitstream import BitSequence, as_bit_sequence
+from shadow_nist_tests import (
+    EXCURSION_TESTS,
+    NIST_SUITE,
+    Bits,
+    chi_squared_p_value,
+    dft_spectral_batch,
+    dft_spectral_test,
+    generate_shadow_bits,
+    run_suite_test,
+)
+
+# Significance level of each individual test
+ALPHA = 0.01
+
+# P-value uniformity: bins, minimum batch size and threshold on P-value_T
+UNIFORMITY_BINS = 10
+UNIFORMITY_MIN_SEQUENCES = 55
+UNIFORMITY_THRESHOLD = 0.0001
+
+# Whole-range kernels: suite test function -> kernel(sequences, **kwargs)
+BATCH_KERNELS = {
+    dft_spectral_test: dft_spectral_batch,
+}
+
+# Worker-side views of the shared batch
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_sequences: List[BitSequence] = []
+
+
+# =============================================================================
+# Worker Side
+# =============================================================================
+
+def _attach(shm_name: str, n_sequences: int, n_bits: int, stride: int) -> None:
+    """Pool initializer: map every sequence of the shared batch once per worker."""
+    global _worker_shm, _worker_sequences
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_sequences = [BitSequence(_worker_shm.buf, i * stride * 8, n_bits)
+                         for i in range(n_sequences)]
+    # Pool workers leave through os._exit, which skips atexit handlers;
+    # multiprocessing finalizers still run on worker shutdown
+    util.Finalize(None, _detach, exitpriority=10)
+
+
+def _detach() -> None:
+    """Worker finalizer: drop the views and unmap the shared batch."""
+    global _worker_shm, _worker_sequences
+    _worker_sequences = []
+    if _worker_shm is not None:
+        _worker_shm.close()
+        _worker_shm = None
+
+
+def _run_batch(indices: Tuple[int, ...], first: int, last: int) -> List[List[Dict]]:
+    """
+    Run suite entries `indices` on sequences first..last-1.
+
+    Returns one result list per entry. Entries grouped in one task share
+    per-sequence work through run_suite_test (the excursion sweep).
+    """
+    sequences = _worker_sequences[first:last]
+    if len(indices) == 1:
+        name, test_fn, kwargs = NIST_SUITE[indices[0]]
+        kernel = BATCH_KERNELS.get(test_fn)
+        if kernel is not None:
+            try:
+                return [kernel(sequences, **kwargs)]
+            except Exception as e:
+                return [[{"test": name, "error": str(e), "pass": False} for _ in sequences]]
+    results: List[List[Dict]] = [[] for _ in indices]
+    for bits in sequences:
+        shared: Dict = {}
+        for out, index in zip(results, indices):
+            name, test_fn, kwargs = NIST_SUITE[index]
+            try:
+                out.append(run_suite_test(test_fn, bits, kwargs, shared))
+            except Exception as e:
+                out.append({"test": name, "error": str(e), "pass": False})
+    return results
+
+
+# =============================================================================
+# P-value Analysis
+# =============================================================================
+
+def result_p_values(result: Dict) -> Dict[str, float]:
+    """
+    Every P-value reported by one test result, keyed by subtest label.
+
+    Single-statistic tests report "p_value"; serial and cusum report a
+    "p_values" dict; the template and excursion tests report one P-value
+    per template or state.
+    """
+    if "p_value" in result:
+        return {"": result["p_value"]}
+    if "p_values" in result:
+        return dict(result["p_values"])
+    if "templates" in result:
+        return {t["template"]: t["p_value"] for t in result["templates"]}
+    if "state_results" in result:
+        return {str(state): r["p_value"] for state, r in result["state_results"].items()}
+    return {}
+
+
+def proportion_interval(n_sequences: int, alpha: float = ALPHA) -> Tuple[float, float]:
+    """Acceptable range of the pass proportion for n_sequences sequences."""
+    p_hat = 1 - alpha
+    spread = 3 * (p_hat * (1 - p_hat) / n_sequences) ** 0.5
+    return p_hat - spread, p_hat + spread
+
+
+def uniformity_p_value(p_values: Sequence[float]) -> Tuple[List[int], float, float]:
+    """
+    (bin counts, chi-squared, P-value_T) of the P-value distribution.
+
+    Bins are [0, 0.1), [0.1, 0.2), ..., [0.9, 1.0].
+    """
+    s = len(p_values)
+    counts = [0] * UNIFORMITY_BINS
+    for p in p_values:
+        counts[min(int(p * UNIFORMITY_BINS), UNIFORMITY_BINS - 1)] += 1
+    expected = s / UNIFORMITY_BINS
+    chi_sq = sum((c - expected) ** 2 / expected for c in counts)
+    return counts, chi_sq, chi_squared_p_value(chi_sq, UNIFORMITY_BINS - 1)
+
+
+def summarize_p_values(name: str, results: Sequence[Dict], alpha: float = ALPHA) -> List[Dict]:
+    """
+    Second-level analysis of one test over the batch, one row per subtest.
+
+    Sequences where NIST declares the test not applicable (the excursion
+    tests with J < 500) report no P-value and are left out of the sample.
+    Error results are counted per error in every row ("n_errors",
+    "errors") and fail the test; if every sequence errored, one row with
+    no P-values reports them.
+    """
+    by_label: Dict[str, List[float]] = {}
+    errors: Counter = Counter()
+    for result in results:
+        if "error" in result:
+            errors[result["error"]] += 1
+            continue
+        for label, p in result_p_values(result).items():
+            by_label.setdefault(label, []).append(p)
+
+    n_errors = sum(errors.values())
+    if n_errors and not by_label:
+        return [{
+            "test": name,
+            "subtest": "",
+            "n_sequences": 0,
+            "n_errors": n_errors,
+            "errors": dict(errors),
+            "pass": False
+        }]
+
+    rows = []
+    for label, p_values in by_label.items():
+        s = len(p_values)
+        n_passed = sum(1 for p in p_values if p >= alpha)
+        low, high = proportion_interval(s, alpha)
+        proportion = n_passed / s
+        proportion_pass = proportion >= low
+
+        counts, chi_sq, p_value_t = uniformity_p_value(p_values)
+        if s >= UNIFORMITY_MIN_SEQUENCES:
+            uniformity_pass = p_value_t >= UNIFORMITY_THRESHOLD
+        else:
+            uniformity_pass = None  # Too few sequences to judge uniformity
+
+        rows.append({
+            "test": name,
+            "subtest": label,
+            "n_sequences": s,
+            "n_errors": n_errors,
+            "errors": dict(errors),
+            "n_passed": n_passed,
+            "proportion": proportion,
+            "proportion_range": [low, high],
+            "proportion_pass": proportion_pass,
+            "p_value_histogram": counts,
+            "uniformity_chi_squared": chi_sq,
+            "uniformity_p_value": p_value_t,
+            "uniformity_pass": uniformity_pass,
+            "pass": proportion_pass and uniformity_pass is not False and not n_errors
+        })
+    return rows
+
+
+# =============================================================================
+# Parent Side
+# =============================================================================
+
+def share_sequences(sequences: Sequence[Bits]) -> Tuple[shared_memory.SharedMemory, int, int]:
+    """Pack equal-length sequences into one shared segment; returns (shm, n_bits, stride)."""
+    packed = [as_bit_sequence(bits) for bits in sequences]
+    n_bits = len(packed[0])
+    if any(len(bits) != n_bits for bits in packed):
+        raise ValueError("batch sequences must all have the same length")
+    stride = (n_bits + 7) // 8
+    shm = shared_memory.SharedMemory(create=True, size=max(1, stride * len(packed)))
+    for i, bits in enumerate(packed):
+        shm.buf[i * stride:(i + 1) * stride] = bits.tobytes()
+    return shm, n_bits, stride
+
+
+def suite_groups() -> List[Tuple[int, ...]]:
+    """Suite indices run together in one task: the excursion tests share a sweep."""
+    excursions = tuple(i for i, (_, test_fn, _) in enumerate(NIST_SUITE) if test_fn in EXCURSION_TESTS)
+    groups = []
+    for index in range(len(NIST_SUITE)):
+        if index not in excursions:
+            groups.append((index,))
+        elif index == excursions[0]:
+            groups.append(excursions)
+    return groups
+
+
+def run_batch_tests(sequences: Sequence[Bits], workers: Optional[int] = None,
+                    label: Optional[Dict] = None) -> Dict:
+    """
+    Run the C003 suite over a batch of sequences on one process pool.
+
+    Returns per-subtest proportion and P-value uniformity rows in suite order.
+    """
+    n_sequences = len(sequences)
+    workers = workers or os.cpu_count() or 1
+    shm, n_bits, stride = share_sequences(sequences)
+
+    # Contiguous sequence ranges, one per worker
+    bounds = [n_sequences * k // workers for k in range(workers + 1)]
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, n_sequences, n_bits, stride)) as pool:
+            # suite index -> (futures of its group, position within the group)
+            futures = {}
+            for group in suite_groups():
+                parts = [pool.submit(_run_batch, group, a, b) for a, b in ranges]
+                for position, index in enumerate(group):
+                    futures[index] = (parts, position)
+
+            low, high = proportion_interval(n_sequences)
+            results = {
+                "node_id": "C003",
+                "title": "NIST SP 800-22 Batch Analysis",
+                "mode": "batch",
+                "workers": workers,
+                "n_sequences": n_sequences,
+                "n_bits": n_bits,
+                "alpha": ALPHA,
+                "proportion_range": [low, high],
+                "tests": [],
+                "overall_pass": True
+            }
+            if label:
+                results.update(label)
+
+            for index in range(len(NIST_SUITE)):
+                name = NIST_SUITE[index][0]
+                parts, position = futures[index]
+                batch = [r for f in parts for r in f.result()[position]]
+                rows = summarize_p_values(name, batch)
+                print(f"\n{name}...", end=" ", flush=True)
+                if not rows:
+                    print("no P-values (not applicable)")
+                    continue
+                n_ok = sum(1 for row in rows if row["pass"])
+                print(f"{n_ok}/{len(rows)} subtests PASS")
+                if rows[0]["n_errors"]:
+                    print(f"    ERROR on {rows[0]['n_errors']}/{n_sequences} sequences: "
+                          + ", ".join(f"{error} ({count})"
+                                      for error, count in rows[0]["errors"].items()))
+                for row in rows:
+                    if row["n_sequences"] and (not row["pass"] or len(rows) == 1):
+                        print(f"    {row['subtest'] or 'proportion'}: "
+                              f"{row['n_passed']}/{row['n_sequences']} "
+                              f"P-value_T={row['uniformity_p_value']:.6f}")
+                    if not row["pass"]:
+                        results["overall_pass"] = False
+                results["tests"].extend(rows)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    configs = [
+        {"n_sequences": 100, "n_bits": 1000000, "modulus": 256},
+        {"n_sequences": 100, "n_bits": 1000000, "modulus": 65536},
+    ]
+
+    all_results = []
+    for cfg in configs:
+        print("=" * 70)
+        print("Shadow Entropy NIST SP 800-22 Batch Mode (C003)")
+        print(f"Generating {cfg['n_sequences']} x {cfg['n_bits']:,} bits "
+              f"from modulus {cfg['modulus']}")
+        print("=" * 70)
+
+        sequences = [generate_shadow_bits(cfg["modulus"], cfg["n_bits"])
+                     for _ in range(cfg["n_sequences"])]
+        all_results.append(run_batch_tests(sequences, label={"modulus": cfg["modulus"]}))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - NIST SP 800-22 Batch Mode")
+    print("=" * 70)
+    for r in all_results:
+        passed_rows = sum(1 for t in r["tests"] if t["pass"])
+        print(f"  m={r['modulus']:5d}: {passed_rows:3d}/{len(r['tests'])} subtests passed "
+              f"({r['n_sequences']} sequences)")
+
+    final_results = {
+        "node_id": "C003",
+        "title": "NIST SP 800-22 Batch Analysis",
+        "configurations": all_results,
+        "overall_pass": all(r["overall_pass"] for r in all_results)
+    }
+
+    output_path = Path(__file__).with_name("C003_batch_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Shadow Entropy NIST SP 800-22 Parallel Suite (C003)
+
+Runs the 15 C003 tests concurrently on a process pool. The packed bitstream
+is placed in `multiprocessing.shared_memory` once; every worker maps it as a
+zero-copy BitSequence, so no bits are pickled per task.
+
+Node C003 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+SCHEDULING: Block-local tests (linear complexity, binary matrix rank) are
+split into block ranges whose partial counts are merged exactly. The two
+random excursion tests share one random walk sweep, split into ranges of
+the walk and merged exactly in the parent (merge_excursion_sweeps). Every
+other test is one task. Tasks are submitted largest-first (a task shared
+by several tests is submitted once) and results are merged back in suite
+order, so the output is identical to run_all_tests on the same bits.
+
+LIMIT: The DFT spectral test is one task and is not split: its FFT is a
+whole-sequence transform. Without NumPy it takes about 13-17 s at 10^6
+bits, far more than the rest of the suite together, so it bounds the wall
+clock however many workers there are; it is submitted first so it overlaps
+all other work.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from shadow_bitstream import BitSequence, as_bit_sequence
+from shadow_nist_tests import (
+    EXCURSION_TESTS,
+    NIST_SUITE,
+    Bits,
+    binary_matrix_rank_result,
+    binary_matrix_rank_test,
+    cumulative_sums_test,
+    dft_spectral_test,
+    excursion_sweep,
+    generate_shadow_bits,
+    linear_complexity_counts,
+    linear_complexity_result,
+    linear_complexity_test,
+    matrix_rank_classes,
+    maurers_universal_test,
+    merge_excursion_sweeps,
+    non_overlapping_templates_test,
+    overlapping_template_test,
+    random_excursions_test,
+    random_excursions_variant_test,
+    report_test_result,
+)
+
+# Relative cost per bit (measured at 10^6 bits without NumPy; unlisted
+# tests ~1), used to order tasks largest-first here and by shadow_sweep
+TASK_WEIGHTS = {
+    dft_spectral_test: 500,
+    random_excursions_test: 10,
+    random_excursions_variant_test: 10,
+    non_overlapping_templates_test: 9,
+    cumulative_sums_test: 9,
+    overlapping_template_test: 6,
+    maurers_universal_test: 4,
+    linear_complexity_test: 3,
+    binary_matrix_rank_test: 1,
+}
+
+# Worker-side view of the shared bitstream
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_bits: Optional[BitSequence] = None
+
+
+# =============================================================================
+# Worker Side
+# =============================================================================
+
+def _attach(shm_name: str, n_bits: int) -> None:
+    """Pool initializer: map the shared bitstream once per worker."""
+    global _worker_shm, _worker_bits
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_bits = BitSequence(_worker_shm.buf, 0, n_bits)
+    # Pool workers leave through os._exit, which skips atexit handlers;
+    # multiprocessing finalizers still run on worker shutdown
+    util.Finalize(None, _detach, exitpriority=10)
+
+
+def _detach() -> None:
+    """Worker finalizer: drop the view and unmap the shared bitstream."""
+    global _worker_shm, _worker_bits
+    _worker_bits = None
+    if _worker_shm is not None:
+        _worker_shm.close()
+        _worker_shm = None
+
+
+def _run_test(index: int) -> Dict:
+    """Run suite entry `index` on the whole shared bitstream."""
+    name, test_fn, kwargs = NIST_SUITE[index]
+    try:
+        return test_fn(_worker_bits, **kwargs)
+    except Exception as e:
+        return {"test": name, "error": str(e), "pass": False}
+
+
+def _rank_counts(M: int, Q: int, first: int, last: int) -> List[int]:
+    """Full-rank / rank M-1 / lower counts for matrices first..last-1."""
+    return matrix_rank_classes(_worker_bits[first * M * Q:last * M * Q], M, Q)
+
+
+def _linear_complexity_counts(M: int, first: int, last: int) -> List[int]:
+    """T-value bin counts for blocks first..last-1."""
+    return linear_complexity_counts(_worker_bits[first * M:last * M], M)
+
+
+def _excursion_sweep(first: int, last: int) -> Dict:
+    """Random walk sweep over positions S_first..S_(last-1)."""
+    return excursion_sweep(_worker_bits, first, last)
+
+
+# =============================================================================
+# Parent Side
+# =============================================================================
+
+def _split(n_items: int, n_parts: int) -> List[Tuple[int, int]]:
+    """Split range(n_items) into at most n_parts contiguous (first, last) ranges."""
+    n_parts = max(1, min(n_parts, n_items))
+    bounds = [n_items * k // n_parts for k in range(n_parts + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def share_bits(bits: Bits) -> shared_memory.SharedMemory:
+    """Copy a packed bitstream into a new shared memory segment."""
+    data = as_bit_sequence(bits).tobytes()
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    shm.buf[:len(data)] = data
+    return shm
+
+
+def run_parallel_tests(bits: Bits, workers: Optional[int] = None,
+                       label: Optional[Dict] = None) -> Dict:
+    """
+    Run the full C003 suite on a process pool over shared memory.
+
+    Returns the same structure as run_all_tests, with results in suite order.
+    """
+    bits = as_bit_sequence(bits)
+    n = len(bits)
+    workers = workers or os.cpu_count() or 1
+
+    shm = share_bits(bits)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, n)) as pool:
+            # (cost, suite index, future list, merge function)
+            jobs = []
+            for index, (name, test_fn, kwargs) in enumerate(NIST_SUITE):
+                weight = TASK_WEIGHTS.get(test_fn, 1)
+                if test_fn is linear_complexity_test and n // kwargs["M"] >= 10:
+                    ranges = _split(n // kwargs["M"], workers)
+                    jobs.append((weight, index, [(_linear_complexity_counts, (kwargs["M"], a, b))
+                                                 for a, b in ranges],
+                                 lambda parts, M=kwargs["M"]:
+                                 linear_complexity_result(n, M, [sum(c) for c in zip(*parts)])))
+                elif test_fn is binary_matrix_rank_test and n // (kwargs["M"] * kwargs["Q"]) >= 38:
+                    M, Q = kwargs["M"], kwargs["Q"]
+                    ranges = _split(n // (M * Q), workers)
+                    jobs.append((weight, index, [(_rank_counts, (M, Q, a, b)) for a, b in ranges],
+                                 lambda parts, M=M, Q=Q:
+                                 binary_matrix_rank_result(n, M, Q, *[sum(c) for c in zip(*parts)])))
+                elif test_fn in EXCURSION_TESTS:
+                    ranges = _split(n + 1, workers)
+                    jobs.append((weight, index, [(_excursion_sweep, (a, b)) for a, b in ranges],
+                                 lambda parts, test_fn=test_fn, kwargs=kwargs:
+                                 test_fn(bits, visits=merge_excursion_sweeps(parts), **kwargs)))
+                else:
+                    jobs.append((weight, index, [(_run_test, (index,))], lambda parts: parts[0]))
+
+            # Submit the most expensive work first so it starts immediately;
+            # a task shared by several tests is submitted once
+            submitted = {}
+            futures = {}
+            for weight, index, tasks, _ in sorted(jobs, key=lambda job: -job[0]):
+                for fn, args in tasks:
+                    if (fn, args) not in submitted:
+                        submitted[fn, args] = pool.submit(fn, *args)
+                futures[index] = [submitted[task] for task in tasks]
+
+            results = {
+                "node_id": "C003",
+                "title": "NIST SP 800-22 Complete Statistical Tests",
+                "mode": "parallel",
+                "workers": workers,
+                "n_bits": n,
+                "tests": [],
+                "overall_pass": True
+            }
+            if label:
+                results.update(label)
+
+            for weight, index, tasks, merge in jobs:
+                name = NIST_SUITE[index][0]
+                try:
+                    result = merge([f.result() for f in futures[index]])
+                except Exception as e:
+                    result = {"test": name, "error": str(e), "pass": False}
+                report_test_result(name, result, results)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    configs = [
+        {"n_bits": 1000000, "modulus": 256},
+        {"n_bits": 1000000, "modulus": 65536},
+    ]
+
+    all_results = []
+    for cfg in configs:
+        print("=" * 70)
+        print("Shadow Entropy NIST SP 800-22 Parallel Suite (C003)")
+        print(f"Generating {cfg['n_bits']:,} bits from modulus {cfg['modulus']}")
+        print("=" * 70)
+
+        bits = generate_shadow_bits(cfg["modulus"], cfg["n_bits"])
+        all_results.append(run_parallel_tests(bits, label={"modulus": cfg["modulus"]}))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - NIST SP 800-22 Parallel Suite")
+    print("=" * 70)
+    for r in all_results:
+        passed_tests = sum(1 for t in r["tests"] if t.get("pass", False))
+        print(f"  m={r['modulus']:5d}: {passed_tests:2d}/{len(r['tests'])} tests passed "
+              f"({r['workers']} workers)")
+
+    final_results = {
+        "node_id": "C003",
+        "title": "NIST SP 800-22 Complete Statistical Tests (parallel)",
+        "configurations": all_results,
+        "overall_pass": all(
+            all(t.get("pass", False) for t in r["tests"][:13]) for r in all_results
+        )
+    }
+
+    output_path = Path(__file__).with_name("C003_parallel_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Shadow Entropy NIST SP 800-22 Streaming Suite (C003)
+
+Constant-memory variant of the C003 suite. Bits arrive in chunks (from the
+shadow generator or from a harvest file) and every one-pass test updates its
+sufficient statistics chunk by chunk, so a 10^10-bit harvest is validated in
+bounded memory while it is still being produced.
+
+Node C003 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+Streamed tests (bit-identical results to the batch functions in
+shadow_nist_tests: each stream keeps the integer statistics the batch
+result functions reduce, and float sums run in the same order):
+1.  Frequency (Monobit)              - ones count
+2.  Block Frequency                  - Σ(π_i - 1/2)² over finished blocks
+3.  Runs                             - ones count + transitions across chunks
+4.  Longest Run of Ones              - per-block class frequencies
+5.  Binary Matrix Rank               - per-matrix rank classes
+7.  Non-overlapping Template         - per-template block count histograms
+8.  Overlapping Template             - match-count bin frequencies
+10. Linear Complexity                - per-block T-value bins
+11. Serial                           - cyclic pattern counts (wrap at finish)
+12. Approximate Entropy              - cyclic pattern counts (wrap at finish)
+13. Cumulative Sums                  - running sum, max and min
+
+The DFT, Maurer and random excursion tests need the whole sequence (or a
+global table/walk) and stay in the batch suite.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+from itertools import accumulate
+from operator import add
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from shadow_bitstream import BitSequence, as_bit_sequence
+from shadow_nist_tests import (
+    BM_LANES,
+    MAX_PATTERN_BITS,
+    OVERLAPPING_BINS,
+    Bits,
+    aperiodic_templates,
+    binary_matrix_rank_result,
+    block_frequency_result,
+    count_longest_run,
+    count_overlapping,
+    count_windows,
+    cumulative_sums_result,
+    frequency_result,
+    generate_shadow_bits,
+    histograms_by_length,
+    linear_complexity_counts,
+    linear_complexity_result,
+    longest_run_parameters,
+    longest_run_result,
+    matrix_rank_classes,
+    non_overlapping_templates_result,
+    overlapping_template_bins_result,
+    runs_result,
+    serial_result,
+    approximate_entropy_result,
+)
+
+# Default chunk size: 2^23 bits = 1 MiB packed
+DEFAULT_CHUNK_BITS = 1 << 23
+
+
+# =============================================================================
+# Chunk Sources
+# =============================================================================
+
+def iter_shadow_chunks(modulus: int, n_bits: int,
+                       chunk_bits: int = DEFAULT_CHUNK_BITS) -> Iterator[BitSequence]:
+    """Generate n_bits shadow bits as a stream of packed chunks."""
+    remaining = n_bits
+    while remaining > 0:
+        size = min(chunk_bits, remaining)
+        yield generate_shadow_bits(modulus, size)
+        remaining -= size
+
+
+def iter_file_chunks(path: Union[str, Path], chunk_bits: int = DEFAULT_CHUNK_BITS,
+                     n_bits: Optional[int] = None) -> Iterator[BitSequence]:
+    """
+    Read a packed harvest file (MSB-first bytes) as a stream of chunks.
+
+    n_bits limits the stream when the file's last byte is padding.
+    """
+    chunk_bytes = max(1, chunk_bits // 8)
+    remaining = n_bits
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            length = len(data) * 8
+            if remaining is not None:
+                length = min(length, remaining)
+                remaining -= length
+            yield BitSequence(data, 0, length)
+
+
+def write_chunks(path: Union[str, Path], chunks: Iterable[Bits]) -> int:
+    """
+    Write a stream of chunks to a packed harvest file; returns the bit count.
+
+    Chunks are re-cut on byte boundaries so the file is one continuous
+    MSB-first bitstream regardless of chunk lengths.
+    """
+    total = 0
+    carry = BitSequence()
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            chunk = as_bit_sequence(chunk)
+            total += len(chunk)
+            if len(carry):
+                chunk = carry + chunk
+            aligned = len(chunk) - len(chunk) % 8
+            f.write(chunk[:aligned].tobytes())
+            carry = chunk[aligned:] + BitSequence()
+        if len(carry):
+            f.write(carry.tobytes())
+    return total
+
+
+# =============================================================================
+# Streaming Accumulators
+# =============================================================================
+
+class BlockCarry:
+    """Re-cut a stream of arbitrary chunks into consecutive fixed-size blocks."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.pending = BitSequence()
+
+    def feed(self, chunk: BitSequence) -> Iterator[BitSequence]:
+        """Yield every block completed by this chunk; keep the remainder."""
+        if len(self.pending):
+            need = self.size - len(self.pending)
+            if len(chunk) < need:
+                self.pending = self.pending + chunk
+                return
+            yield self.pending + chunk[:need]
+            chunk = chunk[need:]
+            self.pending = BitSequence()
+        full = len(chunk) // self.size
+        yield from chunk[:full * self.size].blocks(self.size)
+        # Copy the tail so the chunk buffer is not kept alive
+        self.pending = chunk[full * self.size:] + BitSequence()
+
+
+class StreamingTest(ABC):
+    """One-pass test: update() with each chunk, then result()."""
+
+    name = ""
+
+    def __init__(self):
+        self.n = 0
+
+    def update(self, chunk: BitSequence) -> None:
+        self.n += len(chunk)
+
+    @abstractmethod
+    def result(self) -> Dict:
+        """Test result from the statistics gathered so far."""
+
+
+class FrequencyStream(StreamingTest):
+    name = "01. Frequency (Monobit)"
+
+    def __init__(self):
+        super().__init__()
+        self.ones = 0
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        self.ones += chunk.count()
+
+    def result(self) -> Dict:
+        return frequency_result(self.n, self.ones)
+
+
+class BlockFrequencyStream(StreamingTest):
+    name = "02. Block Frequency"
+
+    def __init__(self, block_size: int = 128):
+        super().__init__()
+        self.block_size = block_size
+        self.blocks = BlockCarry(block_size)
+        self.n_blocks = 0
+        self.sum_sq = 0
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        for block in self.blocks.feed(chunk):
+            pi = block.count() / self.block_size
+            self.sum_sq += (pi - 0.5) ** 2
+            self.n_blocks += 1
+
+    def result(self) -> Dict:
+        if self.n_blocks == 0:
+            return {"test": "block_frequency", "error": "insufficient_data", "pass": False}
+        return block_frequency_result(self.n, self.block_size, self.n_blocks, self.sum_sq)
+
+
+class RunsStream(StreamingTest):
+    name = "03. Runs"
+
+    def __init__(self):
+        super().__init__()
+        self.ones = 0
+        self.transitions = 0
+        self.last_bit = None
+
+    def update(self, chunk: BitSequence) -> None:
+        if not len(chunk):
+            return
+        super().update(chunk)
+        x = chunk.to_int()
+        self.ones += x.bit_count()
+        self.transitions += ((x ^ (x >> 1)) & ((1 << (len(chunk) - 1)) - 1)).bit_count()
+        if self.last_bit is not None and self.last_bit != chunk[0]:
+            self.transitions += 1
+        self.last_bit = x & 1
+
+    def result(self) -> Dict:
+        if self.n < 100:
+            return {"test": "runs", "error": "insufficient_data", "pass": False}
+        return runs_result(self.n, self.ones, 1 + self.transitions)
+
+
+class LongestRunStream(StreamingTest):
+    """
+    Longest run needs its block size before the first bit arrives.
+
+    The size is chosen from the declared stream length; undeclared streams
+    use the n >= 750,000 parameters (M = 10,000) meant for large harvests.
+    """
+
+    name = "04. Longest Run"
+
+    def __init__(self, n_bits: Optional[int] = None):
+        super().__init__()
+        self.M, _, self.V, _ = longest_run_parameters(n_bits if n_bits is not None else 750000)
+        self.blocks = BlockCarry(self.M)
+        self.frequencies = [0] * len(self.V)
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        for block in self.blocks.feed(chunk):
+            count_longest_run(block, self.V, self.frequencies)
+
+    def result(self) -> Dict:
+        if self.n < 128:
+            return {"test": "longest_run", "error": "insufficient_data", "pass": False}
+        if longest_run_parameters(self.n)[0] != self.M:
+            return {"test": "longest_run", "error": "declared_length_mismatch",
+                    "block_size": self.M, "n_bits": self.n, "pass": False}
+        return longest_run_result(self.n, self.frequencies)
+
+
+class MatrixRankStream(StreamingTest):
+    name = "05. Binary Matrix Rank"
+
+    def __init__(self, M: int = 32, Q: int = 32):
+        super().__init__()
+        self.M = M
+        self.Q = Q
+        self.blocks = BlockCarry(M * Q)
+        self.ranks = [0, 0, 0]  # Full rank, full rank - 1, lower
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        for block in self.blocks.feed(chunk):
+            for i, count in enumerate(matrix_rank_classes(block, self.M, self.Q)):
+                self.ranks[i] += count
+
+    def result(self) -> Dict:
+        return binary_matrix_rank_result(self.n, self.M, self.Q, *self.ranks)
+
+
+class NonOverlappingTemplateStream(StreamingTest):
+    name = "07. Non-overlapping Template"
+
+    def __init__(self, m: int = 9, M: int = 1032):
+        super().__init__()
+        self.m = m
+        self.M = M
+        self.templates = aperiodic_templates(m)
+        self.blocks = BlockCarry(M)
+        # (template index, block count) -> number of blocks
+        self.hits = Counter()
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        indices = range(len(self.templates))
+        for block in self.blocks.feed(chunk):
+            counts = Counter()
+            count_windows(block, self.m, self.M - self.m + 1, counts)
+            self.hits.update(zip(indices, map(counts.__getitem__, self.templates)))
+
+    def result(self) -> Dict:
+        if self.n < self.M:
+            return {"test": "non_overlapping_template", "error": "insufficient_data", "pass": False}
+        # Per-block counts are only needed as a multiset for the chi-squared sum
+        histograms = [Counter() for _ in self.templates]
+        for (index, count), blocks in self.hits.items():
+            histograms[index][count] = blocks
+        return non_overlapping_templates_result(self.n, self.m, self.M, self.templates, histograms)
+
+
+class OverlappingTemplateStream(StreamingTest):
+    name = "08. Overlapping Template"
+
+    def __init__(self, m: int = 9, M: int = 1032):
+        super().__init__()
+        self.m = m
+        self.M = M
+        self.blocks = BlockCarry(M)
+        # Blocks with 0, 1, ..., K - 1 and >= K matches (K = OVERLAPPING_BINS)
+        self.bins = [0] * (OVERLAPPING_BINS + 1)
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        target = (1 << self.m) - 1
+        for block in self.blocks.feed(chunk):
+            self.bins[min(count_overlapping(block, target, self.m), OVERLAPPING_BINS)] += 1
+
+    def result(self) -> Dict:
+        return overlapping_template_bins_result(self.n, self.m, self.M, self.bins)
+
+
+class LinearComplexityStream(StreamingTest):
+    name = "10. Linear Complexity"
+
+    def __init__(self, M: int = 500):
+        super().__init__()
+        self.M = M
+        # Whole lane batches go through the bit-sliced kernel as they fill
+        self.blocks = BlockCarry(M * BM_LANES)
+        self.v = [0] * 7
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        for batch in self.blocks.feed(chunk):
+            self.v = list(map(add, self.v, linear_complexity_counts(batch, self.M)))
+
+    def result(self) -> Dict:
+        # Blocks still waiting for a full batch
+        tail = linear_complexity_counts(self.blocks.pending, self.M)
+        return linear_complexity_result(self.n, self.M, list(map(add, self.v, tail)))
+
+
+class CyclicPatternCounter:
+    """
+    Overlapping pattern counts of the cyclically extended stream.
+
+    Only the longest length is counted, with the histogram engine of the
+    batch suite; its last max_len - 1 bits are carried into the next chunk.
+    The first max_len - 1 bits are kept so the wrap-around windows can be
+    closed at finish(), where shorter lengths are folded from the longest.
+    """
+
+    def __init__(self, lengths: Iterable[int]):
+        self.lengths = sorted(length for length in set(lengths) if length > 0)
+        self.max_len = self.lengths[-1]
+        if self.max_len > MAX_PATTERN_BITS:
+            raise ValueError(f"pattern length {self.max_len} exceeds {MAX_PATTERN_BITS} bits")
+        self.counts = Counter()
+        self.head = BitSequence()
+        self.tail = BitSequence()
+
+    def update(self, chunk: BitSequence) -> None:
+        keep = self.max_len - 1
+        if len(self.head) < keep:
+            self.head = self.head + chunk[:keep - len(self.head)]
+        segment = self.tail + chunk
+        n_windows = len(segment) - keep
+        if n_windows > 0:
+            count_windows(segment, self.max_len, n_windows, self.counts)
+            segment = segment[n_windows:]
+        # Copy so the chunk buffer is not kept alive
+        self.tail = segment + BitSequence()
+
+    def finish(self) -> Dict[int, List[int]]:
+        counts = Counter(self.counts)
+        # Wrap-around windows start in the tail and end in the head
+        segment = self.tail + self.head
+        count_windows(segment, self.max_len, len(self.tail), counts)
+        return histograms_by_length(counts, self.lengths)
+
+
+class SerialStream(StreamingTest):
+    name = "11. Serial"
+
+    def __init__(self, m: int = 3):
+        super().__init__()
+        self.m = m
+        self.patterns = CyclicPatternCounter((m, m - 1, m - 2))
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        self.patterns.update(chunk)
+
+    def result(self) -> Dict:
+        if self.n < 100:
+            return {"test": "serial", "error": "insufficient_data", "pass": False}
+        return serial_result(self.n, self.m, self.patterns.finish())
+
+
+class ApproximateEntropyStream(StreamingTest):
+    name = "12. Approximate Entropy"
+
+    def __init__(self, m: int = 4):
+        super().__init__()
+        self.m = m
+        self.patterns = CyclicPatternCounter((m, m + 1))
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        self.patterns.update(chunk)
+
+    def result(self) -> Dict:
+        if self.n < 100:
+            return {"test": "approximate_entropy", "error": "insufficient_data", "pass": False}
+        return approximate_entropy_result(self.n, self.m, self.patterns.finish())
+
+
+class CumulativeSumsStream(StreamingTest):
+    name = "13. Cumulative Sums"
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+        self.high = 0
+        self.low = 0
+
+    def update(self, chunk: BitSequence) -> None:
+        super().update(chunk)
+        walk = list(accumulate((2 * b - 1 for b in chunk), initial=self.total))
+        self.high = max(self.high, max(walk))
+        self.low = min(self.low, min(walk))
+        self.total = walk[-1]
+
+    def result(self) -> Dict:
+        if self.n < 100:
+            return {"test": "cumulative_sums", "error": "insufficient_data", "pass": False}
+        # Backward partial sums are total - (forward prefix)
+        z_forward = max(self.high, -self.low)
+        z_backward = max(self.total - self.low, self.high - self.total)
+        return cumulative_sums_result(self.n, z_forward, z_backward)
+
+
+def default_streaming_tests(n_bits: Optional[int] = None) -> List[StreamingTest]:
+    """The streamable subset of C003 with run_all_tests parameters."""
+    return [
+        FrequencyStream(),
+        BlockFrequencyStream(128),
+        RunsStream(),
+        LongestRunStream(n_bits),
+        MatrixRankStream(32, 32),
+        NonOverlappingTemplateStream(),
+        OverlappingTemplateStream(9),
+        LinearComplexityStream(500),
+        SerialStream(3),
+        ApproximateEntropyStream(4),
+        CumulativeSumsStream(),
+    ]
+
+
+# =============================================================================
+# Streaming Test Runner
+# =============================================================================
+
+def run_streaming_tests(chunks: Iterable[Bits], n_bits: Optional[int] = None,
+                        tests: Optional[List[StreamingTest]] = None,
+                        label: Optional[Dict] = None) -> Dict:
+    """
+    Run the streamable C003 tests over a chunked bitstream.
+
+    Memory is bounded by one chunk plus each test's sufficient statistics.
+    n_bits is the declared stream length (only used to pick the longest-run
+    block size); the actual length is whatever the chunks add up to.
+    """
+    if tests is None:
+        tests = default_streaming_tests(n_bits)
+
+    total = 0
+    for chunk in chunks:
+        chunk = as_bit_sequence(chunk)
+        total += len(chunk)
+        for test in tests:
+            test.update(chunk)
+
+    results = {
+        "node_id": "C003",
+        "title": "NIST SP 800-22 Streaming Statistical Tests",
+        "mode": "streaming",
+        "n_bits": total,
+        "tests": [],
+        "overall_pass": True
+    }
+    if label:
+        results.update(label)
+
+    for test in tests:
+        print(f"\n{test.name}...", end=" ", flush=True)
+        try:
+            result = test.result()
+        except Exception as e:
+            result = {"test": test.name, "error": str(e), "pass": False}
+        results["tests"].append(result)
+
+        passed = result.get("pass", False)
+        if not passed:
+            results["overall_pass"] = False
+        print("PASS" if passed else "FAIL")
+
+        if "chi_squared" in result:
+            print(f"    Chi²: {result['chi_squared']:.4f} (crit: {result.get('critical_value', 'N/A')})")
+        elif "z_statistic" in result:
+            print(f"    Z: {result['z_statistic']:.4f}")
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    configs = [
+        {"n_bits": 10000000, "modulus": 65536},
+    ]
+
+    all_results = []
+    for cfg in configs:
+        print("=" * 70)
+        print("Shadow Entropy NIST SP 800-22 Streaming Suite (C003)")
+        print(f"Streaming {cfg['n_bits']:,} bits from modulus {cfg['modulus']}")
+        print("=" * 70)
+
+        chunks = iter_shadow_chunks(cfg["modulus"], cfg["n_bits"])
+        all_results.append(run_streaming_tests(chunks, cfg["n_bits"], label={"modulus": cfg["modulus"]}))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - NIST SP 800-22 Streaming Suite")
+    print("=" * 70)
+    for r in all_results:
+        passed_tests = sum(1 for t in r["tests"] if t.get("pass", False))
+        print(f"  m={r['modulus']:5d}: {passed_tests:2d}/{len(r['tests'])} tests passed")
+
+    final_results = {
+        "node_id": "C003",
+        "title": "NIST SP 800-22 Streaming Statistical Tests",
+        "configurations": all_results,
+        "overall_pass": all(r["overall_pass"] for r in all_results)
+    }
+
+    output_path = Path(__file__).with_name("C003_stream_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
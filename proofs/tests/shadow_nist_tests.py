@@ -17,7 +17,7 @@ Complete NIST SP 800-22 Tests:
 4.  Longest Run of Ones Test
 5.  Binary Matrix Rank Test
 6.  Discrete Fourier Transform (Spectral) Test
-7.  Non-overlapping Template Matching Test
+7.  Non-overlapping Template Matching Test (all aperiodic 9-bit templates)
 8.  Overlapping Template Matching Test
 9.  Maurer's Universal Statistical Test
 10. Linear Complexity Test
@@ -28,14 +28,39 @@ Complete NIST SP 800-22 Tests:
 15. Random Excursions Variant Test
 """
 
+import cmath
 import json
-import secrets
 import math
-from typing import Dict, List, Tuple, Optional
+import sys
+from array import array
+from functools import reduce
+from itertools import accumulate, repeat
+from operator import add, and_, attrgetter, mul, neg, or_, rshift, sub, xor
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple, Optional, Union
 from collections import Counter
 
+try:
+    import numpy as np  # Optional: DFT test beyond ~10^7 bits (see dft_spectral_test)
+except ImportError:
+    np = None
 
-def generate_shadow_bits(m: int, n_bits: int) -> List[int]:
+from shadow_bitstream import BitSequence, as_bit_sequence
+from shadow_result_store import ResultStore, code_fingerprint, fresh_seed
+from shadow_source import (
+    MixedRadixExtractor,
+    ShadowDRBG,
+    crt_shadow_batch,
+    draws_for_bits,
+    shadow_bit_fields,
+)
+
+# Every test accepts either a packed BitSequence or a plain List[int] of bits
+Bits = Union[BitSequence, List[int]]
+
+
+def generate_shadow_bits(m: int, n_bits: int, seed: Optional[int] = None,
+                         offset: int = 0, packing: str = "mixed_radix") -> BitSequence:
     """
     Generate shadow-derived bits for testing.
 
@@ -49,50 +74,181 @@ def generate_shadow_bits(m: int, n_bits: int) -> List[int]:
 
     The KEY insight: we harvest the QUOTIENT, not the remainder.
     Traditional computation discards the quotient; we capture it.
-    """
-    bits_per_shadow = m.bit_length() - 1  # Conservative: use floor(log2(m))
-    n_shadows = (n_bits + bits_per_shadow - 1) // bits_per_shadow
 
+    Bits are returned packed (one bit of memory per bit); the V draws are
+    made in bulk by shadow_source rather than one randbelow call per shadow.
+    With a seed, the bits come from shadows offset, offset+1, ... of that
+    seed's DRBG stream, so any run can be replayed from its (seed, offset).
+
+    packing="mixed_radix" (default) packs the quotients as base-m_p digits,
+    keeping all log2(m_p) bits of each one with no bias. packing="truncate"
+    is the historical extraction: the low floor(log2(m)) bits of each
+    quotient, which drops the rest and folds quotient m onto 0.
+    """
     # m_p (primary) and m_s (shadow) must be coprime
     # Use m_s = m, m_p = next coprime (m + k where gcd(m, m+k) = 1)
     m_s = m
     m_p = m + 1  # m and m+1 are always coprime
 
-    # Product M = m_p × m_s
-    M = m_p * m_s
-    bits = []
+    # Simulate multiplication: V uniform over [0, m_p × m_s) represents (a × b)
+    #
+    # CRITICAL: Shadow is the QUOTIENT, not remainder
+    # shadow = V // m_s = (a × b) // m
+    # This is what we "harvest" - the part normally discarded
+    drbg = ShadowDRBG(seed) if seed is not None else None
+
+    if packing == "mixed_radix":
+        extractor = MixedRadixExtractor(m_p)
+        data = bytearray()
+        n_bytes = (n_bits + 7) // 8
+        drawn = 0
+        while len(data) < n_bytes:
+            n_shadows = draws_for_bits(8 * (n_bytes - len(data)), m_p)
+            _, quotients = crt_shadow_batch(m_p, m_s, n_shadows, drbg=drbg,
+                                            offset=offset + drawn)  # QUOTIENT (0 to m_p-1)
+            drawn += n_shadows
+            data += extractor.feed(quotients)
+        return BitSequence(bytes(data[:n_bytes]), 0, n_bits)
+
+    if packing != "truncate":
+        raise ValueError(f"unknown packing {packing!r}")
+
+    bits_per_shadow = m.bit_length() - 1  # Conservative: use floor(log2(m))
+    n_shadows = (n_bits + bits_per_shadow - 1) // bits_per_shadow
+    _, quotients = crt_shadow_batch(m_p, m_s, n_shadows, drbg=drbg, offset=offset)  # QUOTIENT (0 to m_p-1)
+
+    # Keep the low bits_per_shadow bits of each quotient, emitted LSB first
+    fields = shadow_bit_fields(quotients, bits_per_shadow)
+    return BitSequence.from_fields(fields, bits_per_shadow, lsb_first=True)[:n_bits]
+
+
+# =============================================================================
+# P-values (SP 800-22 Section 5.5.3 special functions)
+# =============================================================================
+
+# Cephes constants used by the NIST reference implementation
+_MACHEP = 1.11022302462515654042e-16
+_MAXLOG = 7.09782712893383996732e2
+_BIG = 4.503599627370496e15
+_BIGINV = 2.22044604925031308085e-16
+
+
+def igam(a: float, x: float) -> float:
+    """Regularized lower incomplete gamma P(a, x) (power series)."""
+    if x <= 0 or a <= 0:
+        return 0.0
+    if x > 1.0 and x > a:
+        return 1.0 - igamc(a, x)
+
+    ax = a * math.log(x) - x - math.lgamma(a)
+    if ax < -_MAXLOG:
+        return 0.0
+    ax = math.exp(ax)
+
+    r = a
+    c = 1.0
+    ans = 1.0
+    while True:
+        r += 1.0
+        c *= x / r
+        ans += c
+        if c / ans <= _MACHEP:
+            break
+    return ans * ax / a
+
+
+def igamc(a: float, x: float) -> float:
+    """
+    Regularized upper incomplete gamma Q(a, x) (continued fraction).
+
+    P-value of a chi-squared statistic χ² with k degrees of freedom is
+    igamc(k / 2, χ² / 2).
+    """
+    if x <= 0 or a <= 0:
+        return 1.0
+    if x < 1.0 or x < a:
+        return 1.0 - igam(a, x)
+
+    ax = a * math.log(x) - x - math.lgamma(a)
+    if ax < -_MAXLOG:
+        return 0.0
+    ax = math.exp(ax)
+
+    y = 1.0 - a
+    z = x + y + 1.0
+    c = 0.0
+    pkm2, qkm2 = 1.0, x
+    pkm1, qkm1 = x + 1.0, z * x
+    ans = pkm1 / qkm1
+    while True:
+        c += 1.0
+        y += 1.0
+        z += 2.0
+        yc = y * c
+        pk = pkm1 * z - pkm2 * yc
+        qk = qkm1 * z - qkm2 * yc
+        if qk != 0:
+            r = pk / qk
+            t = abs((ans - r) / r)
+            ans = r
+        else:
+            t = 1.0
+        pkm2, pkm1 = pkm1, pk
+        qkm2, qkm1 = qkm1, qk
+        if abs(pk) > _BIG:
+            pkm2 *= _BIGINV
+            pkm1 *= _BIGINV
+            qkm2 *= _BIGINV
+            qkm1 *= _BIGINV
+        if t <= _MACHEP:
+            break
+    return ans * ax
+
+
+def chi_squared_p_value(chi_sq: float, df: float) -> float:
+    """Upper-tail P-value of a chi-squared statistic with df degrees of freedom."""
+    return igamc(df / 2, chi_sq / 2)
+
+
+def normal_p_value(z: float) -> float:
+    """Two-sided P-value of a standard normal statistic: erfc(|z| / √2)."""
+    return math.erfc(abs(z) / math.sqrt(2))
 
-    for _ in range(n_shadows):
-        # Simulate multiplication: V represents (a × b) for some computation
-        V = secrets.randbelow(M)
 
-        # CRITICAL: Shadow is the QUOTIENT, not remainder
-        # shadow = V // m_s = (a × b) // m
-        # This is what we "harvest" - the part normally discarded
-        shadow = V // m_s  # QUOTIENT (0 to m_p-1)
+def _normal_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2))
 
-        # Extract bits from shadow quotient
-        for b in range(bits_per_shadow):
-            if len(bits) < n_bits:
-                bits.append((shadow >> b) & 1)
 
-    return bits[:n_bits]
+def cumulative_sums_p_value(n: int, z: int) -> float:
+    """P-value of a maximum partial-sum excursion z (SP 800-22 Section 2.13.4)."""
+    if z == 0:
+        return 1.0
+    root_n = math.sqrt(n)
+    total = 1.0
+    for k in range(int((-n / z + 1) / 4), int((n / z - 1) / 4) + 1):
+        total -= _normal_cdf((4 * k + 1) * z / root_n) - _normal_cdf((4 * k - 1) * z / root_n)
+    for k in range(int((-n / z - 3) / 4), int((n / z - 1) / 4) + 1):
+        total += _normal_cdf((4 * k + 3) * z / root_n) - _normal_cdf((4 * k + 1) * z / root_n)
+    return total
 
 
 # =============================================================================
 # Test 1: Frequency (Monobit) Test
 # =============================================================================
 
-def frequency_test(bits: List[int]) -> Dict:
+def frequency_test(bits: Bits) -> Dict:
     """
     Test 1: Frequency (Monobit) Test
 
     Tests that the proportion of ones is approximately 1/2.
     Reference: NIST SP 800-22 Section 2.1
     """
-    n = len(bits)
-    s = sum(bits)
+    bits = as_bit_sequence(bits)
+    return frequency_result(len(bits), bits.count())
+
 
+def frequency_result(n: int, s: int) -> Dict:
+    """Frequency test result from the bit count n and ones count s."""
     # Chi-squared with 1 df: (2s - n)^2 / n
     chi_sq = (2 * s - n) ** 2 / n
 
@@ -108,6 +264,7 @@ def frequency_test(bits: List[int]) -> Dict:
         "proportion": s / n,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, 1),
         "pass": passed
     }
 
@@ -116,26 +273,31 @@ def frequency_test(bits: List[int]) -> Dict:
 # Test 2: Block Frequency Test
 # =============================================================================
 
-def block_frequency_test(bits: List[int], block_size: int = 128) -> Dict:
+def block_frequency_test(bits: Bits, block_size: int = 128) -> Dict:
     """
     Test 2: Block Frequency Test
 
     Tests uniformity of ones in M-bit blocks.
     Reference: NIST SP 800-22 Section 2.2
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     n_blocks = n // block_size
 
     if n_blocks == 0:
         return {"test": "block_frequency", "error": "insufficient_data", "pass": False}
 
-    chi_sq = 0
-    for i in range(n_blocks):
-        block = bits[i * block_size:(i + 1) * block_size]
-        pi = sum(block) / block_size
-        chi_sq += (pi - 0.5) ** 2
+    sum_sq = 0
+    for block in bits.blocks(block_size):
+        pi = block.count() / block_size
+        sum_sq += (pi - 0.5) ** 2
+
+    return block_frequency_result(n, block_size, n_blocks, sum_sq)
+
 
-    chi_sq *= 4 * block_size
+def block_frequency_result(n: int, block_size: int, n_blocks: int, sum_sq: float) -> Dict:
+    """Block frequency result from Σ(π_i - 1/2)² over the n_blocks blocks."""
+    chi_sq = sum_sq * 4 * block_size
 
     # Critical value approximation for chi-sq(n_blocks) at alpha=0.01
     critical = n_blocks + 2.33 * math.sqrt(2 * n_blocks)
@@ -148,6 +310,7 @@ def block_frequency_test(bits: List[int], block_size: int = 128) -> Dict:
         "n_blocks": n_blocks,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, n_blocks),
         "pass": passed
     }
 
@@ -156,18 +319,28 @@ def block_frequency_test(bits: List[int], block_size: int = 128) -> Dict:
 # Test 3: Runs Test
 # =============================================================================
 
-def runs_test(bits: List[int]) -> Dict:
+def runs_test(bits: Bits) -> Dict:
     """
     Test 3: Runs Test
 
     Tests the total number of runs (sequences of identical bits).
     Reference: NIST SP 800-22 Section 2.3
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 100:
         return {"test": "runs", "error": "insufficient_data", "pass": False}
 
-    pi = sum(bits) / n
+    # Each set bit of x ^ (x >> 1) (below the top bit) is a transition
+    x = bits.to_int()
+    runs = 1 + ((x ^ (x >> 1)) & ((1 << (n - 1)) - 1)).bit_count()
+
+    return runs_result(n, x.bit_count(), runs)
+
+
+def runs_result(n: int, ones: int, runs: int) -> Dict:
+    """Runs test result from the ones count and the total number of runs."""
+    pi = ones / n
     tau = 2 / math.sqrt(n)
     if abs(pi - 0.5) >= tau:
         return {
@@ -178,11 +351,6 @@ def runs_test(bits: List[int]) -> Dict:
             "pass": False
         }
 
-    runs = 1
-    for i in range(1, n):
-        if bits[i] != bits[i - 1]:
-            runs += 1
-
     expected = 2 * n * pi * (1 - pi) + 1
     variance = 2 * n * pi * (1 - pi) * (2 * pi * (1 - pi) - 1 / n)
 
@@ -198,6 +366,7 @@ def runs_test(bits: List[int]) -> Dict:
         "runs_count": runs,
         "expected_runs": expected,
         "z_statistic": z,
+        "p_value": normal_p_value(z),
         "pass": passed
     }
 
@@ -206,55 +375,63 @@ def runs_test(bits: List[int]) -> Dict:
 # Test 4: Longest Run of Ones Test
 # =============================================================================
 
-def longest_run_test(bits: List[int]) -> Dict:
+def longest_run_test(bits: Bits) -> Dict:
     """
     Test 4: Longest Run of Ones in a Block
 
     Reference: NIST SP 800-22 Section 2.4
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
 
     if n < 128:
         return {"test": "longest_run", "error": "insufficient_data", "pass": False}
-    elif n < 6272:
-        M, K = 8, 3
-        V = [1, 2, 3, 4]
-        pi = [0.2148, 0.3672, 0.2305, 0.1875]
-    elif n < 750000:
-        M, K = 128, 5
-        V = [4, 5, 6, 7, 8, 9]
-        pi = [0.1174, 0.2430, 0.2493, 0.1752, 0.1027, 0.1124]
+    M, _, V, _ = longest_run_parameters(n)
+
+    frequencies = [0] * len(V)
+    for block in bits.blocks(M):
+        count_longest_run(block, V, frequencies)
+
+    return longest_run_result(n, frequencies)
+
+
+def longest_run_parameters(n: int) -> Tuple[int, int, List[int], List[float]]:
+    """Block size M, degrees of freedom K, class bounds V and probabilities for n bits."""
+    if n < 6272:
+        return 8, 3, [1, 2, 3, 4], [0.2148, 0.3672, 0.2305, 0.1875]
+    if n < 750000:
+        return 128, 5, [4, 5, 6, 7, 8, 9], [0.1174, 0.2430, 0.2493, 0.1752, 0.1027, 0.1124]
+    return (10000, 6, [10, 11, 12, 13, 14, 15, 16],
+            [0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727])
+
+
+def count_longest_run(block: BitSequence, V: List[int], frequencies: List[int]) -> None:
+    """Add one block's longest run of ones to the class frequencies."""
+    # x &= x << 1 shortens every run of ones by one bit
+    x = block.to_int()
+    longest = 0
+    while x:
+        x &= x << 1
+        longest += 1
+
+    if longest <= V[0]:
+        frequencies[0] += 1
+    elif longest >= V[-1]:
+        frequencies[-1] += 1
     else:
-        M, K = 10000, 6
-        V = [10, 11, 12, 13, 14, 15, 16]
-        pi = [0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727]
+        for j in range(1, len(V) - 1):
+            if longest == V[j]:
+                frequencies[j] += 1
+                break
 
+
+def longest_run_result(n: int, frequencies: List[int]) -> Dict:
+    """Longest run result from the class frequencies of all n // M blocks."""
+    M, K, V, pi = longest_run_parameters(n)
     n_blocks = n // M
     if n_blocks == 0:
         return {"test": "longest_run", "error": "insufficient_blocks", "pass": False}
 
-    frequencies = [0] * len(V)
-    for i in range(n_blocks):
-        block = bits[i * M:(i + 1) * M]
-        longest = 0
-        current = 0
-        for bit in block:
-            if bit == 1:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 0
-
-        if longest <= V[0]:
-            frequencies[0] += 1
-        elif longest >= V[-1]:
-            frequencies[-1] += 1
-        else:
-            for j in range(1, len(V) - 1):
-                if longest == V[j]:
-                    frequencies[j] += 1
-                    break
-
     chi_sq = sum((frequencies[i] - n_blocks * pi[i]) ** 2 / (n_blocks * pi[i])
                  for i in range(len(V)) if pi[i] > 0)
 
@@ -268,6 +445,7 @@ def longest_run_test(bits: List[int]) -> Dict:
         "n_blocks": n_blocks,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, K),
         "pass": passed
     }
 
@@ -276,44 +454,67 @@ def longest_run_test(bits: List[int]) -> Dict:
 # Test 5: Binary Matrix Rank Test
 # =============================================================================
 
-def compute_rank(matrix: List[List[int]]) -> int:
-    """Compute binary matrix rank using Gaussian elimination over GF(2)."""
-    m = [row[:] for row in matrix]  # Copy
-    rows = len(m)
-    cols = len(m[0]) if rows > 0 else 0
-
-    rank = 0
-    for col in range(cols):
-        # Find pivot
-        pivot = None
-        for row in range(rank, rows):
-            if m[row][col] == 1:
-                pivot = row
+def gf2_rank(rows: Iterable[int]) -> int:
+    """
+    Rank over GF(2) of a matrix given as integer row bitmasks.
+
+    Each row is reduced against the pivots found so far, keyed by leading
+    bit, so elimination costs one XOR per pivot instead of one per element.
+    """
+    pivots: Dict[int, int] = {}
+    for row in rows:
+        while row:
+            lead = row.bit_length()
+            pivot = pivots.get(lead)
+            if pivot is None:
+                pivots[lead] = row
                 break
+            row ^= pivot
+    return len(pivots)
 
-        if pivot is None:
-            continue
 
-        # Swap rows
-        m[rank], m[pivot] = m[pivot], m[rank]
+def matrix_ranks(bits: Bits, M: int, Q: int) -> List[int]:
+    """
+    Ranks of all consecutive M×Q matrices in bits, filled row by row.
+
+    Rows are extracted for every matrix in one pass as Q-bit integers, so
+    the whole batch costs one bulk field split plus the XOR elimination.
+    """
+    bits = as_bit_sequence(bits)
+    n_matrices = len(bits) // (M * Q)
+    rows = list(bits[:n_matrices * M * Q].fields(Q))
+    return [gf2_rank(rows[i:i + M]) for i in range(0, len(rows), M)]
+
 
-        # Eliminate
-        for row in range(rows):
-            if row != rank and m[row][col] == 1:
-                m[row] = [(m[row][i] ^ m[rank][i]) for i in range(cols)]
+def matrix_rank_classes(bits: Bits, M: int, Q: int) -> List[int]:
+    """Counts of full-rank, full-rank-minus-one and lower-rank matrices in bits."""
+    full = min(M, Q)
+    counts = Counter(matrix_ranks(bits, M, Q))
+    F_M = counts.pop(full, 0)
+    F_M1 = counts.pop(full - 1, 0)
+    return [F_M, F_M1, sum(counts.values())]
 
-        rank += 1
 
-    return rank
+def rank_probability(r: int, M: int, Q: int) -> float:
+    """
+    Probability that a random M×Q binary matrix has rank r.
+
+    Reference: NIST SP 800-22 Section 3.5
+    """
+    product = 1.0
+    for i in range(r):
+        product *= ((1 - 2.0 ** (i - Q)) * (1 - 2.0 ** (i - M))) / (1 - 2.0 ** (i - r))
+    return 2.0 ** (r * (Q + M - r) - M * Q) * product
 
 
-def binary_matrix_rank_test(bits: List[int], M: int = 32, Q: int = 32) -> Dict:
+def binary_matrix_rank_test(bits: Bits, M: int = 32, Q: int = 32) -> Dict:
     """
     Test 5: Binary Matrix Rank Test
 
     Tests linear dependence among fixed-length substrings.
     Reference: NIST SP 800-22 Section 2.5
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     n_matrices = n // (M * Q)
 
@@ -321,29 +522,28 @@ def binary_matrix_rank_test(bits: List[int], M: int = 32, Q: int = 32) -> Dict:
         return {"test": "binary_matrix_rank", "error": "insufficient_data", "pass": False}
 
     # Count matrices with full rank (M), M-1, and less
-    F_M = 0
-    F_M1 = 0
-    F_other = 0
-
-    for i in range(n_matrices):
-        start = i * M * Q
-        matrix = []
-        for row in range(M):
-            row_bits = bits[start + row * Q:start + (row + 1) * Q]
-            matrix.append(row_bits)
-
-        r = compute_rank(matrix)
-        if r == M:
-            F_M += 1
-        elif r == M - 1:
-            F_M1 += 1
-        else:
-            F_other += 1
+    F_M, F_M1, F_other = matrix_rank_classes(bits, M, Q)
+
+    return binary_matrix_rank_result(n, M, Q, F_M, F_M1, F_other)
 
-    # Theoretical probabilities for 32x32 matrices
-    p_M = 0.2888
-    p_M1 = 0.5776
-    p_other = 0.1336
+
+def binary_matrix_rank_result(n: int, M: int, Q: int, F_M: int, F_M1: int, F_other: int) -> Dict:
+    """Matrix rank result from the full-rank, rank M-1 and lower-rank counts."""
+    n_matrices = F_M + F_M1 + F_other
+
+    if n_matrices < 38:
+        return {"test": "binary_matrix_rank", "error": "insufficient_data", "pass": False}
+
+    if M == Q == 32:
+        # Tabulated probabilities for 32x32 matrices
+        p_M = 0.2888
+        p_M1 = 0.5776
+        p_other = 0.1336
+    else:
+        full = min(M, Q)
+        p_M = rank_probability(full, M, Q)
+        p_M1 = rank_probability(full - 1, M, Q)
+        p_other = 1.0 - p_M - p_M1
 
     N = n_matrices
     chi_sq = ((F_M - N * p_M) ** 2 / (N * p_M) +
@@ -364,6 +564,7 @@ def binary_matrix_rank_test(bits: List[int], M: int = 32, Q: int = 32) -> Dict:
         "other": F_other,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, 2),
         "pass": passed
     }
 
@@ -372,42 +573,290 @@ def binary_matrix_rank_test(bits: List[int], M: int = 32, Q: int = 32) -> Dict:
 # Test 6: Discrete Fourier Transform (Spectral) Test
 # =============================================================================
 
-def dft_spectral_test(bits: List[int]) -> Dict:
+# FFT lengths up to this run as one complex-list transform; longer ones use
+# the four-step split into row and column transforms of about sqrt(N) points
+FFT_DIRECT_POINTS = 1 << 12
+
+# Points converted between float arrays and complex objects per step
+FFT_CHUNK_POINTS = 1 << 16
+
+_real = attrgetter("real")
+_imag = attrgetter("imag")
+
+
+def _fft(x: List[complex], twiddles: List[complex], size: int) -> List[complex]:
+    """
+    Radix-2 FFT of a power-of-two length list (Stockham autosort).
+
+    Runs bottom-up with no bit reversal: before each stage the list holds
+    the transforms of x[r::s] for r < s, each of length L = n/s, one after
+    another, and transforms r and r + s/2 merge into one of length 2L.
+    twiddles[k] = exp(∓2πik/size) for k < size/2; a stage of length 2L
+    takes every (size/2L)-th entry. Butterflies run as C-level map() over
+    half the list, and the merged halves are laid out with slice copies.
+    """
+    n = len(x)
+    half = n // 2
+    data = x
+    length = 1
+    while length < n:
+        merged = half // length
+        even = data[:half]
+        odd = data[half:]
+        if length > 1:
+            odd = list(map(mul, odd, twiddles[::size // (2 * length)] * merged))
+        plus = list(map(add, even, odd))
+        minus = list(map(sub, even, odd))
+        span = 2 * length
+        data = [0j] * n
+        if length <= merged:
+            for k in range(length):
+                data[k::span] = plus[k::length]
+                data[length + k::span] = minus[k::length]
+        else:
+            for r in range(merged):
+                data[r * span:r * span + length] = plus[r * length:(r + 1) * length]
+                data[r * span + length:(r + 1) * span] = minus[r * length:(r + 1) * length]
+        length = span
+    return data
+
+
+def _twiddles(size: int, inverse: bool = False) -> List[complex]:
+    """exp(-2πik/size) for k < size/2 (exp(+2πik/size) for the inverse)."""
+    sign = 1 if inverse else -1
+    return [cmath.exp(sign * 2j * math.pi * k / size) for k in range(size // 2)]
+
+
+def _zeros(n: int) -> array:
+    return array("d", bytes(8 * n))
+
+
+def _store(re: array, im: array, index: slice, values: List[complex]) -> None:
+    re[index] = array("d", map(_real, values))
+    im[index] = array("d", map(_imag, values))
+
+
+def _fft_split(n: int) -> Tuple[int, int]:
+    """(rows n1, row length n2) of the four-step layout of a length-n FFT."""
+    if n <= FFT_DIRECT_POINTS:
+        return 1, n
+    n1 = 1 << ((n.bit_length() - 1) // 2)
+    return n1, n // n1
+
+
+def _four_step(re: array, im: array, inverse: bool = False) -> None:
+    """
+    In-place power-of-two DFT of re + i·im, held as float arrays.
+
+    Viewed as an n1 × n2 matrix, the forward transform runs length-n1 FFTs
+    down the columns, multiplies by exp(-2πi c k1 / N) and runs length-n2
+    FFTs along the rows. Only one row or column exists as complex objects
+    at a time. The output is left transposed: X[k1 + n1 k2] is stored at
+    k1 n2 + k2. inverse=True undoes exactly that: it takes the transposed
+    layout and returns N times the sequence in natural order.
+    """
+    n = len(re)
+    n1, n2 = _fft_split(n)
+    sign = 1 if inverse else -1
+    column_twiddles = _twiddles(n1, inverse)
+    row_twiddles = _twiddles(n2, inverse)
+
+    def columns():
+        for c in range(n2):
+            index = slice(c, None, n2)
+            values = _fft(list(map(complex, re[index], im[index])), column_twiddles, n1)
+            if not inverse and c:
+                values = list(map(mul, values, map(cmath.exp, map(
+                    mul, range(n1), repeat(sign * 2j * math.pi * c / n)))))
+            _store(re, im, index, values)
+
+    def rows():
+        for r in range(n1):
+            index = slice(r * n2, (r + 1) * n2)
+            values = _fft(list(map(complex, re[index], im[index])), row_twiddles, n2)
+            if inverse and r:
+                values = list(map(mul, values, map(cmath.exp, map(
+                    mul, range(n2), repeat(sign * 2j * math.pi * r / n)))))
+            _store(re, im, index, values)
+
+    if n1 == 1:
+        rows()
+    elif inverse:
+        rows()
+        columns()
+    else:
+        columns()
+        rows()
+
+
+def _untranspose(re: array, im: array) -> Tuple[array, array]:
+    """Natural-order copy of a forward _four_step output."""
+    n1, n2 = _fft_split(len(re))
+    if n1 == 1:
+        return re, im
+    out_re, out_im = _zeros(len(re)), _zeros(len(im))
+    for r in range(n1):
+        out_re[r::n1] = re[r * n2:(r + 1) * n2]
+        out_im[r::n1] = im[r * n2:(r + 1) * n2]
+    return out_re, out_im
+
+
+class SpectralPlan:
+    """
+    Length-dependent tables of the standard-library spectral transform.
+
+    For n bits, `points` complex points are transformed (n/2 packed pairs
+    for even n, n otherwise). When that is not a power of two the plan
+    holds Bluestein's chirp and the transformed convolution kernel, which
+    depend on the length only, so a batch of equal-length sequences builds
+    them once and each sequence costs two FFTs instead of three.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.points = n // 2 if n % 2 == 0 else n
+        L = self.points
+        self.size = 1 << (2 * L - 2).bit_length()
+        self.bluestein = L & (L - 1) != 0
+        if not self.bluestein:
+            return
+
+        # chirp[k] = exp(-πik²/L)
+        self.chirp_re, self.chirp_im = array("d"), array("d")
+        for start in range(0, L, FFT_CHUNK_POINTS):
+            chirp = [cmath.exp(-1j * math.pi * ((k * k) % (2 * L)) / L)
+                     for k in range(start, min(L, start + FFT_CHUNK_POINTS))]
+            self.chirp_re.extend(map(_real, chirp))
+            self.chirp_im.extend(map(_imag, chirp))
+
+        # Kernel conj(chirp) at ±k (circular), transformed once
+        size = self.size
+        b_re, b_im = _zeros(size), _zeros(size)
+        b_re[:L] = self.chirp_re
+        b_im[:L] = array("d", map(neg, self.chirp_im))
+        b_re[size - L + 1:] = self.chirp_re[:0:-1]
+        b_im[size - L + 1:] = array("d", map(neg, self.chirp_im[:0:-1]))
+        _four_step(b_re, b_im)
+        self.kernel_re, self.kernel_im = b_re, b_im
+
+
+def _dft_bluestein(re: array, im: array, count: int, plan: SpectralPlan) -> Tuple[array, array]:
+    """
+    First `count` DFT bins of re + i·im for any length L (chirp-z transform).
+
+    The length-L DFT becomes a circular convolution with the chirp
+    exp(πik²/L) over a power-of-two length >= 2L - 1, so no padding or
+    truncation of the input changes the statistic. The input is
+    transformed into the same transposed layout as the plan's kernel,
+    multiplied there, and the inverse transform returns natural order.
+    """
+    L = len(re)
+    size = plan.size
+    chirp_re, chirp_im = plan.chirp_re, plan.chirp_im
+
+    a_re, a_im = _zeros(size), _zeros(size)
+    for start in range(0, L, FFT_CHUNK_POINTS):
+        index = slice(start, min(L, start + FFT_CHUNK_POINTS))
+        _store(a_re, a_im, index, list(map(mul, map(complex, re[index], im[index]),
+                                           map(complex, chirp_re[index], chirp_im[index]))))
+    _four_step(a_re, a_im)
+    for start in range(0, size, FFT_CHUNK_POINTS):
+        index = slice(start, start + FFT_CHUNK_POINTS)
+        _store(a_re, a_im, index, list(map(mul, map(complex, a_re[index], a_im[index]),
+                                           map(complex, plan.kernel_re[index], plan.kernel_im[index]))))
+    _four_step(a_re, a_im, inverse=True)
+
+    out_re, out_im = array("d"), array("d")
+    scale = 1 / size
+    for start in range(0, count, FFT_CHUNK_POINTS):
+        index = slice(start, min(count, start + FFT_CHUNK_POINTS))
+        values = list(map(mul, map(complex, a_re[index], a_im[index]),
+                          map(complex, chirp_re[index], chirp_im[index])))
+        out_re.extend(map(mul, map(_real, values), repeat(scale)))
+        out_im.extend(map(mul, map(_imag, values), repeat(scale)))
+    return out_re, out_im
+
+
+def _complex_dft(re: array, im: array, count: int, plan: SpectralPlan) -> Tuple[array, array]:
+    """First `count` DFT bins of re + i·im (overwrites the inputs)."""
+    if plan.bluestein:
+        return _dft_bluestein(re, im, count, plan)
+    _four_step(re, im)
+    out_re, out_im = _untranspose(re, im)
+    return out_re[:count], out_im[:count]
+
+
+def spectral_magnitudes(bits: BitSequence, plan: Optional[SpectralPlan] = None) -> array:
+    """
+    |DFT_k| of the ±1 sequence for k < n/2, over all n bits.
+
+    Without NumPy, an even-length real sequence is packed into n/2 complex
+    points x[2k] + i x[2k+1], transformed once and untangled into the real
+    spectrum; odd lengths go through the complex transform directly.
+    Values live in float arrays (16 bytes per complex point) and are turned
+    into complex objects FFT_CHUNK_POINTS at a time. plan is the
+    SpectralPlan of this length, if one is already built.
+    """
+    n = len(bits)
+    if np is not None:
+        unpacked = np.unpackbits(np.frombuffer(bits.tobytes(), dtype=np.uint8))[:n]
+        spectrum = np.fft.rfft(unpacked.astype(np.float64) * 2 - 1)
+        return array("d", np.abs(spectrum[:n // 2]).tobytes())
+
+    if plan is None:
+        plan = SpectralPlan(n)
+    elif plan.n != n:
+        raise ValueError(f"spectral plan is for {plan.n} bits, not {n}")
+    steps = array("b", bits.unpack().translate(_PLUS_MINUS_ONE))
+    half = n // 2
+    if n % 2:
+        re, im = _complex_dft(array("d", steps), _zeros(n), half, plan)
+        return array("d", map(abs, map(complex, re, im)))
+
+    z_re, z_im = _complex_dft(array("d", steps[::2]), array("d", steps[1::2]), half, plan)
+    del steps
+    # conj(Z[(L - k) mod L]) pairs with Z[k] (L = n/2 points)
+    rev_re = z_re[:1] + z_re[:0:-1]
+    rev_im = array("d", map(neg, z_im[:1] + z_im[:0:-1]))
+    magnitudes = array("d")
+    for start in range(0, half, FFT_CHUNK_POINTS):
+        index = slice(start, min(half, start + FFT_CHUNK_POINTS))
+        z = list(map(complex, z_re[index], z_im[index]))
+        z_rev = list(map(complex, rev_re[index], rev_im[index]))
+        even = map(mul, map(add, z, z_rev), repeat(0.5))
+        odd = map(mul, map(sub, z, z_rev), repeat(-0.5j))
+        twiddles = map(cmath.exp, map(mul, range(index.start, index.stop), repeat(-2j * math.pi / n)))
+        magnitudes.extend(map(abs, map(add, even, map(mul, twiddles, odd))))
+    return magnitudes
+
+
+def dft_spectral_test(bits: Bits, plan: Optional[SpectralPlan] = None) -> Dict:
     """
     Test 6: Discrete Fourier Transform (Spectral) Test
 
     Detects periodic features in the bit sequence.
     Reference: NIST SP 800-22 Section 2.6
+
+    The DFT is taken over the full n-bit sequence with an O(n log n) FFT.
+    The standard-library FFT above needs about 80 bytes per bit at peak
+    (power-of-two n: about 40) and runs ~17 s at 10^6 bits and ~5 min at
+    10^7 bits on one core; that is its practical limit. Larger sequences
+    (10^8 bits and up) need NumPy, which is used when installed.
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 1000:
         return {"test": "dft_spectral", "error": "insufficient_data", "pass": False}
 
-    # Convert to +1/-1
-    x = [2 * b - 1 for b in bits]
-
-    # Compute DFT using simple O(n^2) algorithm for smaller n
-    # For large n, we sample
-    sample_size = min(n, 10000)
-    if n > sample_size:
-        step = n // sample_size
-        x = x[::step][:sample_size]
-        n = len(x)
-
-    # Compute magnitudes of first n/2 frequencies
-    magnitudes = []
-    for k in range(n // 2):
-        real_part = sum(x[j] * math.cos(2 * math.pi * k * j / n) for j in range(n))
-        imag_part = sum(x[j] * math.sin(2 * math.pi * k * j / n) for j in range(n))
-        mag = math.sqrt(real_part ** 2 + imag_part ** 2)
-        magnitudes.append(mag)
+    # Magnitudes of the first n/2 frequencies of the ±1 sequence
+    magnitudes = spectral_magnitudes(bits, plan)
 
     # Threshold T = sqrt(n * ln(1/0.05))
     T = math.sqrt(n * math.log(20))  # ln(1/0.05) ≈ 3
 
     # Count peaks above threshold
     N_0 = 0.95 * n / 2  # Expected number below threshold
-    N_1 = sum(1 for m in magnitudes if m < T)
+    N_1 = sum(map(T.__gt__, magnitudes))
 
     # z-statistic
     d = (N_1 - N_0) / math.sqrt(n * 0.95 * 0.05 / 4)
@@ -422,21 +871,32 @@ def dft_spectral_test(bits: List[int]) -> Dict:
         "peaks_below_threshold": N_1,
         "expected_below": N_0,
         "d_statistic": d,
+        "p_value": normal_p_value(d),
         "pass": passed
     }
 
 
+def dft_spectral_batch(sequences: Sequence[Bits]) -> List[Dict]:
+    """dft_spectral_test over equal-length sequences, sharing one SpectralPlan."""
+    sequences = [as_bit_sequence(bits) for bits in sequences]
+    plan = None
+    if np is None and sequences and len(sequences[0]) >= 1000:
+        plan = SpectralPlan(len(sequences[0]))
+    return [dft_spectral_test(bits, plan) for bits in sequences]
+
+
 # =============================================================================
 # Test 7: Non-overlapping Template Matching Test
 # =============================================================================
 
-def non_overlapping_template_test(bits: List[int], template: Tuple[int, ...] = (0, 0, 0, 0, 0, 0, 0, 0, 1)) -> Dict:
+def non_overlapping_template_test(bits: Bits, template: Tuple[int, ...] = (0, 0, 0, 0, 0, 0, 0, 0, 1)) -> Dict:
     """
     Test 7: Non-overlapping Template Matching Test
 
     Tests the number of occurrences of pre-specified target strings.
     Reference: NIST SP 800-22 Section 2.7
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     m = len(template)
     M = 1032  # Block size (recommended)
@@ -450,18 +910,135 @@ def non_overlapping_template_test(bits: List[int], template: Tuple[int, ...] = (
         return {"test": "non_overlapping_template", "error": "insufficient_blocks", "pass": False}
 
     # Count template occurrences in each block (non-overlapping)
-    W = []
-    for i in range(N):
-        block = bits[i * M:(i + 1) * M]
-        count = 0
-        j = 0
-        while j <= M - m:
-            if tuple(block[j:j + m]) == template:
-                count += 1
-                j += m  # Non-overlapping
-            else:
-                j += 1
-        W.append(count)
+    target = int("".join(str(b) for b in template), 2)
+    if is_aperiodic(target, m):
+        W = template_block_counts(bits, [target], m, M)[0]
+    else:
+        W = [count_non_overlapping(block, target, m) for block in bits.blocks(M)]
+
+    return non_overlapping_template_result(n, template, M, W)
+
+
+def is_aperiodic(template: int, m: int) -> bool:
+    """True if no proper shift of the m-bit template overlaps itself."""
+    return all(template >> k != template & ((1 << (m - k)) - 1) for k in range(1, m))
+
+
+def aperiodic_templates(m: int = 9) -> List[int]:
+    """All aperiodic m-bit templates (148 for m = 9), in increasing order."""
+    return [t for t in range(1 << m) if is_aperiodic(t, m)]
+
+
+def template_block_counts(bits: Bits, templates: Sequence[int], m: int, M: int) -> List[List[int]]:
+    """
+    Non-overlapping match counts of every template in every M-bit block.
+
+    Returns one row of per-block counts per template. An aperiodic template
+    cannot overlap itself, so its non-overlapping count equals the number of
+    windows equal to it: one m-bit window histogram per block serves every
+    template at once through a lookup.
+    """
+    bits = as_bit_sequence(bits)
+    per_block = []
+    for block in bits.blocks(M):
+        counts = Counter()
+        count_windows(block, m, M - m + 1, counts)
+        per_block.append(list(map(counts.__getitem__, templates)))
+    return [list(row) for row in zip(*per_block)] if per_block else [[] for _ in templates]
+
+
+def non_overlapping_templates_test(bits: Bits, m: int = 9, M: int = 1032) -> Dict:
+    """
+    Test 7 over the full NIST aperiodic template set.
+
+    Runs the non-overlapping template statistic for every aperiodic m-bit
+    template in one pass and passes when the proportion of passing templates
+    is within the SP 800-22 Section 4.2.1 confidence interval.
+    """
+    bits = as_bit_sequence(bits)
+    n = len(bits)
+
+    if n < M:
+        return {"test": "non_overlapping_template", "error": "insufficient_data", "pass": False}
+    if n // M < 8:
+        return {"test": "non_overlapping_template", "error": "insufficient_blocks", "pass": False}
+
+    templates = aperiodic_templates(m)
+    rows = template_block_counts(bits, templates, m, M)
+    return non_overlapping_templates_result(n, m, M, templates, [Counter(W) for W in rows])
+
+
+def non_overlapping_templates_result(n: int, m: int, M: int, templates: Sequence[int],
+                                     histograms: Sequence[Dict[int, int]]) -> Dict:
+    """
+    Per-template results and pass proportion.
+
+    histograms[i] maps a per-block match count of templates[i] to the
+    number of blocks with that count.
+    """
+    per_template = []
+    for target, histogram in zip(templates, histograms):
+        template = tuple(int(b) for b in format(target, f"0{m}b"))
+        r = non_overlapping_template_histogram_result(n, template, M, histogram)
+        if "error" in r:
+            return r
+        per_template.append({"template": r["template"], "chi_squared": r["chi_squared"],
+                             "p_value": r["p_value"], "pass": r["pass"]})
+
+    # Proportion of passing templates: 0.99 ± 3σ over k templates
+    k = len(per_template)
+    n_passed = sum(1 for t in per_template if t["pass"])
+    min_proportion = 0.99 - 3 * math.sqrt(0.99 * 0.01 / k)
+
+    return {
+        "test": "non_overlapping_template",
+        "n_bits": n,
+        "template_length": m,
+        "n_templates": k,
+        "n_blocks": n // M,
+        "block_size": M,
+        "mean": (M - m + 1) / (2 ** m),
+        "n_passed": n_passed,
+        "min_pass_proportion": min_proportion,
+        "templates": per_template,
+        "pass": n_passed / k >= min_proportion
+    }
+
+
+def count_non_overlapping(block: BitSequence, target: int, m: int) -> int:
+    """Non-overlapping occurrences of the m-bit pattern `target` in one block."""
+    mask = (1 << m) - 1
+    count = 0
+    window = 0
+    filled = 0
+    for bit in block:
+        window = ((window << 1) | bit) & mask
+        filled += 1
+        if filled >= m and window == target:
+            count += 1
+            filled = 0  # Non-overlapping: next match needs m fresh bits
+    return count
+
+
+def non_overlapping_template_result(n: int, template: Tuple[int, ...], M: int, W: List[int]) -> Dict:
+    """Non-overlapping template result from the per-block match counts W."""
+    return non_overlapping_template_histogram_result(n, template, M, Counter(W))
+
+
+def non_overlapping_template_histogram_result(n: int, template: Tuple[int, ...], M: int,
+                                              histogram: Dict[int, int]) -> Dict:
+    """
+    Non-overlapping template result from {per-block match count: blocks}.
+
+    The chi-squared sum only needs the block counts as a multiset, so it is
+    taken over the distinct counts (in increasing order, whatever the order
+    the histogram was filled in).
+    """
+    m = len(template)
+    N = sum(histogram.values())
+
+    if N < 8:
+        return {"test": "non_overlapping_template", "error": "insufficient_blocks", "pass": False}
 
     # Theoretical mean and variance
     mu = (M - m + 1) / (2 ** m)
@@ -471,7 +1048,7 @@ def non_overlapping_template_test(bits: List[int], template: Tuple[int, ...] = (
         sigma_sq = 0.001
 
     # Chi-squared statistic
-    chi_sq = sum((w - mu) ** 2 / sigma_sq for w in W)
+    chi_sq = sum(blocks * (w - mu) ** 2 for w, blocks in sorted(histogram.items())) / sigma_sq
 
     # Critical value for chi-sq(N) at alpha=0.01
     critical = N + 2.33 * math.sqrt(2 * N)
@@ -487,6 +1064,7 @@ def non_overlapping_template_test(bits: List[int], template: Tuple[int, ...] = (
         "mean": mu,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, N),
         "pass": passed
     }
 
@@ -495,15 +1073,19 @@ def non_overlapping_template_test(bits: List[int], template: Tuple[int, ...] = (
 # Test 8: Overlapping Template Matching Test
 # =============================================================================
 
-def overlapping_template_test(bits: List[int], m: int = 9) -> Dict:
+# Match-count classes 0, 1, ..., K - 1 and >= K (K = 5, SP 800-22 Section 2.8)
+OVERLAPPING_BINS = 5
+
+def overlapping_template_test(bits: Bits, m: int = 9) -> Dict:
     """
     Test 8: Overlapping Template Matching Test
 
     Tests occurrences of all-ones template with overlapping.
     Reference: NIST SP 800-22 Section 2.8
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
-    template = tuple([1] * m)
+    target = (1 << m) - 1  # All-ones template
     M = 1032
     N = n // M
 
@@ -511,23 +1093,40 @@ def overlapping_template_test(bits: List[int], m: int = 9) -> Dict:
         return {"test": "overlapping_template", "error": "insufficient_data", "pass": False}
 
     # Count overlapping occurrences in each block
-    counts = []
-    for i in range(N):
-        block = bits[i * M:(i + 1) * M]
-        count = 0
-        for j in range(M - m + 1):
-            if tuple(block[j:j + m]) == template:
-                count += 1
-        counts.append(count)
+    counts = [count_overlapping(block, target, m) for block in bits.blocks(M)]
+
+    return overlapping_template_result(n, m, M, counts)
+
+
+def count_overlapping(block: BitSequence, target: int, m: int) -> int:
+    """Overlapping occurrences of the m-bit pattern `target` in one block."""
+    mask = (1 << m) - 1
+    count = 0
+    window = 0
+    for j, bit in enumerate(block):
+        window = ((window << 1) | bit) & mask
+        if j >= m - 1 and window == target:
+            count += 1
+    return count
+
 
+def overlapping_template_result(n: int, m: int, M: int, counts: List[int]) -> Dict:
+    """Overlapping template result from the per-block match counts."""
     # Categorize counts into bins 0, 1, 2, 3, 4, ≥5
-    K = 5
+    K = OVERLAPPING_BINS
     v = [0] * (K + 1)
     for c in counts:
-        if c >= K:
-            v[K] += 1
-        else:
-            v[c] += 1
+        v[min(c, K)] += 1
+    return overlapping_template_bins_result(n, m, M, v)
+
+
+def overlapping_template_bins_result(n: int, m: int, M: int, v: List[int]) -> Dict:
+    """Overlapping template result from the bin frequencies v[0..K]."""
+    N = sum(v)
+    K = OVERLAPPING_BINS
+
+    if N < 8:
+        return {"test": "overlapping_template", "error": "insufficient_data", "pass": False}
 
     # Pre-computed theoretical probabilities from NIST SP 800-22 Table 2.8-1
     # For m=9, M=1032, K=5 (bins 0,1,2,3,4,≥5)
@@ -550,6 +1149,7 @@ def overlapping_template_test(bits: List[int], m: int = 9) -> Dict:
         "bin_counts": v,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, K),
         "pass": passed
     }
 
@@ -558,13 +1158,14 @@ def overlapping_template_test(bits: List[int], m: int = 9) -> Dict:
 # Test 9: Maurer's Universal Statistical Test
 # =============================================================================
 
-def maurers_universal_test(bits: List[int], L: int = 7, Q: int = 1280) -> Dict:
+def maurers_universal_test(bits: Bits, L: int = 7, Q: int = 1280) -> Dict:
     """
     Test 9: Maurer's Universal Statistical Test
 
     Measures compressibility of the bit sequence.
     Reference: NIST SP 800-22 Section 2.9
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     K = n // L - Q
 
@@ -583,26 +1184,31 @@ def maurers_universal_test(bits: List[int], L: int = 7, Q: int = 1280) -> Dict:
     if L not in expected_values:
         return {"test": "maurers_universal", "error": "invalid_L", "pass": False}
 
-    expected_mean, c = expected_values[L]
+    expected_mean, variance = expected_values[L]
 
     # Initialize table with first Q blocks
+    blocks = bits[:(Q + K) * L].fields(L)
     table = {}
     for i in range(Q):
-        block = tuple(bits[i * L:(i + 1) * L])
+        block = next(blocks)
         table[block] = i
 
     # Compute sum of log2 distances
     total = 0
     for i in range(Q, Q + K):
-        block = tuple(bits[i * L:(i + 1) * L])
+        block = next(blocks)
         if block in table:
             total += math.log2(i - table[block])
         table[block] = i
 
     f_n = total / K
 
-    # Variance
-    sigma = c * math.sqrt((0.7 - 0.8 / L + (4 + 32 / L) * (K ** (-3 / L))) / K)
+    # Standard deviation: σ = c·sqrt(variance / K) (SP 800-22 Section 3.9).
+    # Earlier versions put the c expression where the variance belongs, which
+    # inflated σ and pushed every P-value toward 1; this correction changes
+    # Maurer pass/fail results relative to those versions.
+    c = 0.7 - 0.8 / L + (4 + 32 / L) * (K ** (-3 / L)) / 15
+    sigma = c * math.sqrt(variance / K)
 
     if sigma <= 0:
         sigma = 0.001
@@ -621,6 +1227,7 @@ def maurers_universal_test(bits: List[int], L: int = 7, Q: int = 1280) -> Dict:
         "f_n": f_n,
         "expected_mean": expected_mean,
         "z_statistic": z,
+        "p_value": normal_p_value(z),
         "pass": passed
     }
 
@@ -656,45 +1263,145 @@ def berlekamp_massey(bits: List[int]) -> int:
     return L
 
 
-def linear_complexity_test(bits: List[int], M: int = 500) -> Dict:
+# Blocks advanced together by the bit-sliced Berlekamp-Massey kernel
+BM_LANES = 4096
+
+# Unpacked 0/1 byte -> ASCII digit
+_ASCII_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def berlekamp_massey_lanes(planes: List[int], lanes: int) -> List[int]:
+    """
+    Bit-sliced Berlekamp-Massey over many independent sequences at once.
+
+    planes[t] holds bit t of every sequence, one sequence per bit lane, so
+    each polynomial coefficient is one `lanes`-bit integer and a single
+    AND/XOR advances every lane. Lanes that take the length-change branch
+    are selected with masks instead of per-lane control flow:
+
+        d      = s[N] ^ Σ c[i] & s[N-i]        discrepancy (per lane)
+        c     ^= d & B                         B = x^(N-m)·b, kept pre-shifted
+        sel    = d & (2L <= N)                 lanes whose L changes
+        B      = x · (sel ? c_old : B)
+
+    E = N - 2L is kept as two's-complement bit planes, so the 2L <= N
+    test is its inverted sign plane: E becomes ~E on selected lanes and
+    E + 1 elsewhere. After n steps L = (n - E) / 2.
+
+    Returns the linear complexity of each lane, lane 0 in the most
+    significant bit of the planes.
+    """
+    n = len(planes)
+    full = (1 << lanes) - 1
+    c = [full] + [0] * n
+    B = [0, full] + [0] * (n - 1)
+    E = [0] * ((n + 1).bit_length() + 1)
+
+    for N in range(n):
+        # Discrepancy: s[N] ^ c[1]&s[N-1] ^ ... ^ c[N]&s[0]
+        d = reduce(xor, map(and_, c[1:N + 1], planes[N - 1::-1] if N else ()), planes[N])
+        sel = d & ~E[-1] & full
+        if d:
+            if sel:
+                c_old = c[:N + 2]
+            c[:N + 2] = map(xor, c[:N + 2], map(and_, B[:N + 2], repeat(d)))
+        # B ← x · (sel ? c_old : B), truncated to degree n
+        if sel:
+            keep = full ^ sel
+            B[1:N + 3] = map(or_, map(and_, c_old, repeat(sel)), map(and_, B[:N + 2], repeat(keep)))
+        else:
+            B[1:N + 3] = B[:N + 2]
+        B[0] = 0
+        del B[n + 1:]
+        # E ← ~E on selected lanes, E + 1 on the others
+        carry = full ^ sel
+        for k, plane in enumerate(E):
+            E[k] = plane ^ carry ^ sel
+            carry &= plane
+
+    # Reassemble each lane's E from its bit planes (sign plane last)
+    width = len(E)
+    columns = zip(*(format(plane, f"0{lanes}b") for plane in reversed(E)))
+    out = []
+    for column in columns:
+        e = int("".join(column), 2)
+        if e >> (width - 1):
+            e -= 1 << width
+        out.append((n - e) // 2)
+    return out
+
+
+def linear_complexities(bits: Bits, M: int, lanes: int = BM_LANES) -> List[int]:
+    """
+    Linear complexity of every consecutive M-bit block of bits.
+
+    Blocks are transposed `lanes` at a time into bit planes (plane t is bit t
+    of every block) and run through berlekamp_massey_lanes together.
+    """
+    bits = as_bit_sequence(bits)
+    n_blocks = len(bits) // M
+    out: List[int] = []
+    for first in range(0, n_blocks, lanes):
+        count = min(lanes, n_blocks - first)
+        # ASCII '0'/'1' per bit, so each strided column parses with int(..., 2)
+        text = bits[first * M:(first + count) * M].unpack().translate(_ASCII_BITS)
+        planes = [int(text[t::M], 2) for t in range(M)]
+        out.extend(berlekamp_massey_lanes(planes, count))
+    return out
+
+
+def linear_complexity_counts(bits: Bits, M: int) -> List[int]:
+    """T-value bin counts (v_0..v_6) over all M-bit blocks of bits."""
+    v = [0] * 7
+    for L, count in Counter(linear_complexities(bits, M)).items():
+        v[linear_complexity_class(L, M)] += count
+    return v
+
+
+def linear_complexity_test(bits: Bits, M: int = 500) -> Dict:
     """
     Test 10: Linear Complexity Test
 
     Tests the linear complexity of the sequence.
     Reference: NIST SP 800-22 Section 2.10
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     N = n // M
 
     if N < 10:
         return {"test": "linear_complexity", "error": "insufficient_data", "pass": False}
 
-    # Expected linear complexity
-    mu = M / 2 + (9 + (-1) ** (M + 1)) / 36 - (M / 3 + 2 / 9) / (2 ** M)
+    # Categorize each block's T value into bins
+    v = linear_complexity_counts(bits, M)
 
-    # Compute T values for each block
-    T = []
-    for i in range(N):
-        block = bits[i * M:(i + 1) * M]
-        L = berlekamp_massey(block)
-        T_i = (-1) ** M * (L - mu) + 2 / 9
-        T.append(T_i)
+    return linear_complexity_result(n, M, v)
+
+
+def linear_complexity_class(L: int, M: int) -> int:
+    """Bin index (0..6) of T = (-1)^M (L - μ) + 2/9 for one block."""
+    # Expected linear complexity
+    mu = M / 2 + (9 + (-1) ** (M + 1)) / 36 - (M / 3 + 2 / 9) * 2.0 ** -M
+    t = (-1) ** M * (L - mu) + 2 / 9
 
-    # Categorize into bins
-    K = 6
-    v = [0] * (K + 1)
     thresholds = [-2.5, -1.5, -0.5, 0.5, 1.5, 2.5]
+    if t <= thresholds[0]:
+        return 0
+    if t > thresholds[-1]:
+        return 6
+    for j in range(len(thresholds) - 1):
+        if thresholds[j] < t <= thresholds[j + 1]:
+            return j + 1
+    return 6
+
+
+def linear_complexity_result(n: int, M: int, v: List[int]) -> Dict:
+    """Linear complexity result from the T-value bin counts of all blocks."""
+    N = sum(v)
+    K = 6
 
-    for t in T:
-        if t <= thresholds[0]:
-            v[0] += 1
-        elif t > thresholds[-1]:
-            v[K] += 1
-        else:
-            for j in range(len(thresholds) - 1):
-                if thresholds[j] < t <= thresholds[j + 1]:
-                    v[j + 1] += 1
-                    break
+    if N < 10:
+        return {"test": "linear_complexity", "error": "insufficient_data", "pass": False}
 
     # Theoretical probabilities
     pi = [0.010417, 0.03125, 0.125, 0.5, 0.25, 0.0625, 0.020833]
@@ -714,6 +1421,7 @@ def linear_complexity_test(bits: List[int], M: int = 500) -> Dict:
         "bin_counts": v,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, K),
         "pass": passed
     }
 
@@ -722,31 +1430,132 @@ def linear_complexity_test(bits: List[int], M: int = 500) -> Dict:
 # Test 11: Serial Test
 # =============================================================================
 
-def serial_test(bits: List[int], m: int = 3) -> Dict:
+def serial_test(bits: Bits, m: int = 3) -> Dict:
     """
     Test 11: Serial Test (Overlapping m-bit patterns)
 
     Reference: NIST SP 800-22 Section 2.11
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 100:
         return {"test": "serial", "error": "insufficient_data", "pass": False}
 
-    def count_patterns(bit_seq: List[int], pattern_len: int) -> Counter:
-        counts = Counter()
-        extended = bit_seq + bit_seq[:pattern_len - 1]
-        for i in range(len(bit_seq)):
-            pattern = tuple(extended[i:i + pattern_len])
-            counts[pattern] += 1
-        return counts
-
-    def psi_sq(counts: Counter, n: int, m: int) -> float:
-        total = sum(c ** 2 for c in counts.values())
+    counts = pattern_histograms(bits, (m, m - 1, m - 2))
+    return serial_result(n, m, counts)
+
+
+# Longest pattern the histogram engine counts (2^24 bins)
+MAX_PATTERN_BITS = 24
+
+# 32-bit unsigned array typecode used to read windows
+_WINDOW_TYPECODE = next(code for code in "IL" if array(code).itemsize == 4)
+
+
+# Pattern length -> byte translation keeping the top m bits
+_TOP_BITS = {m: bytes(byte >> (8 - m) for byte in range(256)) for m in range(1, 9)}
+
+
+def count_windows(bits: BitSequence, m: int, n_windows: int, counts: Counter) -> None:
+    """
+    Add the m-bit windows starting at positions 0..n_windows-1 to counts.
+
+    Window i is the top m bits of the 32-bit word at byte i >> 3 of the
+    sequence shifted left by i & 7. Each of the 8 bit phases and 4 byte
+    phases is one array reinterpretation plus a C-level shift and count, so
+    no Python code runs per bit; patterns of up to 8 bits are read straight
+    from the shifted bytes. bits must hold n_windows + m - 1 bits.
+    """
+    length = n_windows + m - 1
+    x = bits[:length].to_int()
+    for r in range(min(8, n_windows)):
+        # Bits r.. of the sequence, left-aligned and padded with 4 zero bytes
+        span = length - r
+        n_bytes = (span + 7) // 8 + 4
+        shifted = ((x & ((1 << span) - 1)) << (8 * n_bytes - span)).to_bytes(n_bytes, "big")
+        n_starts = (n_windows - r + 7) // 8  # Windows r, r + 8, r + 16, ...
+        if m <= 8:
+            # Short patterns fit in one byte: no word objects needed
+            windows = shifted[:n_starts].translate(_TOP_BITS[m])
+            if m <= 5:
+                for pattern in range(1 << m):
+                    counts[pattern] += windows.count(pattern)
+            else:
+                counts.update(windows)
+            continue
+        for a in range(min(4, n_starts)):
+            words = array(_WINDOW_TYPECODE)
+            words.frombytes(shifted[a:a + 4 * ((n_starts - a + 3) // 4)])
+            if sys.byteorder == "little":
+                words.byteswap()
+            counts.update(map(rshift, words, repeat(32 - m)))
+
+
+def flat_histogram(counts: Counter, m: int) -> List[int]:
+    """Pattern counts as a flat list of 2^m bins indexed by pattern value."""
+    hist = [0] * (1 << m)
+    for pattern, count in counts.items():
+        hist[pattern] = count
+    return hist
+
+
+def fold_histogram(hist: List[int]) -> List[int]:
+    """
+    Counts of (m-1)-bit patterns from cyclic m-bit pattern counts.
+
+    Every cyclic (m-1)-bit window is the prefix of exactly one cyclic m-bit
+    window, so bin p is the sum of bins 2p and 2p + 1.
+    """
+    return list(map(add, hist[0::2], hist[1::2]))
+
+
+def pattern_histograms(bits: Bits, lengths: Iterable[int]) -> Dict[int, List[int]]:
+    """
+    Cyclic overlapping pattern histograms for every positive length in lengths.
+
+    Only the longest length is counted; shorter ones are folded from it, so
+    m, m-1 and m-2 come out of a single pass over the bits.
+    """
+    bits = as_bit_sequence(bits)
+    lengths = sorted({length for length in lengths if length > 0}, reverse=True)
+    if not lengths:
+        return {}
+    m = lengths[0]
+    if m > MAX_PATTERN_BITS:
+        raise ValueError(f"pattern length {m} exceeds {MAX_PATTERN_BITS} bits")
+
+    # Cyclic extension: the sequence followed by its first m - 1 bits
+    n = len(bits)
+    extended = bits
+    while len(extended) < n + m - 1:
+        extended = extended + bits
+    counts = Counter()
+    count_windows(extended, m, n, counts)
+    return histograms_by_length(counts, lengths)
+
+
+def histograms_by_length(counts: Counter, lengths: Iterable[int]) -> Dict[int, List[int]]:
+    """Flat histograms for every length from cyclic counts of the longest one."""
+    lengths = sorted(lengths)
+    hist = flat_histogram(counts, lengths[-1])
+    out = {}
+    for length in range(lengths[-1], lengths[0] - 1, -1):
+        if length in lengths:
+            out[length] = hist
+        if length > lengths[0]:
+            hist = fold_histogram(hist)
+    return out
+
+
+def serial_result(n: int, m: int, counts: Dict[int, List[int]]) -> Dict:
+    """Serial test result from cyclic pattern histograms keyed by length m, m-1, m-2."""
+    def psi_sq(counts: List[int], n: int, m: int) -> float:
+        total = sum(c ** 2 for c in counts)
         return (2 ** m / n) * total - n
 
-    psi_m = psi_sq(count_patterns(bits, m), n, m)
-    psi_m1 = psi_sq(count_patterns(bits, m - 1), n, m - 1) if m > 1 else 0
-    psi_m2 = psi_sq(count_patterns(bits, m - 2), n, m - 2) if m > 2 else 0
+    psi_m = psi_sq(counts[m], n, m)
+    psi_m1 = psi_sq(counts[m - 1], n, m - 1) if m > 1 else 0
+    psi_m2 = psi_sq(counts[m - 2], n, m - 2) if m > 2 else 0
 
     delta_psi = psi_m - psi_m1
     delta2_psi = psi_m - 2 * psi_m1 + psi_m2
@@ -767,6 +1576,10 @@ def serial_test(bits: List[int], m: int = 3) -> Dict:
         "delta2_psi": delta2_psi,
         "critical_value_1": critical1,
         "critical_value_2": critical2,
+        "p_values": {
+            "delta_psi": chi_squared_p_value(delta_psi, df1),
+            "delta2_psi": chi_squared_p_value(delta2_psi, df2),
+        },
         "pass": passed
     }
 
@@ -775,27 +1588,29 @@ def serial_test(bits: List[int], m: int = 3) -> Dict:
 # Test 12: Approximate Entropy Test
 # =============================================================================
 
-def approximate_entropy_test(bits: List[int], m: int = 4) -> Dict:
+def approximate_entropy_test(bits: Bits, m: int = 4) -> Dict:
     """
     Test 12: Approximate Entropy Test
 
     Reference: NIST SP 800-22 Section 2.12
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 100:
         return {"test": "approximate_entropy", "error": "insufficient_data", "pass": False}
 
+    counts = pattern_histograms(bits, (m, m + 1))
+    return approximate_entropy_result(n, m, counts)
+
+
+def approximate_entropy_result(n: int, m: int, counts: Dict[int, Counter]) -> Dict:
+    """Approximate entropy result from cyclic pattern histograms keyed by length m, m+1."""
     def phi(m_val: int) -> float:
         if m_val == 0:
             return 0
-        extended = bits + bits[:m_val - 1]
-        counts = Counter()
-        for i in range(n):
-            pattern = tuple(extended[i:i + m_val])
-            counts[pattern] += 1
 
         total = 0
-        for c in counts.values():
+        for c in counts[m_val]:
             if c > 0:
                 p = c / n
                 total += p * math.log(p)
@@ -819,6 +1634,7 @@ def approximate_entropy_test(bits: List[int], m: int = 4) -> Dict:
         "apen": apen,
         "chi_squared": chi_sq,
         "critical_value": critical,
+        "p_value": chi_squared_p_value(chi_sq, df),
         "pass": passed
     }
 
@@ -827,29 +1643,29 @@ def approximate_entropy_test(bits: List[int], m: int = 4) -> Dict:
 # Test 13: Cumulative Sums Test
 # =============================================================================
 
-def cumulative_sums_test(bits: List[int]) -> Dict:
+def cumulative_sums_test(bits: Bits) -> Dict:
     """
     Test 13: Cumulative Sums (Cusum) Test
 
     Reference: NIST SP 800-22 Section 2.13
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 100:
         return {"test": "cumulative_sums", "error": "insufficient_data", "pass": False}
 
-    x = [2 * b - 1 for b in bits]
+    s_forward = list(accumulate((2 * b - 1 for b in bits), initial=0))
+    total = s_forward[-1]
 
-    s_forward = [0]
-    for xi in x:
-        s_forward.append(s_forward[-1] + xi)
+    # Backward partial sums are total - (forward prefix), so no second walk
+    z_forward = max(max(s_forward), -min(s_forward))
+    z_backward = max(total - min(s_forward), max(s_forward) - total)
 
-    s_backward = [0]
-    for xi in reversed(x):
-        s_backward.append(s_backward[-1] + xi)
+    return cumulative_sums_result(n, z_forward, z_backward)
 
-    z_forward = max(abs(s) for s in s_forward)
-    z_backward = max(abs(s) for s in s_backward)
 
+def cumulative_sums_result(n: int, z_forward: int, z_backward: int) -> Dict:
+    """Cusum result from the maximum forward and backward excursions."""
     critical = 2.576 * math.sqrt(n)
 
     passed_forward = z_forward < critical
@@ -861,41 +1677,157 @@ def cumulative_sums_test(bits: List[int]) -> Dict:
         "max_excursion_forward": z_forward,
         "max_excursion_backward": z_backward,
         "critical_value": critical,
+        "p_values": {
+            "forward": cumulative_sums_p_value(n, z_forward),
+            "backward": cumulative_sums_p_value(n, z_backward),
+        },
         "pass_forward": passed_forward,
         "pass_backward": passed_backward,
         "pass": passed_forward and passed_backward
     }
 
 
+# Excursion engine: states -EXCURSION_STATES..EXCURSION_STATES (both tests)
+EXCURSION_STATES = 9
+
+# Unpacked 0/1 byte -> signed ±1 step
+_PLUS_MINUS_ONE = bytes.maketrans(b"\x00\x01", b"\xff\x01")
+
+
+def excursion_visits(bits: Bits, max_state: int = EXCURSION_STATES) -> Dict:
+    """
+    One sweep of the ±1 random walk shared by both random excursion tests.
+
+    The walk S (with S_0 = 0) is one C-level accumulate over ±1 steps,
+    cycles are cut at its zeros with array index scans, and every cycle is
+    counted once with a Counter. The cost is linear in n and does not
+    depend on the number of states.
+
+    Returns a dict with:
+        n_cycles:     J, the number of zeros of S after S_0
+        cycle_visits: state -> Counter(k -> cycles visiting the state k times)
+        total_visits: state -> visits over the whole walk
+    for every state 0 < |x| <= max_state.
+    """
+    return merge_excursion_sweeps([excursion_sweep(bits, max_state=max_state)], max_state)
+
+
+def excursion_sweep(bits: Bits, first: int = 0, last: Optional[int] = None,
+                    max_state: int = EXCURSION_STATES) -> Dict:
+    """
+    Partial sweep over the walk positions S_first..S_(last-1), last <= n + 1.
+
+    S_first is recovered from the ones count of the preceding bits, so any
+    range can be swept on its own. Returns the state visits before the
+    first zero in the range ("head", the end of a cycle begun earlier),
+    the complete cycles between zeros in the range, the visits from the
+    last zero on ("tail", a cycle still open at the end of the range, None
+    if the range has no zero) and the total visits of the range.
+    merge_excursion_sweeps joins consecutive ranges exactly.
+    """
+    bits = as_bit_sequence(bits)
+    if last is None:
+        last = len(bits) + 1
+    level = 2 * bits[:first].count() - first
+    steps = array("b", bits[first:last - 1].unpack().translate(_PLUS_MINUS_ONE))
+    S = array("q", accumulate(steps, initial=level))
+
+    states = [x for x in range(-max_state, max_state + 1) if x]
+    cycle_visits = {x: Counter() for x in states}
+    visits = Counter(S)
+    total_visits = {x: visits[x] for x in states}
+
+    try:
+        start = S.index(0)
+    except ValueError:
+        start = len(S)
+    visits = Counter(S[:start])
+    head = {x: visits[x] for x in states}
+    tail = None
+
+    J = 0
+    while start < len(S):
+        try:
+            end = S.index(0, start + 1)
+        except ValueError:
+            end = len(S)
+        visits = Counter(S[start:end])
+        if end == len(S):
+            tail = {x: visits[x] for x in states}
+            break
+        for x in states:
+            cycle_visits[x][visits[x]] += 1
+        J += 1
+        start = end
+
+    return {
+        "head": head,
+        "n_cycles": J,
+        "cycle_visits": cycle_visits,
+        "tail": tail,
+        "total_visits": total_visits,
+    }
+
+
+def merge_excursion_sweeps(parts: Sequence[Dict], max_state: int = EXCURSION_STATES) -> Dict:
+    """
+    excursion_visits() result from consecutive excursion_sweep parts that
+    cover S_0..S_n. A cycle open at the end of one part continues into the
+    next and closes at that part's first zero; the cycle still open after
+    the last part (S_n != 0) counts towards the total visits only.
+    """
+    states = [x for x in range(-max_state, max_state + 1) if x]
+    cycle_visits = {x: Counter() for x in states}
+    total_visits = Counter()
+    J = 0
+    open_cycle = None  # Visits of the cycle in progress (none before S_0)
+    for part in parts:
+        total_visits.update(part["total_visits"])
+        if open_cycle is not None:
+            open_cycle.update(part["head"])
+        if part["tail"] is None:
+            continue  # No zero in this part: the open cycle goes on
+        if open_cycle is not None:
+            for x in states:
+                cycle_visits[x][open_cycle[x]] += 1
+            J += 1
+        for x in states:
+            cycle_visits[x].update(part["cycle_visits"][x])
+        J += part["n_cycles"]
+        open_cycle = Counter(part["tail"])
+
+    return {
+        "n_cycles": J,
+        "cycle_visits": cycle_visits,
+        "total_visits": {x: total_visits[x] for x in states},
+    }
+
+
 # =============================================================================
 # Test 14: Random Excursions Test
 # =============================================================================
 
-def random_excursions_test(bits: List[int]) -> Dict:
+def random_excursions_test(bits: Bits, visits: Optional[Dict] = None) -> Dict:
     """
     Test 14: Random Excursions Test
 
     Tests the number of cycles having exactly K visits in a random walk.
     Reference: NIST SP 800-22 Section 2.14
+
+    visits may pass in an excursion_visits() result shared with Test 15.
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 1000:
         return {"test": "random_excursions", "error": "insufficient_data", "pass": False}
 
-    # Convert to +1/-1 and compute cumulative sum
-    x = [2 * b - 1 for b in bits]
-    S = [0]
-    for xi in x:
-        S.append(S[-1] + xi)
+    if visits is None:
+        visits = excursion_visits(bits)
+    J = visits["n_cycles"]  # Number of cycles
 
-    # Find zero crossings (cycle boundaries)
-    zero_positions = [i for i in range(len(S)) if S[i] == 0]
-
-    if len(zero_positions) < 2:
+    if J < 1:
         return {"test": "random_excursions", "error": "insufficient_cycles", "pass": False}
 
-    J = len(zero_positions) - 1  # Number of cycles
-
     if J < 500:
         # Per NIST SP 800-22, test is not applicable when J < 500
         return {"test": "random_excursions", "status": "not_applicable", "J": J, "pass": True}
@@ -918,21 +1850,10 @@ def random_excursions_test(bits: List[int]) -> Dict:
         abs_state = abs(state)
         pi = pi_table.get(abs_state, pi_table[4])
 
-        # Count visits to state in each cycle
-        visit_counts = []
-        for i in range(J):
-            start = zero_positions[i]
-            end = zero_positions[i + 1]
-            visits = sum(1 for j in range(start, end) if S[j] == state)
-            visit_counts.append(visits)
-
-        # Categorize into bins 0, 1, 2, 3, 4, ≥5
+        # Categorize cycles by visits to state into bins 0, 1, 2, 3, 4, ≥5
         v = [0] * 6
-        for vc in visit_counts:
-            if vc >= 5:
-                v[5] += 1
-            else:
-                v[vc] += 1
+        for vc, cycles in visits["cycle_visits"][state].items():
+            v[min(vc, 5)] += cycles
 
         # Chi-squared
         chi_sq = sum((v[k] - J * pi[k]) ** 2 / (J * pi[k]) for k in range(6) if pi[k] > 0)
@@ -947,6 +1868,7 @@ def random_excursions_test(bits: List[int]) -> Dict:
         results[state] = {
             "chi_squared": chi_sq,
             "critical_value": critical,
+            "p_value": chi_squared_p_value(chi_sq, 5),
             "pass": passed
         }
 
@@ -963,25 +1885,23 @@ def random_excursions_test(bits: List[int]) -> Dict:
 # Test 15: Random Excursions Variant Test
 # =============================================================================
 
-def random_excursions_variant_test(bits: List[int]) -> Dict:
+def random_excursions_variant_test(bits: Bits, visits: Optional[Dict] = None) -> Dict:
     """
     Test 15: Random Excursions Variant Test
 
     Tests the total number of times a particular state is visited.
     Reference: NIST SP 800-22 Section 2.15
+
+    visits may pass in an excursion_visits() result shared with Test 14.
     """
+    bits = as_bit_sequence(bits)
     n = len(bits)
     if n < 1000:
         return {"test": "random_excursions_variant", "error": "insufficient_data", "pass": False}
 
-    # Convert to +1/-1 and compute cumulative sum
-    x = [2 * b - 1 for b in bits]
-    S = [0]
-    for xi in x:
-        S.append(S[-1] + xi)
-
-    # Count zero crossings
-    J = sum(1 for i in range(1, len(S)) if S[i] == 0)
+    if visits is None:
+        visits = excursion_visits(bits)
+    J = visits["n_cycles"]  # Zero crossings
 
     if J < 500:
         # Per NIST SP 800-22, test is not applicable when J < 500
@@ -994,8 +1914,8 @@ def random_excursions_variant_test(bits: List[int]) -> Dict:
     all_pass = True
 
     for state in states:
-        # Count total visits to state
-        xi = sum(1 for s in S if s == state)
+        # Total visits to state
+        xi = visits["total_visits"][state]
 
         # z-statistic
         # Under null, xi ~ N(J, sqrt(2J(2|x|-1)))
@@ -1017,6 +1937,7 @@ def random_excursions_variant_test(bits: List[int]) -> Dict:
             "visits": xi,
             "expected": expected,
             "z_statistic": z,
+            "p_value": normal_p_value(z),
             "pass": passed
         }
 
@@ -1033,91 +1954,173 @@ def random_excursions_variant_test(bits: List[int]) -> Dict:
 # Main Test Runner
 # =============================================================================
 
-def run_all_tests(n_bits: int = 1000000, modulus: int = 256) -> Dict:
-    """Run all 15 NIST SP 800-22 tests on shadow entropy."""
+# Suite order and parameters: (name, test function, keyword arguments)
+NIST_SUITE = [
+    ("01. Frequency (Monobit)", frequency_test, {}),
+    ("02. Block Frequency", block_frequency_test, {"block_size": 128}),
+    ("03. Runs", runs_test, {}),
+    ("04. Longest Run", longest_run_test, {}),
+    ("05. Binary Matrix Rank", binary_matrix_rank_test, {"M": 32, "Q": 32}),
+    ("06. DFT Spectral", dft_spectral_test, {}),
+    ("07. Non-overlapping Template", non_overlapping_templates_test, {"m": 9}),
+    ("08. Overlapping Template", overlapping_template_test, {"m": 9}),
+    ("09. Maurer's Universal", maurers_universal_test, {"L": 7, "Q": 1280}),
+    ("10. Linear Complexity", linear_complexity_test, {"M": 500}),
+    ("11. Serial", serial_test, {"m": 3}),
+    ("12. Approximate Entropy", approximate_entropy_test, {"m": 4}),
+    ("13. Cumulative Sums", cumulative_sums_test, {}),
+    ("14. Random Excursions", random_excursions_test, {}),
+    ("15. Random Excursions Variant", random_excursions_variant_test, {}),
+]
+
+# Tests that read the excursion_visits() sweep, passed in as `visits`
+EXCURSION_TESTS = (random_excursions_test, random_excursions_variant_test)
+
+
+def run_suite_test(test_fn, bits: Bits, kwargs: Dict, shared: Dict) -> Dict:
+    """
+    Run one NIST_SUITE test function on bits.
+
+    shared holds work reused by several tests of the same bits: the random
+    walk sweep is made by whichever excursion test runs first and handed
+    to the other, so Tests 14 and 15 cost one pass together.
+    """
+    if test_fn in EXCURSION_TESTS:
+        if "visits" not in shared:
+            shared["visits"] = excursion_visits(bits)
+        kwargs = {**kwargs, "visits": shared["visits"]}
+    return test_fn(bits, **kwargs)
+
+
+def report_test_result(name: str, result: Dict, results: Dict) -> None:
+    """Append one test result to the run summary and print its key metric."""
+    print(f"\n{name}...", end=" ", flush=True)
+    results["tests"].append(result)
+
+    passed = result.get("pass", False)
+    if not passed:
+        results["overall_pass"] = False
+
+    if "error" in result and result.get("test") == name:
+        print(f"ERROR: {result['error']}")
+        return
+
+    status = "PASS" if passed else "FAIL"
+    print(status)
+
+    # Print key metric
+    if "chi_squared" in result:
+        print(f"    Chi²: {result['chi_squared']:.4f} (crit: {result.get('critical_value', 'N/A')})")
+    elif "z_statistic" in result:
+        print(f"    Z: {result['z_statistic']:.4f}")
+    elif "d_statistic" in result:
+        print(f"    D: {result['d_statistic']:.4f}")
+    elif "n_templates" in result:
+        print(f"    Templates passed: {result['n_passed']}/{result['n_templates']}")
+
+
+def run_suite(bits: Bits, results: Dict) -> Dict:
+    """Run every NIST_SUITE test on bits, reporting into results["tests"]."""
+    shared: Dict = {}
+    for name, test_fn, kwargs in NIST_SUITE:
+        try:
+            result = run_suite_test(test_fn, bits, kwargs, shared)
+        except Exception as e:
+            result = {"test": name, "error": str(e), "pass": False}
+        report_test_result(name, result, results)
+    return results
+
+
+def stream_description(modulus: int, n_bits: int, seed: Optional[int] = None) -> Dict:
+    """Result store description of one generate_shadow_bits stream."""
+    return {
+        "generator": "generate_shadow_bits",
+        "source": code_fingerprint(generate_shadow_bits),
+        "modulus": modulus,
+        "n_bits": n_bits,
+        "seed": seed
+    }
+
+
+def suite_test_description(stream: Dict, name: str, test_fn, kwargs: Dict) -> Dict:
+    """Result store description of one suite test run on a stream."""
+    return {"stream": stream, "test": name, "source": code_fingerprint(test_fn), "params": kwargs}
+
+
+def run_all_tests(n_bits: int = 1000000, modulus: int = 256,
+                  store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """
+    Run all 15 NIST SP 800-22 tests on shadow entropy.
+
+    With a seed the bits are the reproducible DRBG stream of that seed;
+    without one they come from OS randomness. With a result store and a
+    seed, the stream is identified by (generator, modulus, n_bits, seed)
+    and every test already computed on it is replayed; bits are only
+    generated if some test is missing. Unseeded runs bypass the store.
+    """
 
     print("=" * 70)
     print(f"Shadow Entropy NIST SP 800-22 Complete Test Suite (C003)")
     print(f"Generating {n_bits:,} bits from modulus {modulus}")
     print("=" * 70)
 
-    bits = generate_shadow_bits(modulus, n_bits)
+    if seed is None:
+        store = None  # Fresh OS randomness every run: nothing to replay
+    stream = stream_description(modulus, n_bits, seed)
+    bits = None
+
+    def stream_bits() -> BitSequence:
+        nonlocal bits
+        if bits is None:
+            bits = generate_shadow_bits(modulus, n_bits, seed)
+        return bits
 
     results = {
         "node_id": "C003",
         "title": "NIST SP 800-22 Complete Statistical Tests",
         "n_bits": n_bits,
         "modulus": modulus,
+        "seed": seed,
         "tests": [],
         "overall_pass": True
     }
 
-    tests = [
-        ("01. Frequency (Monobit)", lambda: frequency_test(bits)),
-        ("02. Block Frequency", lambda: block_frequency_test(bits, 128)),
-        ("03. Runs", lambda: runs_test(bits)),
-        ("04. Longest Run", lambda: longest_run_test(bits)),
-        ("05. Binary Matrix Rank", lambda: binary_matrix_rank_test(bits, 32, 32)),
-        ("06. DFT Spectral", lambda: dft_spectral_test(bits)),
-        ("07. Non-overlapping Template", lambda: non_overlapping_template_test(bits)),
-        ("08. Overlapping Template", lambda: overlapping_template_test(bits, 9)),
-        ("09. Maurer's Universal", lambda: maurers_universal_test(bits, 7, 1280)),
-        ("10. Linear Complexity", lambda: linear_complexity_test(bits, 500)),
-        ("11. Serial", lambda: serial_test(bits, 3)),
-        ("12. Approximate Entropy", lambda: approximate_entropy_test(bits, 4)),
-        ("13. Cumulative Sums", lambda: cumulative_sums_test(bits)),
-        ("14. Random Excursions", lambda: random_excursions_test(bits)),
-        ("15. Random Excursions Variant", lambda: random_excursions_variant_test(bits)),
-    ]
-
-    for name, test_fn in tests:
-        print(f"\n{name}...", end=" ", flush=True)
+    shared: Dict = {}
+    for name, test_fn, kwargs in NIST_SUITE:
         try:
-            result = test_fn()
-            results["tests"].append(result)
-
-            passed = result.get("pass", False)
-            if not passed:
-                results["overall_pass"] = False
-
-            status = "PASS" if passed else "FAIL"
-            print(status)
-
-            # Print key metric
-            if "chi_squared" in result:
-                print(f"    Chi²: {result['chi_squared']:.4f} (crit: {result.get('critical_value', 'N/A')})")
-            elif "z_statistic" in result:
-                print(f"    Z: {result['z_statistic']:.4f}")
-            elif "d_statistic" in result:
-                print(f"    D: {result['d_statistic']:.4f}")
-
+            if store is None:
+                result = run_suite_test(test_fn, stream_bits(), kwargs, shared)
+            else:
+                result = store.cached(suite_test_description(stream, name, test_fn, kwargs),
+                                      lambda: run_suite_test(test_fn, stream_bits(), kwargs, shared))
         except Exception as e:
-            print(f"ERROR: {e}")
-            results["tests"].append({"test": name, "error": str(e), "pass": False})
-            results["overall_pass"] = False
+            result = {"test": name, "error": str(e), "pass": False}
+        report_test_result(name, result, results)
 
     return results
 
 
 def main():
     """Main entry point."""
-    # NOTE: Shadow entropy quality depends on modulus size
-    # - Smaller moduli (256): ~7 bits/shadow, marginal for some tests
-    # - Larger moduli (65536): ~15 bits/shadow, passes all core tests
-    # - Production moduli (2^64): ~63 bits/shadow, excellent quality
+    # NOTE: Mixed-radix packing harvests log2(m + 1) bits per shadow
+    # - Smaller moduli (256): ~8.006 bits/shadow
+    # - Larger moduli (65536): ~16.00002 bits/shadow
+    # - Production moduli (2^64): ~64 bits/shadow
     #
-    # The 256-modulus tests demonstrate that shadow entropy is REAL
-    # (passes matrix rank, DFT, linear complexity, etc.) but benefits
-    # from larger moduli for statistical tests that need more bits.
+    # The historical truncation (packing="truncate") kept floor(log2(m))
+    # bits and folded quotient m onto 0. That bias of 1/(m + 1) per shadow
+    # is what made the 256-modulus runs marginal on frequency and serial.
     configs = [
         {"n_bits": 1000000, "modulus": 256},
         {"n_bits": 1000000, "modulus": 65536},
     ]
 
     all_results = []
+    store = ResultStore()
+    seed = fresh_seed()
 
     for cfg in configs:
-        results = run_all_tests(**cfg)
+        results = run_all_tests(**cfg, store=store, seed=seed)
         all_results.append(results)
 
     # Summary
@@ -1153,6 +2156,7 @@ def main():
     final_results = {
         "node_id": "C003",
         "title": "NIST SP 800-22 Complete Statistical Tests",
+        "seed": seed,
         "configurations": all_results,
         "overall_pass": core_results_pass,  # Core tests determine pass
         "core_tests_pass": core_results_pass,
@@ -1161,7 +2165,10 @@ def main():
         "tests_total": 15
     }
 
-    output_path = "/home/acid/Projects/hackfate/proofs/tests/C003_results.json"
+    print(f"\nSeed: {seed}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("C003_results.json")
     with open(output_path, "w") as f:
         json.dump(final_results, f, indent=2)
     print(f"\nResults written to: {output_path}")
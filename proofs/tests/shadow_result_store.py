@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Result Store for Shadow Entropy Harnesses
+
+Local on-disk cache of C001/C002/C003 results. Every entry is addressed by
+the SHA-256 of a canonical JSON description of what produced it: generator
+config, seed, n_bits, test name, test parameters and a fingerprint of the
+test code. A rerun looks each (stream, test) pair up first and recomputes
+only the pairs whose description changed.
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Standard library only
+
+CODE FINGERPRINTS: code_fingerprint() hashes the source of a function
+together with every function, class and scalar constant it reaches through
+module globals in this directory. Editing one test (or a helper only it
+uses) therefore invalidates just that test's entries, while shared helpers
+invalidate every test that calls them.
+
+SEEDS: Only seeded runs are stored; their streams are regenerated from
+(seed, offset) by the shadow DRBG. An unseeded run draws on OS randomness,
+and replaying its first result would stop every later run from sampling
+fresh bits, so cached_call bypasses the store when the seed is None. The
+harness main() functions draw a fresh seed per run (fresh_seed), record it
+in their results and cache under it, so any run can be replayed by seed.
+
+LAYOUT: <root>/<first two hex digits>/<key>.json. Writes go to a temporary
+file first and are renamed into place, so an interrupted run never leaves
+a truncated entry. Delete the directory to start over.
+"""
+
+import inspect
+import json
+import os
+import secrets
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+# Bump to invalidate every stored entry (e.g. after a result format change)
+STORE_VERSION = 1
+
+# Bits of a seed drawn by fresh_seed()
+SEED_BITS = 64
+
+# Default store location, next to the harness scripts
+DEFAULT_ROOT = Path(__file__).with_name("results_store")
+
+_HERE = Path(__file__).resolve().parent
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+def canonical_json(obj: Any) -> str:
+    """Deterministic JSON text: sorted keys, no whitespace."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def content_key(parts: Dict) -> str:
+    """SHA-256 hex key of a result description."""
+    text = canonical_json({"store_version": STORE_VERSION, **parts})
+    return sha256(text.encode()).hexdigest()
+
+
+def _is_local(obj: Any) -> bool:
+    """Defined in a module of this directory (not stdlib or site-packages)."""
+    try:
+        return Path(inspect.getfile(obj)).resolve().parent == _HERE
+    except TypeError:
+        return False
+
+
+def _code_names(code: CodeType) -> Iterator[str]:
+    """Global names referenced by a code object and its nested functions."""
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _code_names(const)
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint(fn: Callable) -> str:
+    """
+    Hash of fn's source and of every local function, class and constant it
+    depends on through module globals.
+    """
+    digest = sha256()
+    seen = set()
+    pending = [fn]
+    while pending:
+        obj = pending.pop()
+        if obj in seen:
+            continue
+        seen.add(obj)
+        digest.update(f"{obj.__qualname__}\n".encode())
+        try:
+            digest.update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):
+            pass
+
+        if isinstance(obj, type):
+            functions = [f for f in vars(obj).values() if isinstance(f, FunctionType)]
+        else:
+            functions = [obj]
+        for f in functions:
+            for name in sorted(set(_code_names(f.__code__))):
+                value = f.__globals__.get(name)
+                if isinstance(value, (FunctionType, type)) and _is_local(value):
+                    pending.append(value)
+                elif isinstance(value, (bool, int, float, str)):
+                    digest.update(f"{name}={value!r}\n".encode())
+    return digest.hexdigest()
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class ResultStore:
+    """
+    Directory of JSON results addressed by content key.
+
+    hits and misses count cached() lookups, so a harness can report how
+    much of a run was replayed.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_ROOT):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored result for key, or None if absent or unreadable."""
+        try:
+            return json.loads(self._path(key, ".json").read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key: str, result: Dict) -> None:
+        """Store a JSON-serializable result under key."""
+        self._write(self._path(key, ".json"), json.dumps(result, indent=2).encode())
+
+    def cached(self, parts: Dict, compute: Callable[[], Dict]) -> Dict:
+        """
+        Result described by parts: replayed from the store, or computed and
+        stored.
+
+        Results are returned as their JSON round trip either way (e.g. int
+        dict keys become strings), so hits and misses look identical.
+        Exceptions from compute propagate and nothing is stored.
+        """
+        key = content_key(parts)
+        result = self.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = json.loads(json.dumps(compute()))
+        self.put(key, result)
+        return result
+
+    def summary(self) -> str:
+        """One-line hit/miss report."""
+        return f"Result store {self.root}: {self.hits} cached, {self.misses} computed"
+
+
+def fresh_seed() -> int:
+    """New random DRBG seed, so a run samples fresh bits yet stays replayable."""
+    return secrets.randbits(SEED_BITS)
+
+
+def call_description(fn: Callable[..., Dict], kwargs: Dict, **context) -> Dict:
+    """
+    Result store description of fn(**kwargs): fn's code fingerprint, its
+    parameters and any extra context.
+    """
+    return {"function": fn.__qualname__, "source": code_fingerprint(fn),
+            "params": kwargs, **context}
+
+
+def cached_call(store: Optional[ResultStore], fn: Callable[..., Dict],
+                kwargs: Dict, **context) -> Dict:
+    """
+    fn(**kwargs), through the store when one is given and the call is
+    seeded (an unseeded call always samples fresh randomness).
+    """
+    if store is None or ("seed" in kwargs and kwargs["seed"] is None):
+        return fn(**kwargs)
+    return store.cached(call_description(fn, kwargs, **context), lambda: fn(**kwargs))
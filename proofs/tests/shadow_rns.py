@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+RNS / K-Elimination Quotient Harvester (C003 source)
+
+Shadow source modelled on production RNS arithmetic: each parameter set is
+a list of NTT-friendly limb primes, operands are vectors of limbs (one
+residue per prime per coefficient), and every limb multiplication a × b
+yields the quotient k = (a × b) // p that ordinary modular reduction
+discards. The low bits of k are the harvested shadow bits.
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
+             Standard library only
+
+PRIMES: The NINE65 prime tables live in the Rust crate, which is not part
+of this repository; only the configuration names and limb counts are
+(README: depth2_128 = 4, depth3_128 = 5, deep_circuit = 8 primes). The
+limbs here are therefore derived deterministically with the same shape:
+the largest primes below 2^54 with p ≡ 1 (mod 2N), N = 4096, matching the
+54-bit modulus and ring degree of qmnf_production_ring (RingDefinitions).
+
+K-ELIMINATION: The quotient is recovered the way the RNS pipeline does it,
+from two residues of X = a × b: the limb residue X mod p and the anchor
+residue X mod 2^64 (the low word of the 64 × 64 product). Since X - (X mod
+p) = k × p exactly and k < p < 2^64,
+
+    k = ((X mod 2^64) - (X mod p)) × p^-1  mod 2^64
+
+so one multiplication by the precomputed inverse replaces the division.
+Every step runs over whole limb vectors at C level.
+"""
+
+import json
+import time
+from array import array
+from itertools import repeat
+from operator import and_, floordiv, mod, mul, sub
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from shadow_bitstream import BitSequence
+from shadow_nist_tests import run_suite
+from shadow_source import ShadowDRBG, uniform_below
+
+# Limb counts of the NINE65 parameter sets (README, Parameter Configurations)
+PARAMETER_SETS = {
+    "depth2_128": 4,
+    "depth3_128": 5,
+    "deep_circuit": 8,
+}
+
+# Limb prime size and ring degree of qmnf_production_ring
+PRIME_BITS = 54
+RING_DEGREE = 4096
+
+# Low quotient bits harvested per limb multiplication
+HARVEST_BITS = 32
+
+# Anchor modulus of the K-Elimination recovery (one machine word)
+_WORD_MASK = (1 << 64) - 1
+
+# Deterministic Miller-Rabin bases for n < 3.3 × 10^24
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+# =============================================================================
+# Limb Primes
+# =============================================================================
+
+def is_prime(n: int) -> bool:
+    """Deterministic Miller-Rabin primality test (exact below 3.3 × 10^24)."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def ntt_primes(count: int, bits: int = PRIME_BITS, degree: int = RING_DEGREE) -> List[int]:
+    """The `count` largest primes below 2^bits with p ≡ 1 (mod 2 × degree), descending."""
+    step = 2 * degree
+    candidate = ((1 << bits) - 1) // step * step + 1
+    primes = []
+    while len(primes) < count:
+        if candidate < step:
+            raise ValueError(f"fewer than {count} NTT primes below 2^{bits}")
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate -= step
+    return primes
+
+
+def parameter_primes(name: str) -> List[int]:
+    """Limb primes of a named parameter set."""
+    if name not in PARAMETER_SETS:
+        raise ValueError(f"unknown parameter set {name!r} (known: {', '.join(PARAMETER_SETS)})")
+    return ntt_primes(PARAMETER_SETS[name])
+
+
+# =============================================================================
+# Quotient Harvest
+# =============================================================================
+
+def k_elimination_quotients(a: Sequence[int], b: Sequence[int], p: int) -> array:
+    """
+    k_i = (a_i × b_i) // p for limb vectors a, b over [0, p), via K-Elimination.
+
+    Only X mod p and the low 64-bit word of X are used, as in the RNS
+    pipeline; p must be odd and below 2^64.
+    """
+    p_inv = pow(p, -1, 1 << 64)
+    products = list(map(mul, a, b))
+    residues = map(mod, products, repeat(p))
+    low_words = map(and_, products, repeat(_WORD_MASK))
+    return array("Q", map(and_, map(mul, map(sub, low_words, residues), repeat(p_inv)),
+                          repeat(_WORD_MASK)))
+
+
+def direct_quotients(a: Sequence[int], b: Sequence[int], p: int) -> array:
+    """Reference k_i = (a_i × b_i) // p by plain division."""
+    return array("Q", map(floordiv, map(mul, a, b), repeat(p)))
+
+
+def limb_operands(primes: Sequence[int], n_coeffs: int, seed: Optional[int] = None,
+                  offset: int = 0) -> List[tuple]:
+    """
+    (a, b) limb vectors of n_coeffs coefficients for every prime.
+
+    With a seed, limb j of a and b are coefficients offset.. of the "a{j}"
+    and "b{j}" substreams of that seed's DRBG; otherwise OS randomness.
+    """
+    operands = []
+    drbg = ShadowDRBG(seed) if seed is not None else None
+    for j, p in enumerate(primes):
+        if drbg is None:
+            operands.append((uniform_below(p, n_coeffs), uniform_below(p, n_coeffs)))
+        else:
+            operands.append((drbg.substream(f"a{j}").uniform_below(p, n_coeffs, offset),
+                             drbg.substream(f"b{j}").uniform_below(p, n_coeffs, offset)))
+    return operands
+
+
+def quotient_fields(primes: Sequence[int], operands: Sequence[tuple],
+                    bits_per_quotient: int = HARVEST_BITS) -> array:
+    """Low bits_per_quotient bits of every limb quotient, limb by limb."""
+    mask = (1 << bits_per_quotient) - 1
+    fields = array("Q")
+    for p, (a, b) in zip(primes, operands):
+        fields.extend(map(and_, k_elimination_quotients(a, b, p), repeat(mask)))
+    return fields
+
+
+def harvest_quotient_bits(primes: Sequence[int], operands: Sequence[tuple],
+                          bits_per_quotient: int = HARVEST_BITS) -> BitSequence:
+    """Harvested quotient fields as bits, each field LSB first as in generate_shadow_bits."""
+    return BitSequence.from_fields(quotient_fields(primes, operands, bits_per_quotient),
+                                   bits_per_quotient, lsb_first=True)
+
+
+def generate_rns_bits(name: str, n_bits: int, bits_per_quotient: int = HARVEST_BITS,
+                      seed: Optional[int] = None, offset: int = 0) -> BitSequence:
+    """
+    n_bits harvested from RNS limb multiplications of parameter set `name`.
+
+    Coefficients are processed in ring-sized batches (RING_DEGREE
+    coefficients × all limbs), each batch emitting all of its limbs before
+    the next; offset counts coefficients.
+    """
+    primes = parameter_primes(name)
+    per_batch = RING_DEGREE * len(primes) * bits_per_quotient
+    n_coeffs = (n_bits + per_batch - 1) // per_batch * RING_DEGREE
+    operands = limb_operands(primes, n_coeffs, seed, offset)
+
+    fields = array("Q")
+    for start in range(0, n_coeffs, RING_DEGREE):
+        batch = [(a[start:start + RING_DEGREE], b[start:start + RING_DEGREE]) for a, b in operands]
+        fields.extend(quotient_fields(primes, batch, bits_per_quotient))
+    return BitSequence.from_fields(fields, bits_per_quotient, lsb_first=True)[:n_bits]
+
+
+# =============================================================================
+# Benchmark and Validation
+# =============================================================================
+
+def benchmark_harvest(name: str, n_coeffs: int = 1 << 18,
+                      bits_per_quotient: int = HARVEST_BITS) -> Dict:
+    """
+    Harvest throughput of one parameter set over n_coeffs coefficients.
+
+    Operand sampling is timed separately: in production the operands are
+    the computation's own data, so quotient recovery plus bit packing is
+    the harvest cost.
+    """
+    primes = parameter_primes(name)
+
+    start = time.perf_counter()
+    operands = limb_operands(primes, n_coeffs)
+    sample_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    quotients = [k_elimination_quotients(a, b, p) for p, (a, b) in zip(primes, operands)]
+    recover_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for p, (a, b) in zip(primes, operands):
+        direct_quotients(a, b, p)
+    division_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bits = harvest_quotient_bits(primes, operands, bits_per_quotient)
+    harvest_seconds = time.perf_counter() - start
+
+    exact = all(q == direct_quotients(a, b, p)
+                for q, p, (a, b) in zip(quotients, primes, operands))
+    n_bits = len(bits)
+    return {
+        "parameter_set": name,
+        "primes": primes,
+        "n_coeffs": n_coeffs,
+        "multiplications": n_coeffs * len(primes),
+        "bits_per_quotient": bits_per_quotient,
+        "n_bits": n_bits,
+        "k_elimination_exact": exact,
+        "recover_mults_per_second": n_coeffs * len(primes) / recover_seconds,
+        "division_mults_per_second": n_coeffs * len(primes) / division_seconds,
+        "harvest_bits_per_second": n_bits / harvest_seconds,
+        "end_to_end_bits_per_second": n_bits / (harvest_seconds + sample_seconds)
+    }
+
+
+def run_rns_tests(name: str, n_bits: int = 1000000, seed: Optional[int] = None) -> Dict:
+    """Run the C003 suite on bits harvested from one parameter set."""
+    print("=" * 70)
+    print(f"RNS Quotient Harvester - {name} ({PARAMETER_SETS[name]} limbs)")
+    print(f"Harvesting {n_bits:,} bits, {HARVEST_BITS} per limb quotient")
+    print("=" * 70)
+
+    bits = generate_rns_bits(name, n_bits, seed=seed)
+    results = {
+        "node_id": "C003",
+        "title": "NIST SP 800-22 on RNS Quotient Harvest",
+        "parameter_set": name,
+        "n_bits": n_bits,
+        "tests": [],
+        "overall_pass": True
+    }
+    return run_suite(bits, results)
+
+
+def main():
+    """Main entry point."""
+    benchmarks = []
+    all_results = []
+    for name in PARAMETER_SETS:
+        bench = benchmark_harvest(name)
+        benchmarks.append(bench)
+        print(f"{name}: {bench['harvest_bits_per_second'] / 1e6:.1f} Mbit/s harvest, "
+              f"{bench['end_to_end_bits_per_second'] / 1e6:.1f} Mbit/s with sampling, "
+              f"K-Elimination exact: {bench['k_elimination_exact']}")
+        all_results.append(run_rns_tests(name))
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - RNS Quotient Harvester")
+    print("=" * 70)
+    for bench, r in zip(benchmarks, all_results):
+        passed_tests = sum(1 for t in r["tests"] if t.get("pass", False))
+        print(f"  {r['parameter_set']:12s}: {passed_tests:2d}/{len(r['tests'])} tests passed, "
+              f"{bench['harvest_bits_per_second'] / 1e6:.1f} Mbit/s")
+
+    final_results = {
+        "node_id": "C003",
+        "title": "RNS Quotient Harvester Validation",
+        "benchmarks": benchmarks,
+        "configurations": all_results,
+        "overall_pass": all(b["k_elimination_exact"] for b in benchmarks) and all(
+            all(t.get("pass", False) for t in r["tests"][:13]) for r in all_results
+        )
+    }
+
+    output_path = Path(__file__).with_name("C003_rns_results.json")
+    with open(output_path, "w") as f:
+        json.dump(final_results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if final_results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Bulk Shadow Source
+
+Batched shadow generation shared by the C001, C002 and C003 harnesses.
+Instead of one `secrets.randbelow` call per sample, OS randomness is read in
+large blocks and rejection-sampled into [0, M) a whole block at a time.
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
+             Standard library only (os.urandom is the CSPRNG behind secrets)
+
+Samples are returned as `array.array` objects of the narrowest unsigned
+type that holds the range, so a million shadows cost a few MB instead of
+tens of MB of Python ints. Ranges wider than 64 bits fall back to lists.
+
+SEEDED STREAMS: ShadowDRBG replaces os.urandom with SHAKE-256 in counter
+mode. The logical stream over [0, bound) is cut into BLOCK_SAMPLES-sample
+blocks, and block j is rejection-sampled from its own XOF output keyed by
+(seed, bound, j). Any sample index is reached by computing one block, so
+workers can generate disjoint slices of one stream, and any run can be
+replayed from its (seed, offset).
+
+PACKING: MixedRadixExtractor turns digits uniform over [0, R) into
+uniform bytes without truncating each digit. Digits accumulate into one
+exact integer uniform over [0, R^k); full-width bit blocks are cut off the
+bottom with exact rejection, and both the quotient left after an accepted
+cut and the remainder after a rejected one stay uniform, so they are kept
+for the next block. Output approaches log2(R) bits per digit.
+"""
+
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import shake_256
+from itertools import repeat
+from operator import and_, floordiv, mod, mul
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+RandBytes = Callable[[int], bytes]
+Samples = Union[array, List[int]]
+
+# Samples drawn per rejection round
+BATCH_SAMPLES = 1 << 18
+
+# Samples per independently keyed DRBG block (the jump-ahead granularity)
+BLOCK_SAMPLES = 1 << 16
+
+# Domain separation prefix for every DRBG input
+_DRBG_DOMAIN = b"hackfate/shadow-drbg/v1"
+
+# Digits joined per mixed-radix step, and the range kept in reserve after
+# each cut (a cut is rejected with probability below 2^-GUARD_BITS)
+RADIX_BLOCK_DIGITS = 4096
+GUARD_BITS = 64
+
+
+def sample_typecode(bound: int) -> Optional[str]:
+    """Narrowest unsigned array typecode holding values in [0, bound), or None."""
+    bits = max(1, (bound - 1).bit_length())
+    for typecode in ("B", "H", "I", "L", "Q"):
+        if array(typecode).itemsize * 8 >= bits:
+            return typecode
+    return None
+
+
+def new_samples(bound: int, values=()) -> Samples:
+    """Container for values in [0, bound): an array when a typecode fits."""
+    typecode = sample_typecode(bound)
+    if typecode is None:
+        return list(values)
+    return array(typecode, values)
+
+
+def _masked_words(bound: int, n: int, randbytes: RandBytes) -> array:
+    """
+    n random words of the sample width, masked to bound's bit length.
+
+    Masking works on byte columns: every word's k-th byte is cleared down to
+    the bits it may hold with one strided translate per column.
+    """
+    typecode = sample_typecode(bound)
+    width = array(typecode).itemsize
+    bits = max(1, (bound - 1).bit_length())
+    raw = bytearray(randbytes(n * width))
+    for k in range(width):
+        keep = min(8, max(0, bits - 8 * k))
+        if keep == 8:
+            continue
+        table = bytes(byte & ((1 << keep) - 1) for byte in range(256))
+        # Byte k (by significance) sits at offset k on little-endian hosts
+        offset = k if sys.byteorder == "little" else width - 1 - k
+        raw[offset::width] = raw[offset::width].translate(table)
+    return array(typecode, raw)
+
+
+def _uniform_below_wide(bound: int, n: int, randbytes: RandBytes) -> List[int]:
+    """Rejection sampling for ranges wider than 64 bits (one int per sample)."""
+    bits = (bound - 1).bit_length()
+    width = (bits + 7) // 8
+    mask = (1 << bits) - 1
+    out: List[int] = []
+    while len(out) < n:
+        need = n - len(out)
+        draw = need + need // 2 + 16
+        raw = randbytes(draw * width)
+        candidates = (int.from_bytes(raw[i:i + width], "little") & mask
+                      for i in range(0, draw * width, width))
+        out.extend(filter(bound.__gt__, candidates))
+    del out[n:]
+    return out
+
+
+def uniform_below(bound: int, n: int, randbytes: RandBytes = os.urandom) -> Samples:
+    """
+    n independent samples uniform over [0, bound).
+
+    Random words are masked to the bit length of bound and values >= bound
+    are rejected, so every accepted sample is exactly uniform. Acceptance is
+    at least 1/2 per word; each round over-draws to cover the rejections.
+    """
+    if bound < 1:
+        raise ValueError("bound must be positive")
+    if n <= 0:
+        return new_samples(bound)
+    if bound == 1:
+        return new_samples(bound, repeat(0, n))
+    if sample_typecode(bound) is None:
+        return _uniform_below_wide(bound, n, randbytes)
+
+    power_of_two = bound & (bound - 1) == 0
+    out = new_samples(bound)
+    while len(out) < n:
+        need = min(n - len(out), BATCH_SAMPLES)
+        draw = need if power_of_two else need + need // 2 + 16
+        words = _masked_words(bound, draw, randbytes)
+        if power_of_two:
+            out.extend(words)
+        else:
+            out.extend(filter(bound.__gt__, words))
+    del out[n:]
+    return out
+
+
+# =============================================================================
+# Seeded Counter-Mode Source
+# =============================================================================
+
+def _length_prefixed(data: bytes) -> bytes:
+    return len(data).to_bytes(8, "big") + data
+
+
+class _XofReader:
+    """Sequential reads from one XOF; the output is extended by doubling."""
+
+    def __init__(self, xof):
+        self._xof = xof
+        self._buf = b""
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        end = self._pos + n
+        if end > len(self._buf):
+            # XOF outputs are prefix-consistent, so a longer digest extends the old one
+            self._buf = self._xof.digest(max(end, 2 * len(self._buf)))
+        out = self._buf[self._pos:end]
+        self._pos = end
+        return out
+
+
+class ShadowDRBG:
+    """
+    Deterministic, seekable uniform source.
+
+    uniform_below(bound, n, offset) returns samples offset..offset+n-1 of
+    the logical stream over [0, bound) named by the seed. Streams for
+    different bounds or substream labels are independent.
+    """
+
+    def __init__(self, seed: Union[int, bytes, str]):
+        if isinstance(seed, int):
+            if seed < 0:
+                raise ValueError("seed must be non-negative")
+            seed = seed.to_bytes(max(1, (seed.bit_length() + 7) // 8), "big")
+        elif isinstance(seed, str):
+            seed = seed.encode()
+        self.seed = bytes(seed)
+
+    def __repr__(self) -> str:
+        return f"ShadowDRBG(seed={self.seed.hex()})"
+
+    def substream(self, label: Union[bytes, str]) -> "ShadowDRBG":
+        """Independent stream derived from this seed and a label."""
+        if isinstance(label, str):
+            label = label.encode()
+        xof = shake_256(_DRBG_DOMAIN + b"/substream" + _length_prefixed(self.seed)
+                        + _length_prefixed(label))
+        return ShadowDRBG(xof.digest(32))
+
+    def block(self, bound: int, index: int) -> Samples:
+        """Samples index × BLOCK_SAMPLES .. (index + 1) × BLOCK_SAMPLES - 1."""
+        xof = shake_256(_DRBG_DOMAIN + _length_prefixed(self.seed)
+                        + _length_prefixed(bound.to_bytes((bound.bit_length() + 7) // 8, "big"))
+                        + index.to_bytes(8, "big"))
+        return uniform_below(bound, BLOCK_SAMPLES, _XofReader(xof).read)
+
+    def uniform_below(self, bound: int, n: int, offset: int = 0) -> Samples:
+        """Samples offset..offset+n-1 of the stream uniform over [0, bound)."""
+        if bound < 1:
+            raise ValueError("bound must be positive")
+        out = new_samples(bound)
+        end = offset + n
+        position = offset
+        while position < end:
+            index, skip = divmod(position, BLOCK_SAMPLES)
+            take = min(BLOCK_SAMPLES - skip, end - position)
+            out.extend(self.block(bound, index)[skip:skip + take])
+            position += take
+        return out
+
+
+def _drbg_slice(seed: bytes, bound: int, n: int, offset: int) -> Samples:
+    return ShadowDRBG(seed).uniform_below(bound, n, offset)
+
+
+def parallel_uniform_below(drbg: ShadowDRBG, bound: int, n: int, offset: int = 0,
+                           workers: Optional[int] = None) -> Samples:
+    """
+    drbg.uniform_below(bound, n, offset), generated as block-aligned slices
+    on a process pool. The result is identical for any worker count.
+    """
+    workers = workers or os.cpu_count() or 1
+    end = offset + n
+    # Blocks touched by [offset, end); inner cuts are block starts clamped into
+    # the range, so the cuts never decrease and the slices tile it exactly
+    first_block = offset // BLOCK_SAMPLES
+    n_blocks = -(-end // BLOCK_SAMPLES) - first_block
+    cuts = [offset] + [min(end, max(offset, (first_block + n_blocks * k // workers) * BLOCK_SAMPLES))
+                       for k in range(1, workers)] + [end]
+    slices = [(a, b) for a, b in zip(cuts, cuts[1:]) if b > a]
+    if len(slices) <= 1:
+        return drbg.uniform_below(bound, n, offset)
+    out = new_samples(bound)
+    with ProcessPoolExecutor(max_workers=len(slices)) as pool:
+        for part in pool.map(_drbg_slice, repeat(drbg.seed), repeat(bound),
+                             [b - a for a, b in slices], [a for a, _ in slices]):
+            out.extend(part)
+    return out
+
+
+def check_parallel_stream(drbg: ShadowDRBG, bound: int, n: int, offset: int = 0,
+                          workers: Optional[int] = None) -> None:
+    """Raise ValueError unless parallel_uniform_below matches the serial stream."""
+    parallel = parallel_uniform_below(drbg, bound, n, offset, workers)
+    serial = drbg.uniform_below(bound, n, offset)
+    if len(parallel) != n or parallel != serial:
+        raise ValueError(f"parallel stream differs from serial (bound={bound}, n={n}, "
+                         f"offset={offset}, workers={workers})")
+
+
+# =============================================================================
+# Mixed-Radix Packing
+# =============================================================================
+
+class MixedRadixExtractor:
+    """
+    Exact, stateful conversion of base-R digits into uniform bytes.
+
+    The state is an integer `value` uniform over [0, bound). feed() appends
+    digits as value = value × R^k + Σ d_i R^i, then cuts w = whole bytes of
+    the range, leaving at least GUARD_BITS bits of bound behind. With
+    c = bound >> w, a value below c × 2^w is accepted: its low w bits are
+    emitted and value >> w (uniform over [0, c)) is kept. Otherwise the
+    value is uniform over the leftover [c × 2^w, bound) and is kept shifted
+    down to [0, bound - c × 2^w).
+    """
+
+    def __init__(self, radix: int, block_digits: int = RADIX_BLOCK_DIGITS):
+        if radix < 2:
+            raise ValueError("radix must be at least 2")
+        self.radix = radix
+        self.block_digits = block_digits
+        self.value = 0
+        self.bound = 1
+        self.digits_in = 0
+        self.bits_out = 0
+        self.rejections = 0
+        # radix^(2^j) for the pairwise join levels
+        self._level_powers = [radix]
+        while 1 << len(self._level_powers) < block_digits:
+            self._level_powers.append(self._level_powers[-1] ** 2)
+
+    def _join(self, digits: Sequence[int]) -> int:
+        """Σ digits[i] × R^i by pairwise merging, as _join_fields does for 2^w."""
+        level = list(digits)
+        for power in self._level_powers:
+            if len(level) <= 1:
+                break
+            if len(level) % 2:
+                level.append(0)
+            level = [lo + hi * power for lo, hi in zip(level[::2], level[1::2])]
+        return level[0] if level else 0
+
+    def feed(self, digits: Sequence[int]) -> bytes:
+        """Absorb digits (each in [0, R)) and return every byte now extractable."""
+        out = []
+        for start in range(0, len(digits), self.block_digits):
+            chunk = digits[start:start + self.block_digits]
+            self.value = self.value * self.radix ** len(chunk) + self._join(chunk)
+            self.bound *= self.radix ** len(chunk)
+            self.digits_in += len(chunk)
+
+            width = (self.bound.bit_length() - 1 - GUARD_BITS) // 8 * 8
+            if width <= 0:
+                continue
+            keep = self.bound >> width
+            limit = keep << width
+            if self.value < limit:
+                out.append((self.value & ((1 << width) - 1)).to_bytes(width // 8, "big"))
+                self.value >>= width
+                self.bound = keep
+                self.bits_out += width
+            else:
+                self.value -= limit
+                self.bound -= limit
+                self.rejections += 1
+        return b"".join(out)
+
+    def bits_per_digit(self) -> float:
+        """Output bits per absorbed digit so far (limit: log2(R))."""
+        return self.bits_out / self.digits_in if self.digits_in else 0.0
+
+
+def draws_for_bits(n_bits: int, radix: int) -> int:
+    """Digits over [0, radix) sufficient for n_bits of mixed-radix output (no rejections)."""
+    per_digit = radix.bit_length() - 1  # floor(log2(radix)) <= log2(radix)
+    return -(-(n_bits + GUARD_BITS + 8) // per_digit) + 1
+
+
+# =============================================================================
+# Shadow Batches
+# =============================================================================
+
+def crt_shadow_batch(m_primary: int, m_shadow: int, n_samples: int,
+                     randbytes: RandBytes = os.urandom,
+                     drbg: Optional[ShadowDRBG] = None, offset: int = 0) -> Tuple[Samples, Samples]:
+    """
+    Sample V uniform over [0, m_p × m_s) and split it at m_shadow.
+
+    Returns (shadows, quotients) with shadows = V mod m_s (uniform over
+    [0, m_s), L003) and quotients = V // m_s (uniform over [0, m_p)).
+    With a drbg, V is samples offset..offset+n_samples-1 of its stream.
+    """
+    if drbg is not None:
+        values = drbg.uniform_below(m_primary * m_shadow, n_samples, offset)
+    else:
+        values = uniform_below(m_primary * m_shadow, n_samples, randbytes)
+    shadows = new_samples(m_shadow, map(mod, values, repeat(m_shadow)))
+    quotients = new_samples(m_primary, map(floordiv, values, repeat(m_shadow)))
+    return shadows, quotients
+
+
+def quotient_shadow_batch(m: int, n_samples: int,
+                          randbytes: RandBytes = os.urandom,
+                          drbg: Optional[ShadowDRBG] = None, offset: int = 0) -> Samples:
+    """
+    Quotient shadows (a × b) // m for a, b uniform over [0, m) (D001).
+
+    Bounded by m - 1 (L002), so they fit the same container as a and b.
+    With a drbg, a and b come from its "a" and "b" substreams at offset.
+    """
+    if drbg is not None:
+        a = drbg.substream("a").uniform_below(m, n_samples, offset)
+        b = drbg.substream("b").uniform_below(m, n_samples, offset)
+    else:
+        a = uniform_below(m, n_samples, randbytes)
+        b = uniform_below(m, n_samples, randbytes)
+    return new_samples(m, map(floordiv, map(mul, a, b), repeat(m)))
+
+
+def shadow_bit_fields(quotients: Sequence[int], bits_per_shadow: int) -> Samples:
+    """Low bits_per_shadow bits of each quotient (the harvested bit field)."""
+    mask = (1 << bits_per_shadow) - 1
+    return new_samples(1 << bits_per_shadow, map(and_, quotients, repeat(mask)))
+
+
+def main():
+    """Check seeded parallel generation against the serial stream."""
+    drbg = ShadowDRBG(1)
+    # (bound, n, offset, workers): unaligned offsets, slices smaller than a
+    # block, and more workers than blocks
+    cases = [
+        (1000, BLOCK_SAMPLES + 10, 5, 3),
+        (1000, 100, 5, 8),
+        (7, 3 * BLOCK_SAMPLES + 1, BLOCK_SAMPLES - 1, 4),
+        (1 << 16, 2 * BLOCK_SAMPLES, BLOCK_SAMPLES, 2),
+        (1 << 40, BLOCK_SAMPLES // 2, 3 * BLOCK_SAMPLES - 7, 6),
+    ]
+    print("=" * 60)
+    print("ShadowDRBG Parallel Slicing Check")
+    print("=" * 60)
+    failures = 0
+    for bound, n, offset, workers in cases:
+        try:
+            check_parallel_stream(drbg, bound, n, offset, workers)
+            status = "PASS"
+        except ValueError:
+            failures += 1
+            status = "FAIL"
+        print(f"  bound={bound}, n={n}, offset={offset}, workers={workers}: {status}")
+    print()
+    print(f"OVERALL: {'PASS' if failures == 0 else 'FAIL'}")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    exit(main())
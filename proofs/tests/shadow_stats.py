@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Exact Integer Statistics for Shadow Entropy Harnesses
+
+Shared integer-only statistics engines for the C001/C002 harnesses.
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
+             Standard library only
+
+AUTOCORRELATION: All lagged cross-sums C_k = Σ x_i x_{i+k} come from one
+exact big-number product (Kronecker substitution). Each sample becomes a
+fixed-width decimal digit slot wide enough that no slot of the product can
+carry. Multiplying the sequence by its reversal then leaves C_k in slot
+n - 1 + k. The `decimal` module (libmpdec) multiplies operands of this size
+with a number-theoretic transform, so all n lags cost O(n log n) and stay
+exact.
+
+MOMENTS: MomentAccumulator keeps exact power sums in one pass and merges
+across chunks and workers, so no statistic needs a second pass.
+
+HISTOGRAMS: ShadowHistogram stores one unsigned 64-bit count per bin in a
+flat array (8 bytes per bin, 128 MiB at 2^24 bins), takes whole sample
+arrays per update and merges shards bin-wise at C level.
+
+GRAM MATRICES: GramAccumulator keeps G_ij = Σ_t x_i(t) x_j(t) for k
+aligned channels. The k values of sample t are packed into one integer
+P_t with one slot per channel, so Σ_t x_i(t) × P_t is the whole row G_i*
+in one C-level multiply-accumulate pass. Slots are sized per update from
+the largest value so that a pass of 2^GRAM_PASS_BITS samples cannot carry
+(6 bytes for 16-bit channels, 10 for 32-bit), and every row stays exact.
+G is symmetric, so rows are grouped by GRAM_GROUP_CHANNELS and each row
+multiplies only against the channels from its group's first one on. The
+cost is still O(k²) digit operations per sample: about 40 µs per sample
+at k = 64 with 16-bit values.
+"""
+
+import sys
+from array import array
+from collections import Counter
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal, localcontext
+from itertools import accumulate, islice, repeat
+from math import isqrt
+from operator import add, mul
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Samples per correlation segment when only the first max_lag lags are needed
+SEGMENT_SAMPLES = 1 << 20
+
+# Largest Gram matrix channel value (exclusive), and log2 of the samples
+# packed per multiply-accumulate pass
+GRAM_VALUE_BITS = 32
+GRAM_PASS_BITS = 16
+
+# Channels per Gram matrix row group: rows of a group multiply only against
+# the packed channels from the group's first channel on (G is symmetric)
+GRAM_GROUP_CHANNELS = 16
+
+# Unbounded exact context for the transform products
+_EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+# =============================================================================
+# Autocorrelation Engine
+# =============================================================================
+
+def _pack_digits(values: Sequence[int], width: int, max_value: int) -> Decimal:
+    """Σ values[i] × 10^(width × (len - 1 - i)): one width-digit slot per value."""
+    if max_value < 1 << 16:
+        table = [format(v, f"0{width}d") for v in range(max_value + 1)]
+        text = "".join(map(table.__getitem__, values))
+    else:
+        text = "".join(map(f"{{:0{width}d}}".format, values))
+    return Decimal(text or "0")
+
+
+def cross_products(a: Sequence[int], b: Sequence[int], max_lag: int) -> List[int]:
+    """
+    Exact D_k = Σ_i a[i] × b[i + k] for k = 0..max_lag (non-negative values).
+
+    A holds a[i] in slot len(a) - 1 - i and B holds b[q] in slot q, so slot
+    len(a) - 1 + k of A × B collects exactly the terms with q - i = k.
+    """
+    la, lb = len(a), len(b)
+    max_lag = min(max_lag, lb - 1)
+    if la == 0 or max_lag < 0:
+        return [0] * (max_lag + 1)
+    max_a, max_b = max(a), max(b)
+    if min(a) < 0 or min(b) < 0:
+        raise ValueError("cross_products requires non-negative values")
+
+    # Widest possible slot: every product term at its maximum
+    width = len(str(min(la, lb) * max_a * max_b))
+    with localcontext(_EXACT):
+        product = _pack_digits(a, width, max_a) * _pack_digits(b[::-1], width, max_b)
+    text = str(product).zfill((la + lb - 1) * width)
+
+    # Slot t is the width digits ending t × width digits from the right
+    total = len(text)
+    out = []
+    for k in range(max_lag + 1):
+        end = total - (la - 1 + k) * width
+        out.append(int(text[end - width:end]))
+    return out
+
+
+def lagged_products(values: Sequence[int], max_lag: Optional[int] = None) -> List[int]:
+    """
+    Exact C_k = Σ_{i=0}^{n-1-k} x_i × x_{i+k} for k = 0..max_lag.
+
+    max_lag defaults to n - 1 (every lag) and is computed with one product.
+    For shorter lag ranges the sequence is cut into SEGMENT_SAMPLES-long
+    segments correlated against themselves plus the next max_lag samples,
+    so memory stays bounded while the cost stays O(n log n).
+    """
+    n = len(values)
+    if max_lag is None:
+        max_lag = n - 1
+    max_lag = min(max_lag, n - 1)
+    if n == 0 or max_lag < 0:
+        return []
+
+    segment = max(SEGMENT_SAMPLES, 4 * (max_lag + 1))
+    if n <= segment:
+        return cross_products(values, values, max_lag)
+
+    sums = [0] * (max_lag + 1)
+    for start in range(0, n, segment):
+        head = values[start:start + segment]
+        tail = values[start:start + segment + max_lag]
+        for k, c in enumerate(cross_products(head, tail, max_lag)):
+            sums[k] += c
+    return sums
+
+
+def head_sums(values: Sequence[int], count: int) -> List[int]:
+    """Prefix sums Σ_{i<k} x_i for k = 0..count."""
+    return list(accumulate(islice(values, count), initial=0))
+
+
+def tail_sums(values: Sequence[int], count: int) -> List[int]:
+    """Suffix sums Σ_{i>=n-k} x_i for k = 0..count."""
+    return list(accumulate(reversed(values[max(0, len(values) - count):]), initial=0))
+
+
+# =============================================================================
+# Moment Accumulator
+# =============================================================================
+
+class MomentAccumulator:
+    """
+    Single-pass, mergeable exact power sums of an integer sequence.
+
+    Keeps the count, Σx, Σx², the lagged cross-sums C_k = Σ x_i x_{i+k}
+    for k = 1..max_lag, and the first and last max_lag values. The boundary
+    values are enough to add every cross-lag pair that straddles two
+    chunks, so merge() of consecutive shards is exact. Mean, variance and
+    autocorrelations come out identical to the two-pass scaled-integer
+    functions of C002.
+    """
+
+    def __init__(self, max_lag: int = 0):
+        self.max_lag = max_lag
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.cross = [0] * max_lag  # cross[k - 1] = C_k
+        self.head: List[int] = []
+        self.tail: List[int] = []
+
+    @classmethod
+    def from_values(cls, values: Sequence[int], max_lag: int = 0) -> "MomentAccumulator":
+        """Accumulator holding one chunk of values."""
+        acc = cls(max_lag)
+        acc.count = len(values)
+        acc.total = sum(values)
+        products = lagged_products(values, max_lag)
+        if products:
+            acc.total_sq = products[0]
+            acc.cross[:len(products) - 1] = products[1:]
+        acc.head = list(values[:max_lag])
+        acc.tail = list(values[max(0, len(values) - max_lag):])
+        return acc
+
+    def update(self, values: Sequence[int]) -> None:
+        """Append the next chunk of the sequence."""
+        self.merge(MomentAccumulator.from_values(values, self.max_lag))
+
+    def merge(self, other: "MomentAccumulator") -> None:
+        """
+        Append a shard that directly follows this one in sequence order.
+
+        Pairs at lag k that straddle the boundary pair the last k values of
+        this shard with the first k of the other, so they are the cross-sums
+        of tail + head minus those inside each part.
+        """
+        if other.max_lag != self.max_lag:
+            raise ValueError("cannot merge accumulators with different max_lag")
+        if self.max_lag and self.count and other.count:
+            joined = lagged_products(self.tail + other.head, self.max_lag)
+            inside_tail = lagged_products(self.tail, self.max_lag)
+            inside_head = lagged_products(other.head, self.max_lag)
+            for k in range(1, len(joined)):
+                straddle = joined[k]
+                if k < len(inside_tail):
+                    straddle -= inside_tail[k]
+                if k < len(inside_head):
+                    straddle -= inside_head[k]
+                self.cross[k - 1] += straddle
+        for k, c in enumerate(other.cross):
+            self.cross[k] += c
+        self.head = (self.head + other.head)[:self.max_lag]
+        tail = self.tail + other.tail
+        self.tail = tail[max(0, len(tail) - self.max_lag):]
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def mean_scaled(self, scale: int = 1000000) -> int:
+        """mean * scale (floor), as compute_mean_integer."""
+        return (self.total * scale) // self.count
+
+    def variance_scaled(self, mean_scaled: int, scale: int = 1000000) -> int:
+        """
+        variance * scale (floor), as compute_variance_integer.
+
+        Σ(x·s - μ)² = s²·Σx² - 2·s·μ·Σx + n·μ² with μ the scaled mean.
+        """
+        n = self.count
+        sum_sq_diff = (scale * scale * self.total_sq - 2 * scale * mean_scaled * self.total
+                       + n * mean_scaled * mean_scaled)
+        return sum_sq_diff // (n * scale)
+
+    def autocorrelations_scaled(self, mean_scaled: int, var_scaled: int,
+                                scale: int = 1000000) -> List[int]:
+        """
+        autocorrelation * scale (floor) for lags 0..max_lag.
+
+        Σ (x_i·s - μ)(x_{i+k}·s - μ)
+            = s²·C_k - s·μ·(Σ_{i<n-k} x_i + Σ_{i>=k} x_i) + (n - k)·μ²
+        """
+        n = self.count
+        max_lag = min(self.max_lag, n - 1)
+        if var_scaled == 0:
+            return [0] * (max_lag + 1)
+
+        products = [self.total_sq] + self.cross
+        heads = head_sums(self.head, max_lag)
+        tails = tail_sums(self.tail, max_lag)
+        autocorrs = []
+        for lag in range(max_lag + 1):
+            pairs = n - lag
+            first = self.total - tails[lag]  # Σ_{i<n-lag} x_i
+            second = self.total - heads[lag]  # Σ_{i>=lag} x_i
+            cov_scaled_sq = (scale * scale * products[lag] - scale * mean_scaled * (first + second)
+                             + pairs * mean_scaled * mean_scaled)
+            autocorrs.append(cov_scaled_sq // (pairs * var_scaled))
+        return autocorrs
+
+
+# =============================================================================
+# Shardable Histogram
+# =============================================================================
+
+class ShadowHistogram:
+    """
+    Flat-array histogram over bins [0, n_bins).
+
+    add() counts a whole sample array at once (bincount-style, via the C
+    counting loop of Counter), merge() sums shards bin by bin, and the
+    chi-squared and deviation reductions run over the array without a
+    per-bin Python loop, so 2^24 bins and 10^9 samples stay practical.
+    """
+
+    def __init__(self, n_bins: int):
+        self.n_bins = n_bins
+        self.counts = array("Q", [0]) * n_bins
+        self.total = 0
+
+    def add(self, values: Sequence[int]) -> None:
+        """Count every value of a sample array."""
+        tally = Counter(values)
+        if tally and (min(tally) < 0 or max(tally) >= self.n_bins):
+            raise ValueError(f"sample outside [0, {self.n_bins})")
+        counts = self.counts
+        for value, count in tally.items():
+            counts[value] += count
+        self.total += len(values)
+
+    def merge(self, other: "ShadowHistogram") -> None:
+        """Add another shard's counts into this histogram."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("cannot merge histograms with different bin counts")
+        self.counts = array("Q", map(add, self.counts, other.counts))
+        self.total += other.total
+
+    def sum_squared_deviation(self, expected: int) -> int:
+        """
+        Exact Σ (obs - expected)² over all bins.
+
+        Expanded as Σobs² - 2·expected·Σobs + n_bins·expected².
+        """
+        sum_sq = sum(map(mul, self.counts, self.counts))
+        return sum_sq - 2 * expected * self.total + self.n_bins * expected * expected
+
+    def deviation_summary(self, expected: int, threshold: int) -> Tuple[int, int]:
+        """
+        (bins with |obs - expected| > threshold, max |obs - expected|).
+
+        Bins are grouped by occupancy first, so the scan only visits the few
+        distinct occupancy values.
+        """
+        occupancy = Counter(self.counts)
+        outside = sum(bins for obs, bins in occupancy.items() if abs(obs - expected) > threshold)
+        max_deviation = max(abs(obs - expected) for obs in occupancy)
+        return outside, max_deviation
+
+
+# =============================================================================
+# Gram Matrix Accumulator
+# =============================================================================
+
+class GramAccumulator:
+    """
+    Single-pass, mergeable exact moments of k aligned integer channels.
+
+    Keeps the sample count, the channel totals Σx_i and the Gram matrix
+    G_ij = Σ x_i x_j (diagonal: Σx_i²). Shards of the same channels merge by
+    plain addition, in any order. Values must lie in [0, 2^GRAM_VALUE_BITS).
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.count = 0
+        self.totals = [0] * k
+        self.gram = [[0] * k for _ in range(k)]
+
+    def update(self, columns: Sequence[Sequence[int]]) -> None:
+        """Add the next samples: columns[i] holds channel i, all of equal length."""
+        if len(columns) != self.k:
+            raise ValueError(f"expected {self.k} channels, got {len(columns)}")
+        n = len(columns[0])
+        if any(len(column) != n for column in columns):
+            raise ValueError("channel columns are not aligned")
+        if n == 0:
+            return
+        max_value = max(max(column) for column in columns)
+        if min(min(column) for column in columns) < 0 or max_value >> GRAM_VALUE_BITS:
+            raise ValueError(f"channel value outside [0, 2^{GRAM_VALUE_BITS})")
+
+        # Bytes per slot such that a pass sum of products cannot carry
+        slot = (2 * max_value.bit_length() + GRAM_PASS_BITS + 7) // 8
+        k = self.k
+        groups = max(1, k // GRAM_GROUP_CHANNELS)
+        firsts = [k * g // groups for g in range(groups)]
+        group_first = [max(f for f in firsts if f <= i) for i in range(k)]
+        gram = self.gram
+        for start in range(0, n, 1 << GRAM_PASS_BITS):
+            part = [array("Q", column[start:start + (1 << GRAM_PASS_BITS)]) for column in columns]
+            packed = self._pack_samples(part, slot, firsts)
+            for i, column in enumerate(part):
+                # Row i against channels group_first[i]..k-1; the rest mirrors earlier rows
+                first = group_first[i]
+                row = sum(map(mul, column, packed[first])).to_bytes(slot * (k - first), "little")
+                for j in range(i, k):
+                    offset = slot * (j - first)
+                    value = int.from_bytes(row[offset:offset + slot], "little")
+                    gram[i][j] += value
+                    if j != i:
+                        gram[j][i] += value
+
+        self.count += n
+        self.totals = [t + sum(column) for t, column in zip(self.totals, columns)]
+
+    def _pack_samples(self, columns: Sequence[array], slot: int,
+                      firsts: Sequence[int]) -> Dict[int, List[int]]:
+        """
+        {f: [P_t >> (8 slot f) for every sample t of the pass]} for each
+        first channel f, with P_t = Σ_i x_i(t) × 2^(8 slot i).
+        """
+        width = slot * self.k
+        interleaved = bytearray(width * len(columns[0]))
+        for i, column in enumerate(columns):
+            if sys.byteorder == "big":
+                column = array("Q", column)
+                column.byteswap()
+            data = column.tobytes()
+            # Low min(slot, 8) bytes of each little-endian value; the rest stay 0
+            for b in range(min(slot, 8)):
+                interleaved[i * slot + b::width] = data[b::8]
+        data = memoryview(interleaved)
+        return {first: list(map(int.from_bytes,
+                                (data[s + slot * first:s + width] for s in range(0, len(data), width)),
+                                repeat("little")))
+                for first in firsts}
+
+    def merge(self, other: "GramAccumulator") -> None:
+        """Add another shard of the same k channels."""
+        if other.k != self.k:
+            raise ValueError("cannot merge accumulators with different channel counts")
+        self.count += other.count
+        self.totals = list(map(add, self.totals, other.totals))
+        self.gram = [list(map(add, a, b)) for a, b in zip(self.gram, other.gram)]
+
+    def covariance_sums(self) -> List[List[int]]:
+        """n² × Cov(x_i, x_j) exactly: n × G_ij - Σx_i × Σx_j."""
+        n = self.count
+        return [[n * g - s_i * s_j for g, s_j in zip(row, self.totals)]
+                for row, s_i in zip(self.gram, self.totals)]
+
+    def correlations_scaled(self, scale: int = 1000000) -> List[List[int]]:
+        """
+        Pearson correlation * scale (floor) of every channel pair.
+
+        r_ij = c_ij / sqrt(c_ii × c_jj) over the exact covariance sums;
+        channels with zero variance get correlation 0.
+        """
+        cov = self.covariance_sums()
+        scaled = []
+        for i, row in enumerate(cov):
+            denominators = [isqrt(cov[i][i] * cov[j][j]) for j in range(self.k)]
+            scaled.append([(c * scale) // d if d else 0 for c, d in zip(row, denominators)])
+        return scaled
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Shadow Entropy Parameter Sweep (C001/C002/C003)
+
+Expands a grid of moduli (2^8 .. 2^64), stream lengths, seeds and test
+parameters into independent jobs and runs them on one process pool:
+
+- C003: one job per (stream, NIST test, parameter variant)
+- C002: one autocorrelation job per (modulus, seed)
+- C001: one CRT histogram job per (modulus, seed), where the bins still
+  get at least MIN_EXPECTED_PER_BIN samples each
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+Usage: python shadow_sweep.py [grid.json]
+       (a grid file overrides any subset of DEFAULT_GRID)
+
+SCHEDULING: Jobs are submitted largest estimated cost first, so the long
+tail of small jobs fills the pool while the big ones run. Streams are
+seeded, so every worker regenerates exactly the bits its job refers to.
+
+CHECKPOINTS: Each worker writes its result to the ResultStore as soon as
+the job finishes, under the same key the harness main() functions use.
+A restarted sweep expands the same grid, drops every job whose key is
+already stored and schedules only the rest, so an interrupted run resumes
+where it stopped. Failed jobs are not stored and are retried on resume.
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from shadow_bitstream import BitSequence
+from shadow_independence_test import test_autocorrelation
+from shadow_nist_parallel import TASK_WEIGHTS
+from shadow_nist_tests import (
+    NIST_SUITE,
+    generate_shadow_bits,
+    run_suite_test,
+    stream_description,
+    suite_test_description,
+)
+from shadow_result_store import ResultStore, call_description, content_key
+from shadow_uniform_test import test_crt_uniform
+
+DEFAULT_GRID = {
+    "moduli": [1 << k for k in range(8, 65, 8)],
+    "n_bits": [1000000],
+    "seeds": [0],
+    # Suite test name -> list of keyword-argument variants (default: suite parameters)
+    "c003_params": {},
+    "c002": {"n_samples": 100000, "max_lag": 50, "threshold": 0.01},
+    "c001_n_samples": [1000000],
+}
+
+# C001 jobs need at least this many expected samples per bin
+MIN_EXPECTED_PER_BIN = 5
+
+# Relative cost per sample of the C001/C002 jobs, in C003 cost units per bit
+C001_COST_PER_SAMPLE = 4
+C002_COST_PER_SAMPLE = 20
+
+# Worker-side cache of the most recent C003 stream and the work its tests share
+_worker_stream: Tuple[Optional[str], Optional[BitSequence], Dict] = (None, None, {})
+
+
+# =============================================================================
+# Grid Expansion
+# =============================================================================
+
+def expand_grid(grid: Dict) -> List[Dict]:
+    """
+    Every job of the grid, with its store key and estimated cost.
+
+    A job is a dict: harness, label (human-readable parameters), params
+    (what the worker needs), key and cost.
+    """
+    grid = {**DEFAULT_GRID, **grid}
+    jobs = []
+    for modulus in grid["moduli"]:
+        for seed in grid["seeds"]:
+            for n_bits in grid["n_bits"]:
+                stream = stream_description(modulus, n_bits, seed)
+                for index, (name, test_fn, kwargs) in enumerate(NIST_SUITE):
+                    for variant in grid["c003_params"].get(name, [kwargs]):
+                        jobs.append({
+                            "harness": "C003",
+                            "label": {"test": name, "modulus": modulus, "n_bits": n_bits,
+                                      "seed": seed, "params": variant},
+                            "params": {"index": index, "modulus": modulus, "n_bits": n_bits,
+                                       "seed": seed, "kwargs": variant},
+                            "key": content_key(suite_test_description(stream, name, test_fn, variant)),
+                            "cost": n_bits * TASK_WEIGHTS.get(test_fn, 1)
+                        })
+
+            c002 = grid["c002"]
+            if c002:
+                kwargs = {"m": modulus, "n_samples": c002["n_samples"], "max_lag": c002["max_lag"],
+                          "threshold_scaled": int(c002["threshold"] * 1000000), "seed": seed}
+                jobs.append({
+                    "harness": "C002",
+                    "label": {"test": "autocorrelation", "modulus": modulus, "seed": seed,
+                              "n_samples": c002["n_samples"], "max_lag": c002["max_lag"]},
+                    "params": kwargs,
+                    "key": content_key(call_description(test_autocorrelation, kwargs)),
+                    "cost": c002["n_samples"] * C002_COST_PER_SAMPLE
+                })
+
+            for n_samples in grid["c001_n_samples"]:
+                if modulus * MIN_EXPECTED_PER_BIN > n_samples:
+                    continue
+                kwargs = {"m_shadow": modulus, "n_samples": n_samples, "seed": seed}
+                jobs.append({
+                    "harness": "C001",
+                    "label": {"test": "crt_uniform", "modulus": modulus, "seed": seed,
+                              "n_samples": n_samples},
+                    "params": kwargs,
+                    "key": content_key(call_description(test_crt_uniform, kwargs)),
+                    "cost": n_samples * C001_COST_PER_SAMPLE
+                })
+    return jobs
+
+
+# =============================================================================
+# Worker Side
+# =============================================================================
+
+def _stream_bits(modulus: int, n_bits: int, seed: int) -> Tuple[BitSequence, Dict]:
+    """
+    Seeded C003 stream and its run_suite_test shared work, reused across
+    consecutive jobs on the same stream.
+    """
+    global _worker_stream
+    key = content_key(stream_description(modulus, n_bits, seed))
+    if _worker_stream[0] != key:
+        _worker_stream = (key, generate_shadow_bits(modulus, n_bits, seed), {})
+    return _worker_stream[1], _worker_stream[2]
+
+
+def _run_job(root: str, job: Dict) -> Dict:
+    """Compute one job and checkpoint it into the store at root."""
+    store = ResultStore(root)
+    params = job["params"]
+    if job["harness"] == "C003":
+        name, test_fn, _ = NIST_SUITE[params["index"]]
+        kwargs = params["kwargs"]
+        stream = stream_description(params["modulus"], params["n_bits"], params["seed"])
+        bits, shared = _stream_bits(params["modulus"], params["n_bits"], params["seed"])
+        return store.cached(suite_test_description(stream, name, test_fn, kwargs),
+                            lambda: run_suite_test(test_fn, bits, kwargs, shared))
+    fn = test_autocorrelation if job["harness"] == "C002" else test_crt_uniform
+    return store.cached(call_description(fn, params), lambda: fn(**params))
+
+
+# =============================================================================
+# Parent Side
+# =============================================================================
+
+def job_passed(result: Dict) -> bool:
+    """Pass flag of a harness result (C001 reports overall_pass)."""
+    return result.get("pass", result.get("overall_pass", False))
+
+
+def run_sweep(grid: Dict, store: ResultStore, workers: Optional[int] = None) -> Dict:
+    """
+    Run every job of the grid not already in the store, largest first.
+
+    Returns one summary row per job (finished earlier or now), in grid order.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = expand_grid(grid)
+    pending = [job for job in jobs if store.get(job["key"]) is None]
+    print(f"{len(jobs)} jobs in grid, {len(jobs) - len(pending)} already done, "
+          f"{len(pending)} to run on {workers} workers")
+
+    failed = {}
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_job, str(store.root), job): job
+                       for job in sorted(pending, key=lambda job: -job["cost"])}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    job = futures[future]
+                    try:
+                        status = "PASS" if job_passed(future.result()) else "FAIL"
+                    except Exception as e:
+                        failed[job["key"]] = str(e)
+                        status = f"ERROR: {e}"
+                    print(f"  [{done}/{len(pending)}] {job['harness']} {job['label']}: {status}",
+                          flush=True)
+            except KeyboardInterrupt:
+                # Finished jobs are already checkpointed; drop the queued ones
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    rows = []
+    for job in jobs:
+        result = store.get(job["key"])
+        row = {"harness": job["harness"], **job["label"]}
+        if result is None:
+            row.update({"error": failed.get(job["key"], "not computed"), "pass": False})
+        else:
+            row["pass"] = job_passed(result)
+            for field in ("p_value", "p_values", "max_autocorr", "chi_squared_scaled"):
+                if field in result:
+                    row[field] = result[field]
+        rows.append(row)
+
+    return {
+        "title": "Shadow Entropy Parameter Sweep",
+        "grid": {**DEFAULT_GRID, **grid},
+        "n_jobs": len(jobs),
+        "n_passed": sum(1 for row in rows if row["pass"]),
+        "jobs": rows
+    }
+
+
+def main():
+    """Main entry point."""
+    grid = {}
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            grid = json.load(f)
+
+    print("=" * 70)
+    print("Shadow Entropy Parameter Sweep (C001/C002/C003)")
+    print("=" * 70)
+
+    store = ResultStore()
+    results = run_sweep(grid, store)
+
+    print("\n" + "=" * 70)
+    print("SUMMARY - Parameter Sweep")
+    print("=" * 70)
+    by_modulus: Dict[int, List[Dict]] = {}
+    for row in results["jobs"]:
+        by_modulus.setdefault(row["modulus"], []).append(row)
+    for modulus, rows in sorted(by_modulus.items()):
+        passed = sum(1 for row in rows if row["pass"])
+        print(f"  m=2^{modulus.bit_length() - 1:2d}: {passed:3d}/{len(rows)} jobs passed")
+
+    output_path = Path(__file__).with_name("sweep_results.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if results["n_passed"] == results["n_jobs"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
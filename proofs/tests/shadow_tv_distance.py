@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Total-Variation Distance Engine for Shadow Distributions (D004)
+
+Estimates the statistical distance between the shadow distribution and
+uniform over [0, m),
+
+    Δ(X, U) := (1/2) × Σ_x |Pr[X = x] - 1/m|
+
+from n samples, with a confidence bound, for supports up to 2^32.
+Node D004 from shadow_entropy_blueprint.json
+
+HackFate.us Research, February 2026
+Formalization Swarm µ-Simulator
+
+REQUIREMENTS: Integer-only arithmetic (QMNF mandate) for the distance;
+             floating point only in the confidence terms
+             Standard library only
+
+OCCUPANCY: The empirical distance depends on the counts c_x only through
+how many support points share each count, so both engines reduce the
+samples to an occupancy profile {c: number of x with count c} and
+
+    Δ̂ = Σ_c bins_c × |m × c - n| / (2 n m)
+
+is evaluated exactly over the few distinct c. Small supports use a dense
+ShadowHistogram. Large supports never allocate per-point storage: samples
+are kept in a flat array (4 or 8 bytes each), sorted chunk by chunk, cut
+into value-range buckets, and each bucket is re-sorted (merging its
+already-sorted runs) and run-length counted at C level. Memory tracks the
+sample count, not the modulus.
+
+CONFIDENCE: Δ̂ changes by at most 1/n when one sample changes, so by
+McDiarmid's inequality it stays within sqrt(ln(1/δ) / 2n) of its mean. On
+that basis:
+- upper_bound: Δ ≤ Δ̂ + ½ sqrt(m/n) + sqrt(ln(1/δ) / 2n) with probability
+  1 - δ (E Δ(p̂, p) ≤ ½ sqrt(m/n) by Cauchy-Schwarz); vacuous when n ≲ m
+- pass: Δ̂ is below its exact mean under a truly uniform source (de
+  Moivre's binomial mean absolute deviation) plus the same margin, which
+  stays meaningful at every n
+"""
+
+import json
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress
+from operator import ne, sub
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+from shadow_result_store import ResultStore, cached_call, fresh_seed
+from shadow_stats import ShadowHistogram
+from shadow_uniform_test import generate_crt_shadows
+
+# Largest support counted with a dense histogram (8 bytes per bin)
+DENSE_MAX_SUPPORT = 1 << 24
+
+# Largest support handled at all
+MAX_SUPPORT = 1 << 32
+
+# Samples generated and counted per step
+CHUNK_SAMPLES = 1 << 20
+
+# Samples per value-range bucket of the sparse engine (sorted as one list)
+BUCKET_SAMPLES = 1 << 22
+
+# Failure probability of the confidence bounds
+DELTA = 0.01
+
+# Δ̂ is reported × SCALE
+SCALE = 1000000000
+
+
+# =============================================================================
+# Occupancy Engines
+# =============================================================================
+
+def dense_occupancy(chunks: Iterable[Sequence[int]], m: int) -> Counter:
+    """Occupancy profile {count: support points} from a dense histogram."""
+    histogram = ShadowHistogram(m)
+    for chunk in chunks:
+        histogram.add(chunk)
+    return Counter(histogram.counts)
+
+
+def run_lengths(values: Sequence[int]) -> Counter:
+    """Occupancy profile of a sorted sequence: {run length: number of runs}."""
+    n = len(values)
+    if n == 0:
+        return Counter()
+    changes = list(compress(range(1, n), map(ne, values[1:], values[:-1])))
+    return Counter(map(sub, changes + [n], [0] + changes))
+
+
+def sparse_occupancy(chunks: Iterable[Sequence[int]], m: int, n_samples: int) -> Counter:
+    """
+    Occupancy profile {count: support points} by sort-and-run-length counting.
+
+    Each chunk is sorted and cut at fixed value boundaries into buckets,
+    so a value's samples all land in one bucket and each bucket can be
+    counted on its own. Points never sampled are added as count 0.
+    """
+    n_buckets = max(1, -(-n_samples // BUCKET_SAMPLES))
+    bounds = [m * b // n_buckets for b in range(n_buckets + 1)]
+    typecode = "I" if m <= 1 << 32 else "Q"
+    buckets = [array(typecode) for _ in range(n_buckets)]
+    for chunk in chunks:
+        ordered = sorted(chunk)
+        cuts = [bisect_left(ordered, bound) for bound in bounds]
+        for bucket, lo, hi in zip(buckets, cuts, cuts[1:]):
+            bucket.extend(ordered[lo:hi])
+
+    occupancy: Counter = Counter()
+    for b in range(n_buckets):
+        occupancy.update(run_lengths(sorted(buckets[b])))
+        buckets[b] = array(typecode)
+    occupancy[0] += m - sum(occupancy.values())
+    return occupancy
+
+
+def distance_sum(occupancy: Counter, m: int, n: int) -> int:
+    """Exact Σ_x |m × c_x - n| = 2 n m × Δ̂ from an occupancy profile."""
+    return sum(bins * abs(m * count - n) for count, bins in occupancy.items())
+
+
+# =============================================================================
+# Reference Values
+# =============================================================================
+
+def uniform_mean_distance(m: int, n: int) -> float:
+    """
+    E[Δ̂] for n samples of the exactly uniform distribution on [0, m).
+
+    Each count is Binomial(n, 1/m), so E[Δ̂] = m × E|c - n/m| / 2n with de
+    Moivre's mean absolute deviation E|c - np| = 2 k (1-p)^(n-k+1) p^k C(n, k)
+    at k = floor(np) + 1, evaluated in logs.
+    """
+    if m == 1:
+        return 0.0
+    p = 1 / m
+    k = n // m + 1
+    if k > n:
+        return 0.0
+    log_mad = (math.log(2 * k) + (n - k + 1) * math.log1p(-p) + k * math.log(p)
+               + math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1))
+    return m * math.exp(log_mad) / (2 * n)
+
+
+def concentration_margin(n: int, delta: float = DELTA) -> float:
+    """McDiarmid margin sqrt(ln(1/δ) / 2n) of Δ̂ around its mean."""
+    return math.sqrt(math.log(1 / delta) / (2 * n))
+
+
+# =============================================================================
+# Engine
+# =============================================================================
+
+def tv_distance(chunks: Iterable[Sequence[int]], m: int, n_samples: int,
+                method: str = "auto") -> Dict:
+    """
+    Empirical TV distance to uniform on [0, m) of n_samples values in chunks.
+
+    method is "dense", "sparse" or "auto" (dense up to DENSE_MAX_SUPPORT
+    and while m <= n_samples).
+    """
+    if not 1 <= m <= MAX_SUPPORT:
+        raise ValueError(f"support size {m} outside [1, 2^32]")
+    if method == "auto":
+        method = "dense" if m <= DENSE_MAX_SUPPORT and m <= n_samples else "sparse"
+    if method == "dense":
+        occupancy = dense_occupancy(chunks, m)
+    elif method == "sparse":
+        occupancy = sparse_occupancy(chunks, m, n_samples)
+    else:
+        raise ValueError(f"unknown method {method!r}")
+
+    n = sum(count * bins for count, bins in occupancy.items())
+    if n != n_samples:
+        raise ValueError(f"expected {n_samples} samples, counted {n}")
+    total = distance_sum(occupancy, m, n)
+    distance_scaled = (total * SCALE) // (2 * n * m)
+
+    margin = concentration_margin(n)
+    mean_uniform = uniform_mean_distance(m, n)
+    distance = total / (2 * n * m)
+    return {
+        "method": method,
+        "support": m,
+        "samples": n,
+        "distinct_values": m - occupancy.get(0, 0),
+        "max_count": max(occupancy),
+        "distance_scaled": distance_scaled,
+        "distance": distance,
+        "uniform_mean_distance": mean_uniform,
+        "margin": margin,
+        "upper_bound": min(1.0, distance + math.sqrt(m / n) / 2 + margin),
+        "delta": DELTA,
+        "consistent_with_uniform": distance <= mean_uniform + margin
+    }
+
+
+# =============================================================================
+# D004 Test
+# =============================================================================
+
+def shadow_chunks(m: int, n_samples: int, seed: Optional[int] = None) -> Iterable[Sequence[int]]:
+    """CRT shadows V mod m, V uniform over [0, m × (m + 1)), in chunks."""
+    for start in range(0, n_samples, CHUNK_SAMPLES):
+        yield generate_crt_shadows(m + 1, m, min(CHUNK_SAMPLES, n_samples - start), seed, start)
+
+
+def test_tv_distance(m: int, n_samples: int, seed: Optional[int] = None,
+                     method: str = "auto") -> Dict:
+    """
+    Estimate Δ(shadow, uniform) from n_samples CRT shadows modulo m.
+
+    Args:
+        m: Shadow modulus (support size, at most 2^32)
+        n_samples: Number of samples
+        seed: DRBG seed for a reproducible run (None: OS randomness)
+        method: Counting engine ("auto", "dense" or "sparse")
+
+    Returns:
+        Test results
+    """
+    start = time.perf_counter()
+    result = tv_distance(shadow_chunks(m, n_samples, seed), m, n_samples, method)
+    seconds = time.perf_counter() - start
+    result.update({
+        "test_type": "TV_distance",
+        "modulus": m,
+        "seconds": seconds,
+        "pass": result["consistent_with_uniform"]
+    })
+    return result
+
+
+def run_all_tests(store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """Run the TV distance tests, replaying results already in the store."""
+    results = {
+        "node_id": "D004",
+        "title": "Total-Variation Distance to Uniform",
+        "tests": [],
+        "seed": seed,
+        "overall_pass": True
+    }
+
+    # Test configurations
+    configs = [
+        {"m": 256, "n_samples": 1000000},
+        {"m": 65536, "n_samples": 1000000},
+        {"m": 1 << 24, "n_samples": 10000000},
+        {"m": 1 << 32, "n_samples": 10000000},
+    ]
+
+    print("=" * 60)
+    print("Shadow Entropy TV Distance Engine (D004)")
+    print("Δ(X, U) = (1/2) × Σ_x |Pr[X=x] - 1/m|")
+    print("=" * 60)
+
+    for cfg in configs:
+        print(f"\nTesting m=2^{cfg['m'].bit_length() - 1}, n={cfg['n_samples']:,}...")
+
+        result = cached_call(store, test_tv_distance, {
+            "m": cfg["m"],
+            "n_samples": cfg["n_samples"],
+            "seed": seed
+        })
+        results["tests"].append(result)
+
+        if not result["pass"]:
+            results["overall_pass"] = False
+
+        print(f"  Engine: {result['method']}, {result['distinct_values']:,} distinct values "
+              f"({result['seconds']:.1f} s)")
+        print(f"  Empirical Δ: {result['distance']:.6f} "
+              f"(uniform source: {result['uniform_mean_distance']:.6f} ± {result['margin']:.6f})")
+        print(f"  Upper bound on Δ ({1 - result['delta']:.0%}): {result['upper_bound']:.6f}")
+        print(f"  Result: {'PASS' if result['pass'] else 'FAIL'}")
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    store = ResultStore()
+    results = run_all_tests(store=store, seed=fresh_seed())
+
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+
+    for test in results["tests"]:
+        status = "PASS" if test["pass"] else "FAIL"
+        print(f"  m=2^{test['modulus'].bit_length() - 1:2d}: {status} "
+              f"(Δ={test['distance']:.6f}, bound {test['upper_bound']:.4f})")
+
+    print()
+    print(f"OVERALL: {'PASS' if results['overall_pass'] else 'FAIL'}")
+
+    print(f"Seed: {results['seed']}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("D004_tv_distance_results.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to: {output_path}")
+
+    return 0 if results["overall_pass"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
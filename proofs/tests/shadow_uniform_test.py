@@ -9,43 +9,48 @@ HackFate.us Research, February 2026
 Formalization Swarm µ-Simulator
 
 REQUIREMENTS: Integer-only arithmetic (QMNF mandate)
-             Uses secrets module for cryptographic randomness
+             Uses OS randomness (the secrets CSPRNG) via bulk shadow_source
 
 KEY INSIGHT: The shadow from CRT perspective is V mod m_shadow where
 V is uniform over [0, m_p × m_s). We test this directly.
 """
 
 import json
-import secrets
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from math import gcd
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Sequence
 
+from shadow_result_store import ResultStore, cached_call, fresh_seed
+from shadow_source import ShadowDRBG, crt_shadow_batch, quotient_shadow_batch
+from shadow_stats import ShadowHistogram
 
-def generate_crt_shadows(m_primary: int, m_shadow: int, n_samples: int) -> List[int]:
+# Shadows generated and counted per histogram update
+CHUNK_SAMPLES = 1 << 20
+
+
+def generate_crt_shadows(m_primary: int, m_shadow: int, n_samples: int,
+                         seed: Optional[int] = None, offset: int = 0) -> Sequence[int]:
     """
     Generate shadow values by sampling V uniformly from [0, M) where M = m_p × m_s.
 
     The shadow is simply V mod m_shadow.
 
     This tests the CRT uniform distribution theorem directly.
+    Samples are drawn in bulk and returned as a compact array. With a seed
+    they are samples offset..offset+n_samples-1 of that seed's stream;
+    otherwise they come from OS randomness.
     """
     assert gcd(m_primary, m_shadow) == 1, "Moduli must be coprime"
 
-    M = m_primary * m_shadow
-    shadows = []
-
-    for _ in range(n_samples):
-        # Generate V uniform over [0, M)
-        V = secrets.randbelow(M)
-        # Shadow is V mod m_shadow
-        shadow_val = V % m_shadow
-        shadows.append(shadow_val)
-
+    drbg = ShadowDRBG(seed) if seed is not None else None
+    shadows, _ = crt_shadow_batch(m_primary, m_shadow, n_samples, drbg=drbg, offset=offset)
     return shadows
 
 
-def generate_quotient_shadows(m: int, n_samples: int) -> List[int]:
+def generate_quotient_shadows(m: int, n_samples: int, seed: Optional[int] = None) -> Sequence[int]:
     """
     Generate quotient shadows from modular multiplication.
 
@@ -53,31 +58,23 @@ def generate_quotient_shadows(m: int, n_samples: int) -> List[int]:
 
     where a, b are uniform over [0, m).
     """
-    shadows = []
-
-    for _ in range(n_samples):
-        a = secrets.randbelow(m)
-        b = secrets.randbelow(m)
-        # Shadow is the quotient
-        shadow_val = (a * b) // m
-        shadows.append(shadow_val)
-
-    return shadows
+    drbg = ShadowDRBG(seed) if seed is not None else None
+    return quotient_shadow_batch(m, n_samples, drbg=drbg)
 
 
-def chi_squared_test_integer(observed: Counter, expected_count: int, n_bins: int) -> Tuple[int, int]:
+def crt_shadow_histogram(m_primary: int, m_shadow: int, n_samples: int,
+                         seed: Optional[int] = None, offset: int = 0) -> ShadowHistogram:
     """
-    Chi-squared test using integer arithmetic.
+    Histogram of n_samples CRT shadows, generated and counted chunk by chunk.
 
-    Returns (chi_sq_numerator, chi_sq_denominator) as exact rational.
+    Memory is one bin array plus one chunk, independent of n_samples.
     """
-    sum_squared_diff = 0
-    for i in range(n_bins):
-        obs = observed.get(i, 0)
-        diff = obs - expected_count
-        sum_squared_diff += diff * diff
-
-    return sum_squared_diff, expected_count
+    histogram = ShadowHistogram(m_shadow)
+    for start in range(0, n_samples, CHUNK_SAMPLES):
+        histogram.add(generate_crt_shadows(m_primary, m_shadow,
+                                           min(CHUNK_SAMPLES, n_samples - start),
+                                           seed, offset + start))
+    return histogram
 
 
 def chi_squared_critical_values() -> Dict[int, int]:
@@ -94,20 +91,34 @@ def chi_squared_critical_values() -> Dict[int, int]:
     }
 
 
-def test_crt_uniform(m_shadow: int, n_samples: int) -> Dict:
+def test_crt_uniform(m_shadow: int, n_samples: int, workers: int = 1,
+                     seed: Optional[int] = None) -> Dict:
     """
     Test CRT uniform distribution: V mod m_shadow where V ∈ [0, m_p × m_s).
+
+    With workers > 1 the samples are split into shards whose histograms
+    are built on a process pool and merged. With a seed, shard k covers
+    its own slice of one seeded stream, so the result does not depend on
+    the worker count.
     """
     # Choose coprime m_primary
     m_primary = m_shadow + 1
     while gcd(m_primary, m_shadow) != 1:
         m_primary += 1
 
-    shadows = generate_crt_shadows(m_primary, m_shadow, n_samples)
-    observed = Counter(shadows)
+    if workers > 1:
+        bounds = [n_samples * k // workers for k in range(workers + 1)]
+        shards = [b - a for a, b in zip(bounds, bounds[1:])]
+        observed = ShadowHistogram(m_shadow)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard in pool.map(crt_shadow_histogram, repeat(m_primary), repeat(m_shadow),
+                                  shards, repeat(seed), bounds[:-1]):
+                observed.merge(shard)
+    else:
+        observed = crt_shadow_histogram(m_primary, m_shadow, n_samples, seed)
     expected_count = n_samples // m_shadow
 
-    chi_sq_num, chi_sq_den = chi_squared_test_integer(observed, expected_count, m_shadow)
+    chi_sq_num, chi_sq_den = observed.sum_squared_deviation(expected_count), expected_count
     chi_sq_scaled = (chi_sq_num * 1000) // chi_sq_den
 
     df = m_shadow - 1
@@ -120,14 +131,7 @@ def test_crt_uniform(m_shadow: int, n_samples: int) -> Dict:
     sigma_approx = int(expected_count ** 0.5)
     three_sigma = 3 * sigma_approx
 
-    bins_outside_3sigma = 0
-    max_deviation = 0
-    for i in range(m_shadow):
-        obs = observed.get(i, 0)
-        deviation = abs(obs - expected_count)
-        max_deviation = max(max_deviation, deviation)
-        if deviation > three_sigma:
-            bins_outside_3sigma += 1
+    bins_outside_3sigma, max_deviation = observed.deviation_summary(expected_count, three_sigma)
 
     chi_sq_pass = chi_sq_scaled < critical_scaled
     sigma_pass = bins_outside_3sigma <= m_shadow // 100 + 1  # Allow ~1% outliers
@@ -149,14 +153,14 @@ def test_crt_uniform(m_shadow: int, n_samples: int) -> Dict:
     }
 
 
-def test_quotient_uniform(m: int, n_samples: int) -> Dict:
+def test_quotient_uniform(m: int, n_samples: int, seed: Optional[int] = None) -> Dict:
     """
     Test quotient shadow distribution: (a × b) / m where a, b ∈ [0, m).
 
     Note: This distribution is NOT uniform - it's triangular!
     This test documents the actual distribution shape.
     """
-    shadows = generate_quotient_shadows(m, n_samples)
+    shadows = generate_quotient_shadows(m, n_samples, seed)
     observed = Counter(shadows)
 
     # The quotient shadow has range [0, m-1]
@@ -186,13 +190,14 @@ def test_quotient_uniform(m: int, n_samples: int) -> Dict:
     }
 
 
-def run_all_tests() -> Dict:
-    """Run tests for multiple modulus sizes."""
+def run_all_tests(store: Optional[ResultStore] = None, seed: Optional[int] = None) -> Dict:
+    """Run tests for multiple modulus sizes, replaying results already in the store."""
     results = {
         "node_id": "C001",
         "title": "Shadow Uniform Distribution Tests",
         "crt_tests": [],
         "quotient_tests": [],
+        "seed": seed,
         "overall_pass": True
     }
 
@@ -201,6 +206,7 @@ def run_all_tests() -> Dict:
         (16, 100000),
         (64, 100000),
         (256, 100000),
+        (65536, 10000000),
     ]
 
     print("=" * 60)
@@ -210,7 +216,8 @@ def run_all_tests() -> Dict:
 
     for m_shadow, n_samples in crt_configs:
         print(f"\nTesting CRT m_shadow={m_shadow}, n_samples={n_samples}...")
-        test_result = test_crt_uniform(m_shadow, n_samples)
+        test_result = cached_call(store, test_crt_uniform,
+                                  {"m_shadow": m_shadow, "n_samples": n_samples, "seed": seed})
         results["crt_tests"].append(test_result)
         if not test_result["overall_pass"]:
             results["overall_pass"] = False
@@ -233,7 +240,8 @@ def run_all_tests() -> Dict:
 
     for m, n_samples in quotient_configs:
         print(f"\nTesting quotient m={m}, n_samples={n_samples}...")
-        test_result = test_quotient_uniform(m, n_samples)
+        test_result = cached_call(store, test_quotient_uniform,
+                                  {"m": m, "n_samples": n_samples, "seed": seed})
         results["quotient_tests"].append(test_result)
         print(f"  Max shadow: {test_result['max_shadow']} (bound: {test_result['bounded_by']})")
         print(f"  Bounded: {test_result['bounded']}")
@@ -249,7 +257,8 @@ def main():
     print("µ-Simulator | Formalization Swarm")
     print("=" * 60)
 
-    results = run_all_tests()
+    store = ResultStore()
+    results = run_all_tests(store=store, seed=fresh_seed())
 
     print("\n" + "=" * 60)
     print("FINAL SUMMARY")
@@ -268,7 +277,10 @@ def main():
     print()
     print(f"OVERALL: {'PASS' if results['overall_pass'] else 'FAIL'}")
 
-    output_path = "/home/acid/Projects/hackfate/proofs/tests/C001_results.json"
+    print(f"Seed: {results['seed']}")
+    print(store.summary())
+
+    output_path = Path(__file__).with_name("C001_results.json")
     with open(output_path, "w") as f:
         json.dump(results, f, indent=2)
     print(f"\nResults written to: {output_path}")